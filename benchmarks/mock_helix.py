@@ -0,0 +1,350 @@
+import hashlib
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+@dataclass
+class MockHelixConfig:
+    """
+    Shape of the fake Helix API.
+
+    ``channels`` is the size of the channel pool; every keyword's search results
+    are a window of ``results_per_keyword`` channels into that pool starting at a
+    keyword-dependent offset, so keywords overlap the way real searches do.
+    Every name passed to /games is a known category; its /streams listing is a
+    window of up to ``results_per_keyword`` of the pool's live channels, chosen
+    the same way. With ``access_token`` set, requests carrying any other bearer
+    token are answered with a 401.
+    """
+
+    channels: int = 1000
+    results_per_keyword: int = 100
+    page_size: int = 20
+    latency_ms: float = 20.0
+    jitter_ms: float = 5.0
+    throttle_rate: float = 0.0
+    retry_after: float = 0.05
+    payload_bytes: int = 0
+    live_ratio: float = 0.3
+    seed: int = 1
+    access_token: Optional[str] = None
+
+class _State:
+    def __init__(self, config: MockHelixConfig) -> None:
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.lock = threading.Lock()
+        self.requests: Dict[str, int] = {}
+        self.throttled = 0
+        self.bytes_sent = 0
+        # Category names handed out by /games, by game id.
+        self.games: Dict[str, str] = {}
+        self.live = [index for index in range(config.channels) if _is_live(index, config)]
+
+    def count(self, path: str) -> bool:
+        """Count a request; returns True when it should be answered with a 429."""
+        with self.lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+            if self.config.throttle_rate and self.random.random() < self.config.throttle_rate:
+                self.throttled += 1
+                return True
+            return False
+
+    def delay(self) -> float:
+        with self.lock:
+            jitter = self.random.uniform(-self.config.jitter_ms, self.config.jitter_ms)
+        return max(0.0, self.config.latency_ms + jitter) / 1000.0
+
+def _user_id(index: int) -> str:
+    return str(100000 + index)
+
+def _index_of(user_id: str) -> int:
+    try:
+        return int(user_id) - 100000
+    except ValueError:
+        return -1
+
+def _is_live(index: int, config: MockHelixConfig) -> bool:
+    return (index * 7919) % 1000 < config.live_ratio * 1000
+
+def _padding(config: MockHelixConfig) -> str:
+    return "x" * config.payload_bytes
+
+def _keyword_offset(keyword: str, config: MockHelixConfig) -> int:
+    digest = hashlib.md5(keyword.encode("utf-8")).digest()
+    return int.from_bytes(digest[:4], "big") % max(1, config.channels)
+
+def _search(query: Dict[str, List[str]], state: _State) -> Dict[str, Any]:
+    config = state.config
+    keyword = (query.get("query") or [""])[0]
+    start = int((query.get("after") or ["0"])[0] or 0)
+    first = min(int((query.get("first") or ["20"])[0]), config.page_size)
+    end = min(start + first, config.results_per_keyword)
+    offset = _keyword_offset(keyword, config)
+    data = []
+    for position in range(start, end):
+        index = (offset + position) % config.channels
+        data.append(
+            {
+                "id": _user_id(index),
+                "broadcaster_login": f"channel{index}",
+                "display_name": f"Channel{index}",
+                "thumbnail_url": f"https://static-cdn.example/{index}.png",
+                "is_live": _is_live(index, config),
+                "game_name": "Just Chatting",
+                "broadcaster_language": "en",
+                "title": f"Stream {index}",
+            }
+        )
+    pagination = {"cursor": str(end)} if end < config.results_per_keyword else {}
+    return {"data": data, "pagination": pagination}
+
+def _stream(
+    index: int,
+    config: MockHelixConfig,
+    game_id: str = "509658",
+    game_name: str = "Just Chatting",
+) -> Dict[str, Any]:
+    return {
+        "id": f"s{index}",
+        "user_id": _user_id(index),
+        "user_login": f"channel{index}",
+        "user_name": f"Channel{index}",
+        "game_id": game_id,
+        "game_name": game_name,
+        "type": "live",
+        "title": f"Stream {index}" + _padding(config),
+        "viewer_count": (index * 37) % 5000,
+        "started_at": "2024-05-12T18:30:00Z",
+        "language": "en",
+        "thumbnail_url": f"https://static-cdn.example/live/{index}.jpg",
+        "tags": ["English"],
+    }
+
+def _games(query: Dict[str, List[str]], state: _State) -> Dict[str, Any]:
+    data = []
+    for name in query.get("name") or []:
+        game_id = str(500000 + _keyword_offset(name.lower(), state.config))
+        with state.lock:
+            state.games[game_id] = name
+        data.append({"id": game_id, "name": name, "box_art_url": "https://static-cdn.example/box.jpg"})
+    return {"data": data}
+
+def _category_streams(query: Dict[str, List[str]], state: _State) -> Dict[str, Any]:
+    config = state.config
+    game_id = (query.get("game_id") or [""])[0]
+    with state.lock:
+        game_name = state.games.get(game_id, f"Game {game_id}")
+    languages = query.get("language")
+    total = min(config.results_per_keyword, len(state.live))
+    if languages and "en" not in languages:
+        total = 0
+    start = int((query.get("after") or ["0"])[0] or 0)
+    end = min(start + int((query.get("first") or ["20"])[0]), total)
+    offset = _keyword_offset(game_name.lower(), config)
+    data = [
+        _stream(state.live[(offset + position) % len(state.live)], config, game_id, game_name)
+        for position in range(start, end)
+    ]
+    pagination = {"cursor": str(end)} if end < total else {}
+    return {"data": data, "pagination": pagination}
+
+def _streams(query: Dict[str, List[str]], state: _State) -> Dict[str, Any]:
+    if query.get("game_id"):
+        return _category_streams(query, state)
+    config = state.config
+    data = []
+    for user_id in query.get("user_id") or []:
+        index = _index_of(user_id)
+        if 0 <= index < config.channels and _is_live(index, config):
+            data.append(_stream(index, config))
+    return {"data": data, "pagination": {}}
+
+def _users(query: Dict[str, List[str]], state: _State) -> Dict[str, Any]:
+    config = state.config
+    data = []
+    for user_id in query.get("id") or []:
+        index = _index_of(user_id)
+        if 0 <= index < config.channels:
+            data.append(
+                {
+                    "id": user_id,
+                    "login": f"channel{index}",
+                    "display_name": f"Channel{index}",
+                    "broadcaster_type": "partner" if index % 5 == 0 else "",
+                    "description": f"Channel {index} description" + _padding(config),
+                    "profile_image_url": f"https://static-cdn.example/{index}.png",
+                }
+            )
+    return {"data": data}
+
+def _videos(query: Dict[str, List[str]], state: _State) -> Dict[str, Any]:
+    config = state.config
+    user_id = (query.get("user_id") or [""])[0]
+    return {
+        "data": [
+            {
+                "id": f"v{user_id}",
+                "title": "Latest VOD" + _padding(config),
+                "duration": "3h5m10s",
+                "thumbnail_url": "https://static-cdn.example/vod.jpg",
+                "url": f"https://www.twitch.tv/videos/{user_id}",
+                "created_at": "2024-05-11T18:30:00Z",
+            }
+        ]
+    }
+
+def _clips(query: Dict[str, List[str]], state: _State) -> Dict[str, Any]:
+    config = state.config
+    broadcaster_id = (query.get("broadcaster_id") or [""])[0]
+    return {
+        "data": [
+            {
+                "id": f"c{broadcaster_id}",
+                "title": "Top clip" + _padding(config),
+                "duration": 28.5,
+                "thumbnail_url": "https://static-cdn.example/clip.jpg",
+                "url": f"https://clips.twitch.tv/{broadcaster_id}",
+                "created_at": "2024-05-10T18:30:00Z",
+                "view_count": 1200,
+            }
+        ]
+    }
+
+def _schedule(query: Dict[str, List[str]], state: _State) -> Dict[str, Any]:
+    config = state.config
+    return {
+        "data": {
+            "segments": [
+                {
+                    "id": "seg1",
+                    "title": "Weekly stream" + _padding(config),
+                    "start_time": "2024-05-14T18:00:00Z",
+                    "end_time": "2024-05-14T21:00:00Z",
+                    "category": {"name": "Just Chatting"},
+                    "canceled_until": None,
+                }
+            ]
+        }
+    }
+
+_ROUTES = {
+    "/search/channels": _search,
+    "/streams": _streams,
+    "/games": _games,
+    "/users": _users,
+    "/videos": _videos,
+    "/clips": _clips,
+    "/schedule": _schedule,
+}
+
+def _make_handler(state: _State) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes; without TCP_NODELAY every
+        # keep-alive response stalls on delayed ACKs and inflates latency by ~40ms.
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+        def _send(self, status: int, body: bytes = b"", headers: Optional[Dict[str, str]] = None) -> None:
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if body:
+                self.wfile.write(body)
+            with state.lock:
+                state.bytes_sent += len(body)
+
+        def do_GET(self) -> None:
+            url = urlparse(self.path)
+            path = "/" + url.path.strip("/")
+            if path.startswith("/helix"):
+                path = path[len("/helix"):] or "/"
+            query = parse_qs(url.query)
+
+            time.sleep(state.delay())
+            token = state.config.access_token
+            if token is not None and self.headers.get("Authorization") != f"Bearer {token}":
+                with state.lock:
+                    state.requests[path] = state.requests.get(path, 0) + 1
+                self._send(401, b'{"error":"Unauthorized"}', {"Content-Type": "application/json"})
+                return
+            if state.count(path):
+                self._send(429, headers={"Retry-After": str(state.config.retry_after)})
+                return
+
+            route = _ROUTES.get(path)
+            if route is None:
+                self._send(404, b'{"error":"Not Found"}', {"Content-Type": "application/json"})
+                return
+
+            body = json.dumps(route(query, state)).encode("utf-8")
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, headers={"ETag": etag})
+                return
+            self._send(200, body, {"Content-Type": "application/json", "ETag": etag})
+
+    return Handler
+
+class _Server(ThreadingHTTPServer):
+    # socketserver's default backlog of 5 drops connection bursts from wide pools.
+    request_queue_size = 256
+    daemon_threads = True
+
+class MockHelixServer:
+    """
+    Local stand-in for the Helix endpoints the scraper uses, for offline
+    benchmarks. Responses are deterministic for a given config; latency, 429
+    injection and payload padding are configurable. Use as a context manager.
+    """
+
+    def __init__(self, config: Optional[MockHelixConfig] = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.config = config or MockHelixConfig()
+        self._state = _State(self.config)
+        self._server = _Server((host, port), _make_handler(self._state))
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/helix"
+
+    def start(self) -> "MockHelixServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-helix", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_stats(self) -> None:
+        with self._state.lock:
+            self._state.requests.clear()
+            self._state.throttled = 0
+            self._state.bytes_sent = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._state.lock:
+            return {
+                "requests": sum(self._state.requests.values()),
+                "byEndpoint": dict(sorted(self._state.requests.items())),
+                "throttled": self._state.throttled,
+                "bytesSent": self._state.bytes_sent,
+            }
+
+    def __enter__(self) -> "MockHelixServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
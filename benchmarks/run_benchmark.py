@@ -0,0 +1,302 @@
+"""
+Offline throughput benchmark.
+
+Starts a local mock Helix server (see mock_helix.py) and runs the scraper
+against it once per scenario, each in a fresh process, reporting records/sec,
+requests/sec, p50/p99 request latency, 429s and peak RSS.
+
+    python benchmarks/run_benchmark.py --keywords 20 --latency-ms 30
+    python benchmarks/run_benchmark.py --scenario 'wide={"enrichmentWorkers": 32}'
+"""
+import argparse
+import json
+import multiprocessing
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCH_DIR.parent
+SRC_DIR = REPO_ROOT / "src"
+if str(BENCH_DIR) not in sys.path:
+    sys.path.insert(0, str(BENCH_DIR))
+
+from mock_helix import MockHelixConfig, MockHelixServer  # noqa: E402
+
+# Settings overrides for the scenarios run when no --scenario is given.
+DEFAULT_SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "sequential": {"enrichmentWorkers": 1, "batchLookups": False, "dedupeChannels": False},
+    "threaded": {"enrichmentWorkers": 8, "batchLookups": False},
+    "batched": {"enrichmentWorkers": 8, "batchLookups": True},
+    "async": {"enrichmentWorkers": 32, "batchLookups": True, "asyncEnrichment": True},
+    "pipeline": {"enrichmentWorkers": 8, "batchLookups": True, "keywordWorkers": 4},
+    # Each keyword is looked up as a category and its live streams are listed.
+    "category": {"enrichmentWorkers": 8, "batchLookups": True, "discoveryMode": "category"},
+}
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    # ru_maxrss is reported in kilobytes on Linux (bytes on macOS).
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def _run_main(settings: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+    from scraper.scrape import run_scrape  # type: ignore
+
+    run_scrape(settings)
+    stream_file = settings.get("streamOutputFile")
+    if stream_file:
+        with open(stream_file, "r", encoding="utf-8") as f:
+            records = sum(1 for line in f if line.strip())
+    else:
+        with open(settings["outputFile"], "r", encoding="utf-8") as f:
+            records = len(json.load(f))
+    with open(settings["metricsFile"], "r", encoding="utf-8") as f:
+        return records, json.load(f)
+
+def _run_search(settings: Dict[str, Any], keywords: List[str]) -> Tuple[int, Dict[str, Any]]:
+    from scraper.discovery import search_channels_for_keyword  # type: ignore
+    from utils.enrichment_index import EnrichmentIndex  # type: ignore
+    from utils.metrics import RunMetrics  # type: ignore
+    from utils.request_handler import RequestHandler  # type: ignore
+
+    metrics = RunMetrics()
+    workers = int(settings.get("enrichmentWorkers", 1))
+    handler = RequestHandler(
+        base_url=settings["baseUrl"],
+        client_id=settings["clientId"],
+        access_token=settings["accessToken"],
+        pool_size=max(10, workers + 1),
+        metrics=metrics,
+    )
+    index = EnrichmentIndex() if settings.get("dedupeChannels", True) else None
+    records = 0
+    with handler:
+        for keyword in keywords:
+            records += len(
+                search_channels_for_keyword(
+                    handler,
+                    keyword,
+                    int(settings.get("maxChannelsPerKeyword", 50)),
+                    workers=workers,
+                    batch=bool(settings.get("batchLookups", True)),
+                    index=index,
+                )
+            )
+    return records, metrics.snapshot()
+
+def _scenario_child(
+    mode: str,
+    settings: Dict[str, Any],
+    keywords: List[str],
+    conn: Any,
+) -> None:
+    sys.path.insert(0, str(SRC_DIR))
+    from scraper.settings import setup_logger  # type: ignore
+
+    setup_logger(settings.get("logLevel", "WARNING"))
+    started = time.perf_counter()
+    try:
+        if mode == "search":
+            records, snapshot = _run_search(settings, keywords)
+        else:
+            records, snapshot = _run_main(settings)
+        conn.send(
+            {
+                "records": records,
+                "seconds": time.perf_counter() - started,
+                "peakRssMB": _peak_rss_mb(),
+                "metrics": snapshot,
+            }
+        )
+    except BaseException as e:
+        conn.send({"error": repr(e)})
+    finally:
+        conn.close()
+
+def _scenario_settings(
+    base_url: str,
+    workdir: Path,
+    keywords_file: Path,
+    max_channels: int,
+    rate_limit: float,
+    overrides: Dict[str, Any],
+) -> Dict[str, Any]:
+    with (SRC_DIR / "config" / "settings.example.json").open("r", encoding="utf-8") as f:
+        settings: Dict[str, Any] = json.load(f)
+    settings.update(
+        {
+            "clientId": "benchmark",
+            "accessToken": "benchmark",
+            "baseUrl": base_url,
+            "keywordsFile": str(keywords_file),
+            "outputFile": str(workdir / "output.json"),
+            "streamOutputFile": str(workdir / "output.jsonl"),
+            "checkpointFile": str(workdir / "checkpoint.jsonl"),
+            "metricsFile": str(workdir / "metrics.json"),
+            "prometheusMetricsFile": None,
+            "responseCacheFile": None,
+            "deltaStateFile": None,
+            "columnarOutputFile": None,
+            "maxChannelsPerKeyword": max_channels,
+            "maxChannelsPerCategory": max_channels,
+            "rateLimitPerMinute": rate_limit,
+            "logLevel": "WARNING",
+        }
+    )
+    settings.update(overrides)
+    return settings
+
+def run_scenario(
+    server: MockHelixServer,
+    name: str,
+    overrides: Dict[str, Any],
+    keywords: List[str],
+    mode: str,
+    max_channels: int,
+    rate_limit: float,
+) -> Dict[str, Any]:
+    """Run one scenario in a fresh process and return its measurements."""
+    with tempfile.TemporaryDirectory(prefix=f"bench-{name}-") as tmp:
+        workdir = Path(tmp)
+        keywords_file = workdir / "keywords.txt"
+        keywords_file.write_text("\n".join(keywords) + "\n", encoding="utf-8")
+        settings = _scenario_settings(server.base_url, workdir, keywords_file, max_channels, rate_limit, overrides)
+
+        server.reset_stats()
+        ctx = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = ctx.Pipe(duplex=False)
+        child = ctx.Process(target=_scenario_child, args=(mode, settings, keywords, child_conn))
+        child.start()
+        child_conn.close()
+        try:
+            result = parent_conn.recv()
+        except EOFError:
+            result = {"error": "benchmark process died"}
+        child.join()
+
+    if "error" in result:
+        return {"scenario": name, "error": result["error"]}
+
+    server_stats = server.stats()
+    seconds = result["seconds"]
+    latency = result["metrics"].get("latencySeconds") or {}
+    return {
+        "scenario": name,
+        "records": result["records"],
+        "seconds": round(seconds, 3),
+        "recordsPerSec": round(result["records"] / seconds, 1) if seconds else 0.0,
+        "requests": server_stats["requests"],
+        "requestsPerSec": round(server_stats["requests"] / seconds, 1) if seconds else 0.0,
+        "throttled": server_stats["throttled"],
+        "p50Ms": round(latency.get("p50", 0.0) * 1000, 1),
+        "p99Ms": round(latency.get("p99", 0.0) * 1000, 1),
+        "peakRssMB": result["peakRssMB"],
+        "byEndpoint": server_stats["byEndpoint"],
+        "overrides": overrides,
+    }
+
+def _parse_scenario(spec: str) -> Tuple[str, Dict[str, Any]]:
+    name, _, raw = spec.partition("=")
+    if not raw:
+        if name not in DEFAULT_SCENARIOS:
+            raise argparse.ArgumentTypeError(f"Unknown scenario '{name}'; pass NAME=JSON for a custom one")
+        return name, DEFAULT_SCENARIOS[name]
+    try:
+        overrides = json.loads(raw)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"Invalid JSON for scenario '{name}': {e}")
+    return name, overrides
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the scraper against a local mock Helix server")
+    parser.add_argument("--mode", choices=("main", "search"), default="main",
+                        help="Drive the full run_scrape() pipeline or only search_channels_for_keyword().")
+    parser.add_argument("--scenario", action="append", type=_parse_scenario, metavar="NAME[=JSON]",
+                        help="Scenario to run: a built-in name or NAME=JSON settings overrides (repeatable).")
+    parser.add_argument("--keywords", type=int, default=10, help="Number of keywords to search.")
+    parser.add_argument("--max-channels", type=int, default=100, help="maxChannelsPerKeyword.")
+    parser.add_argument("--channels", type=int, default=1000, help="Size of the mock channel pool.")
+    parser.add_argument("--page-size", type=int, default=20, help="Search results per page.")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Mean response latency.")
+    parser.add_argument("--jitter-ms", type=float, default=5.0, help="Uniform latency jitter.")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered with 429.")
+    parser.add_argument("--retry-after", type=float, default=0.05, help="Retry-After sent with injected 429s.")
+    parser.add_argument("--payload-bytes", type=int, default=0, help="Extra bytes of text per payload object.")
+    parser.add_argument("--live-ratio", type=float, default=0.3, help="Fraction of channels that are live.")
+    parser.add_argument("--rate-limit", type=float, default=0.0,
+                        help="rateLimitPerMinute for the client (0 disables client-side pacing).")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per scenario; the median run is reported.")
+    parser.add_argument("--json", type=Path, help="Also write the full results to this JSON file.")
+    return parser.parse_args(argv)
+
+def _print_table(results: List[Dict[str, Any]]) -> None:
+    columns = (
+        ("scenario", "scenario"),
+        ("records", "records"),
+        ("seconds", "seconds"),
+        ("rec/s", "recordsPerSec"),
+        ("requests", "requests"),
+        ("req/s", "requestsPerSec"),
+        ("p50 ms", "p50Ms"),
+        ("p99 ms", "p99Ms"),
+        ("429s", "throttled"),
+        ("peak RSS MB", "peakRssMB"),
+    )
+    rows = [[str(r.get(key, r.get("error", ""))) for _, key in columns] for r in results]
+    widths = [max(len(title), *(len(row[i]) for row in rows)) for i, (title, _) in enumerate(columns)]
+    print("  ".join(title.ljust(widths[i]) for i, (title, _) in enumerate(columns)))
+    for row in rows:
+        print("  ".join(value.ljust(widths[i]) for i, value in enumerate(row)))
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    scenarios = args.scenario or list(DEFAULT_SCENARIOS.items())
+    keywords = [f"benchmark keyword {i}" for i in range(args.keywords)]
+    config = MockHelixConfig(
+        channels=args.channels,
+        results_per_keyword=args.max_channels,
+        page_size=args.page_size,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        payload_bytes=args.payload_bytes,
+        live_ratio=args.live_ratio,
+    )
+
+    results: List[Dict[str, Any]] = []
+    with MockHelixServer(config) as server:
+        for name, overrides in scenarios:
+            runs = [
+                run_scenario(server, name, overrides, keywords, args.mode, args.max_channels, args.rate_limit)
+                for _ in range(max(1, args.repeat))
+            ]
+            ok = [run for run in runs if "error" not in run]
+            if not ok:
+                results.append(runs[0])
+                continue
+            # Median by wall time so one noisy run doesn't skew the comparison.
+            ok.sort(key=lambda run: run["seconds"])
+            results.append(ok[(len(ok) - 1) // 2])
+            if len(ok) > 1:
+                results[-1]["secondsAllRuns"] = [run["seconds"] for run in ok]
+                results[-1]["secondsStdev"] = round(statistics.pstdev(run["seconds"] for run in ok), 3)
+
+    _print_table(results)
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        with args.json.open("w", encoding="utf-8") as f:
+            json.dump({"config": vars(config), "mode": args.mode, "results": results}, f, indent=4)
+
+if __name__ == "__main__":
+    main()
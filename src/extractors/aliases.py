@@ -0,0 +1,65 @@
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+Accessor = Callable[[Dict[str, Any]], Any]
+
+class AliasResolver:
+    """
+    Builds normalized records whose fields can come from several alternative
+    source keys, e.g. ``display_name`` / ``displayName`` / ``user_name``.
+
+    Each field is ``(name, aliases, default)`` or ``(name, aliases, default,
+    convert)``. Per field, the value is the first truthy alias value or
+    ``default`` (passed through ``convert`` if given) - the same result as
+    ``convert(raw.get(a) or raw.get(b) or default)``. ``resolve(raw)`` returns
+    ``build(*values)``, or the tuple of values when no ``build`` is given.
+
+    For every payload shape (the payload's key tuple) a small accessor function
+    is generated once that only reads the aliases present in that shape, so a
+    page of same-shaped Helix objects is normalized without any per-record
+    alias probing.
+    """
+
+    def __init__(
+        self,
+        fields: Sequence[Tuple[Any, ...]],
+        build: Optional[Callable[..., Any]] = None,
+        max_shapes: int = 1024,
+    ) -> None:
+        self.fields = tuple(field[0] for field in fields)
+        self._aliases = tuple(tuple(field[1]) for field in fields)
+        self._defaults = tuple(field[2] for field in fields)
+        self._converters = tuple(field[3] if len(field) > 3 else None for field in fields)
+        self._build = build
+        self._accessors: Dict[Tuple[str, ...], Accessor] = {}
+        self._max_shapes = max_shapes
+
+    def _compile(self, shape: Tuple[str, ...]) -> Accessor:
+        present = set(shape)
+        namespace: Dict[str, Any] = {"_build": self._build}
+        values = []
+        for i in range(len(self.fields)):
+            namespace[f"_d{i}"] = self._defaults[i]
+            reads = [f"raw[{key!r}]" for key in self._aliases[i] if key in present]
+            expr = " or ".join(reads + [f"_d{i}"])
+            if self._converters[i] is not None:
+                namespace[f"_c{i}"] = self._converters[i]
+                expr = f"_c{i}({expr})"
+            values.append(expr)
+        if self._build is not None:
+            body = "_build(" + ", ".join(values) + ")"
+        else:
+            body = "(" + ", ".join(values) + ",)"
+        source = "def accessor(raw):\n    return " + body + "\n"
+        exec(compile(source, "<alias-accessor>", "exec"), namespace)
+        accessor: Accessor = namespace["accessor"]
+        if len(self._accessors) >= self._max_shapes:
+            self._accessors.clear()
+        self._accessors[shape] = accessor
+        return accessor
+
+    def resolve(self, raw: Dict[str, Any]) -> Any:
+        shape = tuple(raw)
+        accessor = self._accessors.get(shape)
+        if accessor is None:
+            accessor = self._compile(shape)
+        return accessor(raw)
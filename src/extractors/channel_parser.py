@@ -1,12 +1,8 @@
-from typing import Any, Dict, Optional
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 
-def _extract_channel_id(raw: Dict[str, Any]) -> str:
-    return str(
-        raw.get("id")
-        or raw.get("channelId")
-        or raw.get("broadcaster_id")
-        or raw.get("_id", "")
-    )
+from .aliases import AliasResolver
+from .records import ChannelRecord, Clip, Record, ScheduleSegment, Stream, Video, as_dict
 
 def _extract_display_name(raw: Dict[str, Any]) -> str:
     return (
@@ -26,9 +22,6 @@ def _extract_login(raw: Dict[str, Any]) -> str:
         or _extract_display_name(raw).lower()
     )
 
-def _extract_description(raw: Dict[str, Any]) -> str:
-    return raw.get("description") or raw.get("bio") or ""
-
 def _extract_profile_image_url(raw: Dict[str, Any]) -> str:
     return (
         raw.get("profile_image_url")
@@ -37,8 +30,7 @@ def _extract_profile_image_url(raw: Dict[str, Any]) -> str:
         or ""
     )
 
-def _extract_followers_count(raw: Dict[str, Any]) -> int:
-    count = raw.get("followersCount") or raw.get("followers") or raw.get("follower_count")
+def _followers_count(count: Any) -> int:
     try:
         return int(count) if count is not None else 0
     except (TypeError, ValueError):
@@ -51,38 +43,96 @@ def _extract_is_partner(raw: Dict[str, Any]) -> bool:
         return raw["broadcaster_type"] == "partner"
     return bool(raw.get("partner") or raw.get("is_partner"))
 
+# Output field -> source keys in order of preference (search results, /users and
+# already-built records use different names).
+_CHANNEL_FIELDS = AliasResolver(
+    [
+        ("channelId", ("id", "channelId", "broadcaster_id"), "", str),
+        ("displayName", ("display_name", "displayName", "broadcaster_name", "user_name", "login"), ""),
+        ("login", ("broadcaster_login", "login", "name"), ""),
+        ("description", ("description", "bio"), ""),
+        ("profileImageURL", ("profile_image_url", "profileImageURL", "thumbnail_url"), ""),
+        ("followersCount", ("followersCount", "followers", "follower_count"), None, _followers_count),
+    ]
+)
+
+def profile_fields(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The profile fields shared by raw search results and built records, used to
+    tell whether a channel's profile changed between runs.
+    """
+    return {
+        "login": _extract_login(raw),
+        "displayName": _extract_display_name(raw),
+        "profileImageURL": _extract_profile_image_url(raw),
+    }
+
 def build_channel_record(
     channel_raw: Dict[str, Any],
-    stream: Optional[Dict[str, Any]],
-    latest_video: Optional[Dict[str, Any]],
-    top_clip: Optional[Dict[str, Any]],
-    next_schedule: Optional[Dict[str, Any]],
+    stream: Optional[Stream],
+    latest_video: Optional[Video],
+    top_clip: Optional[Clip],
+    next_schedule: Optional[ScheduleSegment],
     keyword: str,
-) -> Dict[str, Any]:
+) -> ChannelRecord:
     """
     Build a normalized channel record that matches the schema described in the README.
     """
-    channel_id = _extract_channel_id(channel_raw)
-    display_name = _extract_display_name(channel_raw)
-    login = _extract_login(channel_raw)
-    description = _extract_description(channel_raw)
-    profile_image_url = _extract_profile_image_url(channel_raw)
-    followers_count = _extract_followers_count(channel_raw)
-    is_partner = _extract_is_partner(channel_raw)
+    channel_id, display_name, login, description, profile_image_url, followers_count = _CHANNEL_FIELDS.resolve(
+        channel_raw
+    )
+    return ChannelRecord(
+        channelId=channel_id or str(channel_raw.get("_id", "")),
+        displayName=display_name,
+        login=login or display_name.lower(),
+        description=description,
+        profileImageURL=profile_image_url,
+        followersCount=followers_count,
+        isPartner=_extract_is_partner(channel_raw),
+        stream=stream,
+        latestVideo=latest_video,
+        topClip=top_clip,
+        nextSchedule=next_schedule,
+        keyword=sys.intern(keyword),
+    )
+
+def build_channel_records(
+    channels: Sequence[Dict[str, Any]],
+    streams: Sequence[Optional[Stream]],
+    latest_videos: Sequence[Optional[Video]],
+    top_clips: Sequence[Optional[Clip]],
+    next_schedules: Sequence[Optional[ScheduleSegment]],
+    keyword: str,
+) -> List[ChannelRecord]:
+    """
+    Batch form of build_channel_record: the i-th record is built from the i-th
+    entry of every sequence.
+    """
+    return [
+        build_channel_record(channel, stream, video, clip, schedule, keyword)
+        for channel, stream, video, clip, schedule in zip(
+            channels, streams, latest_videos, top_clips, next_schedules
+        )
+    ]
 
-    record: Dict[str, Any] = {
-        "channelId": channel_id,
-        "displayName": display_name,
-        "login": login,
-        "description": description,
-        "profileImageURL": profile_image_url,
-        "followersCount": followers_count,
-        "isPartner": is_partner,
-        "stream": stream,
-        "latestVideo": latest_video,
-        "topClip": top_clip,
-        "nextSchedule": next_schedule,
-        "keyword": keyword,
-    }
+def merge_keyword_matches(records: Iterable[Record]) -> List[Dict[str, Any]]:
+    """
+    Collapse records that share a channelId into one record per channel.
 
-    return record
\ No newline at end of file
+    The first record seen for a channel is kept (so "keyword" stays the first
+    match) and gains a "keywords" list with every keyword that matched it.
+    Records that already carry a "keywords" list (e.g. merged shard outputs)
+    contribute all of them.
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    for record in map(as_dict, records):
+        channel_id = record.get("channelId") or ""
+        existing = merged.get(channel_id)
+        if existing is None:
+            existing = dict(record)
+            existing["keywords"] = []
+            merged[channel_id] = existing
+        for keyword in record.get("keywords") or [record.get("keyword")]:
+            if keyword and keyword not in existing["keywords"]:
+                existing["keywords"].append(keyword)
+    return list(merged.values())
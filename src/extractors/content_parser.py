@@ -1,93 +1,67 @@
-from typing import Any, Dict, Optional
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
 
-def parse_video(raw: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-    """
-    Normalize Twitch video data into the expected latestVideo schema.
-    """
-    if not raw:
-        return None
+from .aliases import AliasResolver
+from .records import Clip, ScheduleSegment, Video, intern_str
+
+# Durations often come as "3h5m10s" or "59s"; digits not followed by a unit are ignored.
+_DURATION_RE = re.compile(r"(\d+)([hms])")
+_UNIT_SECONDS = {"h": 3600, "m": 60, "s": 1}
+
+@lru_cache(maxsize=4096)
+def parse_duration(duration: str) -> int:
+    """Convert a Helix duration string such as "3h5m10s" to seconds (0 if unparseable)."""
+    return sum(int(value) * _UNIT_SECONDS[unit] for value, unit in _DURATION_RE.findall(duration))
 
+def _video_length(duration: Any) -> int:
+    return parse_duration(duration) if isinstance(duration, str) else 0
+
+def _clip_length(duration: Any) -> int:
+    # Clip durations are float seconds, e.g. 28.5
     try:
-        # Twitch videos: id, title, duration, thumbnail_url, url, created_at
-        video_id = str(raw.get("id") or "")
-        title = raw.get("title") or ""
-        thumbnail_url = raw.get("thumbnail_url") or ""
-        url = raw.get("url") or ""
-        created_at = raw.get("created_at") or raw.get("published_at") or ""
-        length_seconds = 0
-
-        # Duration often comes as "3h5m10s" or "59s"
-        duration = raw.get("duration") or ""
-        if isinstance(duration, str) and duration:
-            total = 0
-            num = ""
-            for ch in duration:
-                if ch.isdigit():
-                    num += ch
-                else:
-                    if num:
-                        value = int(num)
-                        if ch == "h":
-                            total += value * 3600
-                        elif ch == "m":
-                            total += value * 60
-                        elif ch == "s":
-                            total += value
-                        num = ""
-            length_seconds = total or length_seconds
-
-        return {
-            "id": video_id,
-            "title": title,
-            "lengthSeconds": length_seconds,
-            "thumbnailURL": thumbnail_url,
-            "url": url,
-            "publishedAt": created_at,
-        }
-    except Exception:
-        return None
+        return int(float(duration)) if duration is not None else 0
+    except (TypeError, ValueError):
+        return 0
 
-def parse_clip(raw: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-    """
-    Normalize Twitch clip data into the expected topClip schema.
-    """
-    if not raw:
-        return None
+# Twitch videos: id, title, duration, thumbnail_url, url, created_at
+_VIDEO_FIELDS = AliasResolver(
+    [
+        ("id", ("id",), "", str),
+        ("title", ("title",), ""),
+        ("lengthSeconds", ("duration",), None, _video_length),
+        ("thumbnailURL", ("thumbnail_url",), ""),
+        ("url", ("url",), ""),
+        ("publishedAt", ("created_at", "published_at"), ""),
+    ],
+    build=Video,
+)
 
+_CLIP_FIELDS = AliasResolver(
+    [
+        ("id", ("id",), "", str),
+        ("title", ("title",), ""),
+        ("durationSeconds", ("duration",), None, _clip_length),
+        ("thumbnailURL", ("thumbnail_url",), ""),
+        ("url", ("url",), ""),
+        ("createdAt", ("created_at",), ""),
+    ],
+    build=Clip,
+)
+
+def _normalize_video(raw: Dict[str, Any]) -> Optional[Video]:
     try:
-        clip_id = str(raw.get("id") or "")
-        title = raw.get("title") or ""
-        thumbnail_url = raw.get("thumbnail_url") or ""
-        url = raw.get("url") or ""
-        created_at = raw.get("created_at") or ""
-        duration_seconds = 0
-
-        dur = raw.get("duration")
-        try:
-            if dur is not None:
-                duration_seconds = int(float(dur))
-        except (TypeError, ValueError):
-            duration_seconds = 0
-
-        return {
-            "id": clip_id,
-            "title": title,
-            "durationSeconds": duration_seconds,
-            "thumbnailURL": thumbnail_url,
-            "url": url,
-            "createdAt": created_at,
-        }
+        return _VIDEO_FIELDS.resolve(raw)
     except Exception:
         return None
 
-def parse_schedule(raw: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-    """
-    Extract the next upcoming scheduled stream, if available.
-    Twitch schedule responses contain segments with start_time/end_time.
-    """
-    if not raw:
+def _normalize_clip(raw: Dict[str, Any]) -> Optional[Clip]:
+    try:
+        return _CLIP_FIELDS.resolve(raw)
+    except Exception:
         return None
 
+def _normalize_schedule(raw: Dict[str, Any]) -> Optional[ScheduleSegment]:
     # Try to support both {"segments": [...]} and {"data": {"segments": [...]}} shapes.
     segments = None
     if isinstance(raw, dict):
@@ -102,13 +76,56 @@ def parse_schedule(raw: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
     # Pick the earliest upcoming segment
     segment = segments[0]
     try:
-        return {
-            "id": str(segment.get("id") or ""),
-            "title": segment.get("title") or "",
-            "startTime": segment.get("start_time") or "",
-            "endTime": segment.get("end_time") or "",
-            "category": (segment.get("category") or {}).get("name", ""),
-            "cancelledUntil": segment.get("canceled_until") or "",
-        }
+        return ScheduleSegment(
+            id=str(segment.get("id") or ""),
+            title=segment.get("title") or "",
+            startTime=segment.get("start_time") or "",
+            endTime=segment.get("end_time") or "",
+            category=intern_str((segment.get("category") or {}).get("name", "")),
+            cancelledUntil=segment.get("canceled_until") or "",
+        )
     except Exception:
-        return None
\ No newline at end of file
+        return None
+
+def parse_video(raw: Optional[Dict[str, Any]]) -> Optional[Video]:
+    """
+    Normalize Twitch video data into the expected latestVideo schema.
+    """
+    if not raw:
+        return None
+    return _normalize_video(raw)
+
+def parse_clip(raw: Optional[Dict[str, Any]]) -> Optional[Clip]:
+    """
+    Normalize Twitch clip data into the expected topClip schema.
+    """
+    if not raw:
+        return None
+    return _normalize_clip(raw)
+
+def parse_schedule(raw: Optional[Dict[str, Any]]) -> Optional[ScheduleSegment]:
+    """
+    Extract the next upcoming scheduled stream, if available.
+    Twitch schedule responses contain segments with start_time/end_time.
+    """
+    if not raw:
+        return None
+    return _normalize_schedule(raw)
+
+def parse_videos(raws: Iterable[Optional[Dict[str, Any]]]) -> List[Optional[Video]]:
+    """
+    Batch form of parse_video for a whole page of raw videos (None entries stay None).
+    """
+    return [_normalize_video(raw) if raw else None for raw in raws]
+
+def parse_clips(raws: Iterable[Optional[Dict[str, Any]]]) -> List[Optional[Clip]]:
+    """
+    Batch form of parse_clip for a whole page of raw clips (None entries stay None).
+    """
+    return [_normalize_clip(raw) if raw else None for raw in raws]
+
+def parse_schedules(raws: Iterable[Optional[Dict[str, Any]]]) -> List[Optional[ScheduleSegment]]:
+    """
+    Batch form of parse_schedule for a whole page of raw schedules (None entries stay None).
+    """
+    return [_normalize_schedule(raw) if raw else None for raw in raws]
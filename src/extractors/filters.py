@@ -0,0 +1,91 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Enrichment fields a scrape can be limited to with the "fields" setting;
+# "profile" is the batched /users lookup (description, profile image, partner flag).
+ENRICHMENT_FIELDS = ("stream", "latestVideo", "topClip", "nextSchedule", "profile")
+
+# Record fields each enrichment field fills in; without "profile" a record only
+# has what the search result or /streams item carries.
+ENRICHMENT_RECORD_FIELDS = {
+    "stream": ("stream",),
+    "latestVideo": ("latestVideo",),
+    "topClip": ("topClip",),
+    "nextSchedule": ("nextSchedule",),
+    "profile": ("description", "isPartner"),
+}
+
+_FOLLOWER_KEYS = ("followersCount", "followers", "follower_count")
+
+def _lowered(values: Optional[Iterable[Any]]) -> frozenset:
+    return frozenset(str(v).strip().lower() for v in values or () if str(v).strip())
+
+def followers_of(raw: Dict[str, Any]) -> Optional[int]:
+    """Follower count carried by a payload, or None if it does not have one."""
+    for key in _FOLLOWER_KEYS:
+        value = raw.get(key)
+        if value is not None:
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                return None
+    return None
+
+def channel_priority(raw: Dict[str, Any]) -> Tuple[bool, int, int]:
+    """
+    Sort key (highest first) for a raw search result or /streams item: live
+    channels first, then by viewer count, then by follower count when known.
+    """
+    live = bool(raw.get("is_live") or raw.get("type") == "live")
+    try:
+        viewers = int(raw.get("viewer_count") or 0)
+    except (TypeError, ValueError):
+        viewers = 0
+    return live, viewers, followers_of(raw) or 0
+
+class ChannelFilter:
+    """
+    Filter applied to raw /search/channels results before any enrichment call
+    is made, so rejected channels cost nothing beyond the search page.
+
+    ``languages`` match ``broadcaster_language`` and ``games`` match the current
+    game's name or id (both case-insensitive). ``min_followers`` only rejects
+    channels whose payload carries a follower count; search results usually do
+    not, in which case the channel is kept.
+    """
+
+    def __init__(
+        self,
+        live_only: bool = False,
+        languages: Optional[Iterable[str]] = None,
+        games: Optional[Iterable[str]] = None,
+        min_followers: Optional[int] = None,
+    ) -> None:
+        self.live_only = live_only
+        self.languages = _lowered(languages)
+        self.games = _lowered(games)
+        self.min_followers = min_followers
+
+    @property
+    def active(self) -> bool:
+        return bool(self.live_only or self.languages or self.games or self.min_followers)
+
+    def matches(self, raw: Dict[str, Any]) -> bool:
+        if self.live_only and not raw.get("is_live"):
+            return False
+        if self.languages:
+            language = raw.get("broadcaster_language") or raw.get("language") or ""
+            if str(language).lower() not in self.languages:
+                return False
+        if self.games:
+            game_name = str(raw.get("game_name") or raw.get("gameName") or "").lower()
+            game_id = str(raw.get("game_id") or "")
+            if game_name not in self.games and game_id not in self.games:
+                return False
+        if self.min_followers:
+            followers = followers_of(raw)
+            if followers is not None and followers < self.min_followers:
+                return False
+        return True
+
+    def apply(self, channels: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [ch for ch in channels if self.matches(ch)]
@@ -0,0 +1,233 @@
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple, Union
+
+def intern_str(value: Any) -> Any:
+    """``sys.intern`` for strings; anything else is returned unchanged."""
+    return sys.intern(value) if type(value) is str else value
+
+def intern_tags(tags: Any) -> Tuple[str, ...]:
+    return tuple(sys.intern(str(t)) for t in tags) if isinstance(tags, list) else ()
+
+# __slots__ are declared by hand rather than with dataclass(slots=True), which needs Python 3.10.
+
+@dataclass
+class Stream:
+    __slots__ = ("id", "title", "gameName", "viewerCount", "startedAt", "language", "tags", "thumbnailURL")
+
+    id: str
+    title: str
+    gameName: str
+    viewerCount: int
+    startedAt: str
+    language: str
+    tags: Tuple[str, ...]
+    thumbnailURL: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "gameName": self.gameName,
+            "viewerCount": self.viewerCount,
+            "startedAt": self.startedAt,
+            "language": self.language,
+            "tags": list(self.tags),
+            "thumbnailURL": self.thumbnailURL,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Stream":
+        return cls(
+            data.get("id", ""),
+            data.get("title", ""),
+            intern_str(data.get("gameName", "")),
+            data.get("viewerCount", 0),
+            data.get("startedAt", ""),
+            intern_str(data.get("language", "")),
+            intern_tags(data.get("tags")),
+            data.get("thumbnailURL", ""),
+        )
+
+@dataclass
+class Video:
+    __slots__ = ("id", "title", "lengthSeconds", "thumbnailURL", "url", "publishedAt")
+
+    id: str
+    title: str
+    lengthSeconds: int
+    thumbnailURL: str
+    url: str
+    publishedAt: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "lengthSeconds": self.lengthSeconds,
+            "thumbnailURL": self.thumbnailURL,
+            "url": self.url,
+            "publishedAt": self.publishedAt,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Video":
+        return cls(
+            data.get("id", ""),
+            data.get("title", ""),
+            data.get("lengthSeconds", 0),
+            data.get("thumbnailURL", ""),
+            data.get("url", ""),
+            data.get("publishedAt", ""),
+        )
+
+@dataclass
+class Clip:
+    __slots__ = ("id", "title", "durationSeconds", "thumbnailURL", "url", "createdAt")
+
+    id: str
+    title: str
+    durationSeconds: int
+    thumbnailURL: str
+    url: str
+    createdAt: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "durationSeconds": self.durationSeconds,
+            "thumbnailURL": self.thumbnailURL,
+            "url": self.url,
+            "createdAt": self.createdAt,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Clip":
+        return cls(
+            data.get("id", ""),
+            data.get("title", ""),
+            data.get("durationSeconds", 0),
+            data.get("thumbnailURL", ""),
+            data.get("url", ""),
+            data.get("createdAt", ""),
+        )
+
+@dataclass
+class ScheduleSegment:
+    __slots__ = ("id", "title", "startTime", "endTime", "category", "cancelledUntil")
+
+    id: str
+    title: str
+    startTime: str
+    endTime: str
+    category: str
+    cancelledUntil: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "startTime": self.startTime,
+            "endTime": self.endTime,
+            "category": self.category,
+            "cancelledUntil": self.cancelledUntil,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ScheduleSegment":
+        return cls(
+            data.get("id", ""),
+            data.get("title", ""),
+            data.get("startTime", ""),
+            data.get("endTime", ""),
+            intern_str(data.get("category", "")),
+            data.get("cancelledUntil", ""),
+        )
+
+def _nested_dict(value: Any) -> Optional[Dict[str, Any]]:
+    return value.to_dict() if value is not None else None
+
+@dataclass
+class ChannelRecord:
+    """
+    In-memory form of a channel record (see the README schema). Repeated strings
+    (game, language, tags, keyword) are interned; ``to_dict`` produces the JSON
+    shape and is only called when a record is exported.
+    """
+
+    __slots__ = (
+        "channelId",
+        "displayName",
+        "login",
+        "description",
+        "profileImageURL",
+        "followersCount",
+        "isPartner",
+        "stream",
+        "latestVideo",
+        "topClip",
+        "nextSchedule",
+        "keyword",
+    )
+
+    channelId: str
+    displayName: str
+    login: str
+    description: str
+    profileImageURL: str
+    followersCount: int
+    isPartner: bool
+    stream: Optional[Stream]
+    latestVideo: Optional[Video]
+    topClip: Optional[Clip]
+    nextSchedule: Optional[ScheduleSegment]
+    keyword: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "channelId": self.channelId,
+            "displayName": self.displayName,
+            "login": self.login,
+            "description": self.description,
+            "profileImageURL": self.profileImageURL,
+            "followersCount": self.followersCount,
+            "isPartner": self.isPartner,
+            "stream": _nested_dict(self.stream),
+            "latestVideo": _nested_dict(self.latestVideo),
+            "topClip": _nested_dict(self.topClip),
+            "nextSchedule": _nested_dict(self.nextSchedule),
+            "keyword": self.keyword,
+        }
+
+    def profile_fields(self) -> Dict[str, Any]:
+        """Same as channel_parser.profile_fields for the dict form of this record."""
+        return {"login": self.login, "displayName": self.displayName, "profileImageURL": self.profileImageURL}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ChannelRecord":
+        """Rebuild a record from its JSON shape (match-only fields such as ``keywords`` are dropped)."""
+        stream = data.get("stream")
+        video = data.get("latestVideo")
+        clip = data.get("topClip")
+        schedule = data.get("nextSchedule")
+        return cls(
+            data.get("channelId", ""),
+            data.get("displayName", ""),
+            data.get("login", ""),
+            data.get("description", ""),
+            data.get("profileImageURL", ""),
+            data.get("followersCount", 0),
+            data.get("isPartner", False),
+            Stream.from_dict(stream) if stream else None,
+            Video.from_dict(video) if video else None,
+            Clip.from_dict(clip) if clip else None,
+            ScheduleSegment.from_dict(schedule) if schedule else None,
+            intern_str(data.get("keyword", "")),
+        )
+
+Record = Union[ChannelRecord, Dict[str, Any]]
+
+def as_dict(record: Record) -> Dict[str, Any]:
+    """JSON shape of a record; plain dicts (e.g. delta tombstones) pass through."""
+    return record.to_dict() if isinstance(record, ChannelRecord) else record
@@ -1,37 +1,39 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
-def _extract_tags(raw: Dict[str, Any]) -> List[str]:
-    tags = raw.get("tag_ids") or raw.get("tags") or []
-    if isinstance(tags, list):
-        return [str(t) for t in tags]
-    return []
+from .aliases import AliasResolver
+from .records import Stream, intern_str, intern_tags
 
-def parse_stream(raw: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+_STREAM_FIELDS = AliasResolver(
+    [
+        ("id", ("id",), "", str),
+        ("title", ("title",), ""),
+        ("gameName", ("game_name", "game"), "", intern_str),
+        ("viewerCount", ("viewer_count",), 0, int),
+        ("startedAt", ("started_at",), ""),
+        ("language", ("language",), "", intern_str),
+        ("tags", ("tag_ids", "tags"), None, intern_tags),
+        ("thumbnailURL", ("thumbnail_url",), ""),
+    ],
+    build=Stream,
+)
+
+def _normalize_stream(raw: Dict[str, Any]) -> Optional[Stream]:
+    try:
+        return _STREAM_FIELDS.resolve(raw)
+    except Exception:
+        # If anything goes wrong, treat as no live stream instead of breaking the scraper
+        return None
+
+def parse_stream(raw: Optional[Dict[str, Any]]) -> Optional[Stream]:
     """
     Normalize Twitch stream data if the channel is currently live.
     """
     if not raw:
         return None
+    return _normalize_stream(raw)
 
-    try:
-        stream_id = str(raw.get("id") or "")
-        title = raw.get("title") or ""
-        game_name = raw.get("game_name") or raw.get("game") or ""
-        viewer_count = int(raw.get("viewer_count") or 0)
-        started_at = raw.get("started_at") or ""
-        language = raw.get("language") or ""
-        thumbnail_url = raw.get("thumbnail_url") or ""
-
-        return {
-            "id": stream_id,
-            "title": title,
-            "gameName": game_name,
-            "viewerCount": viewer_count,
-            "startedAt": started_at,
-            "language": language,
-            "tags": _extract_tags(raw),
-            "thumbnailURL": thumbnail_url,
-        }
-    except Exception:
-        # If anything goes wrong, treat as no live stream instead of breaking the scraper
-        return None
\ No newline at end of file
+def parse_streams(raws: Iterable[Optional[Dict[str, Any]]]) -> List[Optional[Stream]]:
+    """
+    Batch form of parse_stream for a whole page of raw streams (None entries stay None).
+    """
+    return [_normalize_stream(raw) if raw else None for raw in raws]
@@ -0,0 +1,181 @@
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None  # type: ignore
+    pa_ipc = None  # type: ignore
+    pq = None  # type: ignore
+
+from extractors.records import Record, as_dict  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    """Parse Helix RFC3339 timestamps ("2024-05-12T18:30:00Z"); empty/invalid -> None."""
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+def _identity(value: Any) -> Any:
+    return value
+
+# Flattened column layout of the record built by build_channel_record:
+# (column name, nested record key or None for top level, field name, arrow type name, converter)
+_COLUMN_SPECS: List[Tuple[str, Optional[str], str, str, Callable[[Any], Any]]] = [
+    ("channelId", None, "channelId", "string", _identity),
+    ("displayName", None, "displayName", "string", _identity),
+    ("login", None, "login", "string", _identity),
+    ("description", None, "description", "string", _identity),
+    ("profileImageURL", None, "profileImageURL", "string", _identity),
+    ("followersCount", None, "followersCount", "int64", _identity),
+    ("isPartner", None, "isPartner", "bool", _identity),
+    ("keyword", None, "keyword", "string", _identity),
+    ("keywords", None, "keywords", "list<string>", _identity),
+    ("change", None, "change", "string", _identity),
+    ("stream_id", "stream", "id", "string", _identity),
+    ("stream_title", "stream", "title", "string", _identity),
+    ("stream_gameName", "stream", "gameName", "string", _identity),
+    ("stream_viewerCount", "stream", "viewerCount", "int64", _identity),
+    ("stream_startedAt", "stream", "startedAt", "timestamp", _parse_timestamp),
+    ("stream_language", "stream", "language", "string", _identity),
+    ("stream_tags", "stream", "tags", "list<string>", _identity),
+    ("stream_thumbnailURL", "stream", "thumbnailURL", "string", _identity),
+    ("latestVideo_id", "latestVideo", "id", "string", _identity),
+    ("latestVideo_title", "latestVideo", "title", "string", _identity),
+    ("latestVideo_lengthSeconds", "latestVideo", "lengthSeconds", "int64", _identity),
+    ("latestVideo_thumbnailURL", "latestVideo", "thumbnailURL", "string", _identity),
+    ("latestVideo_url", "latestVideo", "url", "string", _identity),
+    ("latestVideo_publishedAt", "latestVideo", "publishedAt", "timestamp", _parse_timestamp),
+    ("topClip_id", "topClip", "id", "string", _identity),
+    ("topClip_title", "topClip", "title", "string", _identity),
+    ("topClip_durationSeconds", "topClip", "durationSeconds", "int64", _identity),
+    ("topClip_thumbnailURL", "topClip", "thumbnailURL", "string", _identity),
+    ("topClip_url", "topClip", "url", "string", _identity),
+    ("topClip_createdAt", "topClip", "createdAt", "timestamp", _parse_timestamp),
+    ("nextSchedule_id", "nextSchedule", "id", "string", _identity),
+    ("nextSchedule_title", "nextSchedule", "title", "string", _identity),
+    ("nextSchedule_startTime", "nextSchedule", "startTime", "timestamp", _parse_timestamp),
+    ("nextSchedule_endTime", "nextSchedule", "endTime", "timestamp", _parse_timestamp),
+    ("nextSchedule_category", "nextSchedule", "category", "string", _identity),
+    ("nextSchedule_cancelledUntil", "nextSchedule", "cancelledUntil", "timestamp", _parse_timestamp),
+]
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("Columnar export requires pyarrow. Install it with 'pip install pyarrow'.")
+
+def _arrow_type(name: str) -> "pa.DataType":
+    return {
+        "string": pa.string(),
+        "int64": pa.int64(),
+        "bool": pa.bool_(),
+        "timestamp": pa.timestamp("s", tz="UTC"),
+        "list<string>": pa.list_(pa.string()),
+    }[name]
+
+def record_schema() -> "pa.Schema":
+    """Arrow schema of a flattened channel record."""
+    _require_pyarrow()
+    return pa.schema([pa.field(column, _arrow_type(type_name)) for column, _, _, type_name, _ in _COLUMN_SPECS])
+
+def flatten_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Flatten a channel record into one value per column. Missing nested objects
+    (e.g. an offline channel's ``stream``) become nulls.
+    """
+    row: Dict[str, Any] = {}
+    for column, parent, field, _, convert in _COLUMN_SPECS:
+        source = record.get(parent) if parent else record
+        value = source.get(field) if isinstance(source, dict) else None
+        row[column] = convert(value) if value is not None else None
+    return row
+
+class ColumnarRecordWriter:
+    """
+    Incremental Parquet / Arrow IPC writer for channel records.
+
+    Rows are buffered and written as one row group (or record batch) every
+    ``row_group_size`` records, so arbitrarily large runs can be exported with
+    bounded memory. The format is taken from ``fmt`` or the file suffix
+    (``.parquet`` vs ``.arrow`` / ``.feather`` / ``.ipc``).
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        fmt: Optional[str] = None,
+        row_group_size: int = 50_000,
+        compression: str = "zstd",
+    ) -> None:
+        _require_pyarrow()
+        self.path = Path(path)
+        self.fmt = (fmt or ("arrow" if self.path.suffix in (".arrow", ".feather", ".ipc") else "parquet")).lower()
+        if self.fmt not in ("parquet", "arrow"):
+            raise ValueError(f"Unsupported columnar format '{self.fmt}' (expected parquet or arrow)")
+        self.row_group_size = max(1, row_group_size)
+        self.schema = record_schema()
+        self.count = 0
+        self._columns: Dict[str, List[Any]] = {column: [] for column, _, _, _, _ in _COLUMN_SPECS}
+        self._pending = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._writer: Any
+        if self.fmt == "parquet":
+            self._writer = pq.ParquetWriter(str(self.path), self.schema, compression=compression)
+        else:
+            self._writer = pa_ipc.new_file(str(self.path), self.schema)
+
+    def write(self, record: Record) -> None:
+        for column, value in flatten_record(as_dict(record)).items():
+            self._columns[column].append(value)
+        self._pending += 1
+        self.count += 1
+        if self._pending >= self.row_group_size:
+            self._write_pending()
+
+    def write_many(self, records: Iterable[Record]) -> None:
+        for record in records:
+            self.write(record)
+
+    def _write_pending(self) -> None:
+        if not self._pending:
+            return
+        # ParquetWriter and the IPC file writer share the write_table() API.
+        self._writer.write_table(pa.Table.from_pydict(self._columns, schema=self.schema))
+        for values in self._columns.values():
+            values.clear()
+        self._pending = 0
+
+    def close(self) -> None:
+        if self._writer is None:
+            return
+        self._write_pending()
+        self._writer.close()
+        self._writer = None
+        logger.info("Wrote %d records to %s file %s", self.count, self.fmt, self.path)
+
+    def __enter__(self) -> "ColumnarRecordWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+def export_to_parquet(records: Iterable[Record], path: Path) -> int:
+    """
+    Export records to a Parquet file in one go. Returns the number written.
+    """
+    with ColumnarRecordWriter(path, fmt="parquet") as writer:
+        writer.write_many(records)
+    return writer.count
@@ -1,15 +1,161 @@
-import json
+import gzip
+import io
 import logging
 from pathlib import Path
-from typing import Any, Iterable, List, Dict
+from typing import IO, Any, Iterable, Iterator, List, Dict, Optional
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None  # type: ignore
+
+from extractors.records import Record, as_dict  # type: ignore
+from utils import serialization  # type: ignore
 
 logger = logging.getLogger(__name__)
 
-def export_to_json(records: Iterable[Dict[str, Any]], path: Path) -> None:
+def export_to_json(records: Iterable[Record], path: Path) -> None:
     """
     Export records to a pretty-printed JSON file.
     """
-    data: List[Dict[str, Any]] = list(records)
+    data: List[Dict[str, Any]] = [as_dict(record) for record in records]
     with path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
-    logger.info("Wrote %d records to JSON file %s", len(data), path)
\ No newline at end of file
+        f.write(serialization.dumps_pretty(data))
+    logger.info("Wrote %d records to JSON file %s", len(data), path)
+
+def _resolve_compression(path: Path, compression: Optional[str]) -> Optional[str]:
+    if compression:
+        compression = compression.lower()
+        if compression in ("gz", "gzip"):
+            return "gzip"
+        if compression in ("zst", "zstd"):
+            return "zstd"
+        raise ValueError(f"Unsupported compression '{compression}' (expected gzip or zstd)")
+    if path.suffix == ".gz":
+        return "gzip"
+    if path.suffix == ".zst":
+        return "zstd"
+    return None
+
+def _require_zstandard() -> None:
+    if zstandard is None:
+        raise ImportError("zstd compression requires zstandard. Install it with 'pip install zstandard'.")
+
+def _open_text(path: Path, mode: str, compression: Optional[str], buffer_size: int) -> IO[str]:
+    """Open ``path`` for text reading ("r") or writing ("w"/"a"), optionally compressed."""
+    if compression == "gzip":
+        return gzip.open(path, mode + "t", encoding="utf-8")  # type: ignore[return-value]
+    if compression == "zstd":
+        _require_zstandard()
+        raw = path.open(mode + "b")
+        if mode == "r":
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+        else:
+            stream = zstandard.ZstdCompressor().stream_writer(raw)
+        return io.TextIOWrapper(stream, encoding="utf-8")  # type: ignore[arg-type]
+    return path.open(mode, encoding="utf-8", buffering=buffer_size)
+
+class JsonLinesWriter:
+    """
+    Incremental NDJSON writer: one compact JSON object per line.
+
+    Records are written as soon as they are handed over, so memory stays flat and
+    a crash only loses what has not been flushed yet. Supports gzip and zstd
+    (optional ``zstandard`` package) streams, inferred from the file suffix when
+    ``compression`` is not given. ``append=True`` continues an existing file.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        compression: Optional[str] = None,
+        append: bool = False,
+        buffer_size: int = 1024 * 1024,
+    ) -> None:
+        self.path = Path(path)
+        self.compression = _resolve_compression(self.path, compression)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = _open_text(self.path, "a" if append else "w", self.compression, buffer_size)
+        self.count = 0
+
+    def write(self, record: Record) -> None:
+        self._fh.write(serialization.dumps(as_dict(record)))
+        self._fh.write("\n")
+        self.count += 1
+
+    def write_many(self, records: Iterable[Record]) -> None:
+        for record in records:
+            self.write(record)
+
+    def flush(self) -> None:
+        self._fh.flush()
+
+    def close(self) -> None:
+        if not self._fh.closed:
+            self._fh.close()
+            logger.info("Wrote %d records to JSONL file %s", self.count, self.path)
+
+    def __enter__(self) -> "JsonLinesWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+def iter_jsonl(path: Path, compression: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield records from an NDJSON file. A truncated last line (e.g. from a crash
+    mid-write) is skipped with a warning.
+    """
+    path = Path(path)
+    with _open_text(path, "r", _resolve_compression(path, compression), -1) as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield serialization.loads(line)
+            except ValueError:
+                logger.warning("Skipping malformed line %d in %s", line_no, path)
+
+def export_to_jsonl(
+    records: Iterable[Record],
+    path: Path,
+    compression: Optional[str] = None,
+) -> int:
+    """
+    Export records to an NDJSON file in one go. Returns the number written.
+    """
+    with JsonLinesWriter(path, compression=compression) as writer:
+        writer.write_many(records)
+    return writer.count
+
+def jsonl_to_json(
+    jsonl_path: Path,
+    json_path: Path,
+    compression: Optional[str] = None,
+) -> int:
+    """
+    Finalize step: convert an NDJSON file into the pretty-printed JSON array that
+    export_to_json produces, streaming one record at a time.
+    """
+    count = 0
+    with json_path.open("w", encoding="utf-8") as out:
+        out.write("[")
+        for record in iter_jsonl(jsonl_path, compression):
+            out.write(",\n    " if count else "\n    ")
+            out.write(serialization.dumps_pretty(record).replace("\n", "\n    "))
+            count += 1
+        out.write("\n]" if count else "]")
+    logger.info("Wrote %d records to JSON file %s", count, json_path)
+    return count
+
+def iter_records(path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Yield records from either a JSON array file (``.json``) or an NDJSON file
+    (any other suffix, optionally gzip/zstd compressed).
+    """
+    path = Path(path)
+    if path.suffix == ".json":
+        yield from serialization.loads(path.read_bytes())
+    else:
+        yield from iter_jsonl(path)
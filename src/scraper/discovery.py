@@ -0,0 +1,276 @@
+import logging
+from typing import Any, Collection, Dict, Iterator, List, Optional, Set, Tuple
+
+from extractors.filters import ChannelFilter  # type: ignore
+from extractors.records import ChannelRecord  # type: ignore
+from utils.async_request_handler import AsyncRequestHandler  # type: ignore
+from utils.delta_state import DeltaStateStore  # type: ignore
+from utils.enrichment_index import EnrichmentIndex  # type: ignore
+from utils.metrics import timed  # type: ignore
+from utils.pagination import paginate  # type: ignore
+from utils.request_handler import RequestHandler  # type: ignore
+
+from .enrichment import build_enriched_records, enrich_channels
+from .lookups import HELIX_BATCH_SIZE, fetch_enrichment, fetch_enrichment_async, fetch_game_ids
+
+def iter_search_pages(
+    handler: RequestHandler,
+    keyword: str,
+    max_channels: int,
+    start_cursor: Optional[str] = None,
+    already_collected: int = 0,
+    live_only: bool = False,
+) -> Iterator[Tuple[List[Dict[str, Any]], Optional[str]]]:
+    """
+    Page through /search/channels for a keyword.
+
+    Yields ``(raw_channels, next_cursor)`` per page; ``next_cursor`` is None on the
+    last page. ``start_cursor`` / ``already_collected`` resume a partially processed
+    keyword from a checkpoint. ``live_only`` asks Helix for live channels only.
+    """
+    logging.info("Searching channels for keyword '%s'", keyword)
+
+    next_cursor: Dict[str, Optional[str]] = {"value": None}
+
+    def fetch_page(cursor: Optional[str]) -> Dict[str, Any]:
+        params: Dict[str, Any] = {
+            "query": keyword,
+            "first": 100,
+            "live_only": live_only,
+        }
+        if cursor:
+            params["after"] = cursor
+        with timed(handler.metrics, "search"):
+            response = handler.get("/search/channels", params=params)
+        next_cursor["value"] = (response.get("pagination") or {}).get("cursor")
+        return response
+
+    remaining = max_channels - already_collected
+    if remaining <= 0:
+        return
+
+    found = 0
+    for page in paginate(fetch_page, max_items=remaining, start_cursor=start_cursor):
+        found += len(page)
+        is_last = found >= remaining or not next_cursor["value"]
+        yield page, None if is_last else next_cursor["value"]
+
+    logging.info("Found %d raw channels for keyword '%s'", found, keyword)
+
+def iter_keyword_results(
+    handler: RequestHandler,
+    keyword: str,
+    max_channels: int,
+    workers: int = 1,
+    batch: bool = False,
+    async_handler: Optional[AsyncRequestHandler] = None,
+    index: Optional[EnrichmentIndex] = None,
+    start_cursor: Optional[str] = None,
+    already_collected: int = 0,
+    delta: Optional[DeltaStateStore] = None,
+    fields: Optional[Collection[str]] = None,
+    channel_filter: Optional[ChannelFilter] = None,
+) -> Iterator[Tuple[List[ChannelRecord], Optional[str]]]:
+    """
+    Search Twitch channels by keyword page by page, enriching each page as it arrives.
+    Yields ``(records, next_cursor)`` per search page.
+    """
+    for page, cursor in iter_search_pages(
+        handler,
+        keyword,
+        max_channels,
+        start_cursor=start_cursor,
+        already_collected=already_collected,
+        live_only=channel_filter is not None and channel_filter.live_only,
+    ):
+        records = enrich_channels(
+            handler,
+            page,
+            keyword,
+            workers=workers,
+            batch=batch,
+            async_handler=async_handler,
+            index=index,
+            delta=delta,
+            fields=fields,
+            channel_filter=channel_filter,
+        )
+        yield records, cursor
+
+def search_channels_for_keyword(
+    handler: RequestHandler,
+    keyword: str,
+    max_channels: int,
+    workers: int = 1,
+    batch: bool = False,
+    async_handler: Optional[AsyncRequestHandler] = None,
+    index: Optional[EnrichmentIndex] = None,
+    fields: Optional[Collection[str]] = None,
+    channel_filter: Optional[ChannelFilter] = None,
+) -> List[ChannelRecord]:
+    """
+    Search Twitch channels by keyword and enrich them with stream, video, clip, and schedule data.
+    """
+    enriched: List[ChannelRecord] = []
+    for records, _ in iter_keyword_results(
+        handler,
+        keyword,
+        max_channels,
+        workers=workers,
+        batch=batch,
+        async_handler=async_handler,
+        index=index,
+        fields=fields,
+        channel_filter=channel_filter,
+    ):
+        enriched.extend(records)
+    return enriched
+
+def _channel_from_stream(stream: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Search-result shaped channel payload for a /streams item, so filters and
+    build_channel_record treat it like a /search/channels result.
+    """
+    return {
+        "id": str(stream.get("user_id") or ""),
+        "broadcaster_login": stream.get("user_login") or "",
+        "display_name": stream.get("user_name") or "",
+        "is_live": True,
+        "broadcaster_language": stream.get("language") or "",
+        "game_id": stream.get("game_id") or "",
+        "game_name": stream.get("game_name") or "",
+    }
+
+def iter_category_pages(
+    handler: RequestHandler,
+    game_name: str,
+    game_id: str,
+    max_channels: Optional[int] = None,
+    start_cursor: Optional[str] = None,
+    already_collected: int = 0,
+    languages: Optional[Collection[str]] = None,
+) -> Iterator[Tuple[List[Dict[str, Any]], Optional[str]]]:
+    """
+    Page through the live streams of one category, 100 per /streams request.
+
+    Yields ``(raw_streams, next_cursor)`` like iter_search_pages. Streams that
+    reappear on a later page (the list is re-sorted by viewers while paging)
+    are dropped. ``max_channels`` of None pages through the whole category.
+    """
+    logging.info("Listing live streams for category '%s' (game id %s)", game_name, game_id)
+
+    next_cursor: Dict[str, Optional[str]] = {"value": None}
+
+    def fetch_page(cursor: Optional[str]) -> Dict[str, Any]:
+        params: Dict[str, Any] = {"game_id": game_id, "first": HELIX_BATCH_SIZE, "type": "live"}
+        if languages:
+            params["language"] = sorted(languages)
+        if cursor:
+            params["after"] = cursor
+        with timed(handler.metrics, "discover"):
+            response = handler.get("/streams", params=params)
+        next_cursor["value"] = (response.get("pagination") or {}).get("cursor")
+        return response
+
+    remaining = max_channels - already_collected if max_channels is not None else None
+    if remaining is not None and remaining <= 0:
+        return
+
+    found = 0
+    seen: Set[str] = set()
+    for page in paginate(fetch_page, max_items=remaining, start_cursor=start_cursor):
+        found += len(page)
+        is_last = (remaining is not None and found >= remaining) or not next_cursor["value"]
+        fresh = []
+        for stream in page:
+            user_id = str(stream.get("user_id") or "")
+            if user_id and user_id not in seen:
+                seen.add(user_id)
+                fresh.append(stream)
+        yield fresh, None if is_last else next_cursor["value"]
+
+    logging.info("Found %d live streams for category '%s'", len(seen), game_name)
+
+# Category discovery gets the stream from the listing itself; by default only the
+# batched /users profile is added. Other fields are fetched only if listed in "fields".
+CATEGORY_DEFAULT_FIELDS = frozenset({"stream", "profile"})
+
+def build_category_records(
+    handler: RequestHandler,
+    streams: List[Dict[str, Any]],
+    game_name: str,
+    workers: int = 1,
+    async_handler: Optional[AsyncRequestHandler] = None,
+    fields: Optional[Collection[str]] = None,
+    channel_filter: Optional[ChannelFilter] = None,
+    delta: Optional[DeltaStateStore] = None,
+) -> List[ChannelRecord]:
+    """
+    Build records for a page of /streams items. The stream payload is used as
+    is; the profile comes from one /users request per 100 channels, and any
+    other ``fields`` are looked up per channel as in enrich_channels. The
+    fields fetched are reported to ``delta``.
+    """
+    fields = CATEGORY_DEFAULT_FIELDS if fields is None else fields
+    items = [(_channel_from_stream(stream), stream) for stream in streams]
+    if channel_filter is not None and channel_filter.active:
+        items = [(ch, stream) for ch, stream in items if channel_filter.matches(ch)]
+    channel_ids = [ch["id"] for ch, _ in items if ch["id"]]
+    lookups = set(fields) - {"stream"}
+
+    raw_by_id: Dict[str, Dict[str, Optional[Dict[str, Any]]]] = {}
+    with timed(handler.metrics, "enrich"):
+        if lookups and channel_ids and async_handler is not None:
+            raw_by_id = async_handler.run(
+                fetch_enrichment_async(async_handler, channel_ids, concurrency=workers, batch=True, fields=lookups)
+            )
+        elif lookups and channel_ids:
+            raw_by_id = fetch_enrichment(handler, channel_ids, workers=workers, batch=True, fields=lookups)
+    if delta is not None:
+        for channel_id, raw in raw_by_id.items():
+            delta.record_fetched(channel_id, raw)
+
+    to_build = []
+    for ch, stream in items:
+        if not ch["id"]:
+            continue
+        raw = dict(raw_by_id.get(ch["id"]) or {})
+        raw["stream"] = stream if "stream" in fields else None
+        to_build.append((ch, raw))
+    with timed(handler.metrics, "parse"):
+        return build_enriched_records(to_build, game_name)
+
+def discover_category_channels(
+    handler: RequestHandler,
+    game_name: str,
+    max_channels: Optional[int] = None,
+    workers: int = 1,
+    async_handler: Optional[AsyncRequestHandler] = None,
+    fields: Optional[Collection[str]] = None,
+    channel_filter: Optional[ChannelFilter] = None,
+) -> List[ChannelRecord]:
+    """
+    Category counterpart of search_channels_for_keyword: every live channel in
+    the game ``game_name`` (up to ``max_channels``), with ``keyword`` set to it.
+    """
+    game_id = fetch_game_ids(handler, [game_name]).get(game_name)
+    if game_id is None:
+        logging.warning("Unknown category '%s'", game_name)
+        return []
+    languages = channel_filter.languages if channel_filter is not None else None
+    records: List[ChannelRecord] = []
+    for streams, _ in iter_category_pages(handler, game_name, game_id, max_channels, languages=languages):
+        records.extend(
+            build_category_records(
+                handler,
+                streams,
+                game_name,
+                workers=workers,
+                async_handler=async_handler,
+                fields=fields,
+                channel_filter=channel_filter,
+            )
+        )
+    return records
+
+DISCOVERY_MODES = ("search", "category")
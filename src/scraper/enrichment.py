@@ -0,0 +1,165 @@
+import logging
+from dataclasses import replace
+from typing import Any, Collection, Dict, List, Optional, Tuple
+
+from extractors.channel_parser import build_channel_records, profile_fields  # type: ignore
+from extractors.content_parser import parse_clips, parse_schedules, parse_videos  # type: ignore
+from extractors.filters import ChannelFilter  # type: ignore
+from extractors.records import ChannelRecord, Clip, ScheduleSegment, Video  # type: ignore
+from extractors.stream_parser import parse_streams  # type: ignore
+from utils.async_request_handler import AsyncRequestHandler  # type: ignore
+from utils.delta_state import DeltaStateStore  # type: ignore
+from utils.enrichment_index import EnrichmentIndex  # type: ignore
+from utils.metrics import timed  # type: ignore
+from utils.request_handler import RequestHandler  # type: ignore
+
+from .lookups import fetch_enrichment, fetch_enrichment_async
+
+def channel_id_of(ch: Dict[str, Any]) -> str:
+    return str(ch.get("id") or ch.get("channelId") or "")
+
+def build_enriched_records(
+    items: List[Tuple[Dict[str, Any], Dict[str, Optional[Dict[str, Any]]]]],
+    keyword: str,
+) -> List[ChannelRecord]:
+    """
+    Build the records for a page of ``(search result, raw enrichment)`` pairs,
+    normalizing each payload type in one batch.
+    """
+    channels: List[Dict[str, Any]] = []
+    for ch, raw in items:
+        profile = raw.get("profile")
+        # /users carries the real profile image, description and broadcaster_type
+        channels.append({**ch, **profile} if profile else ch)
+
+    raws = [raw for _, raw in items]
+    streams = parse_streams(raw.get("stream") for raw in raws)
+    videos = parse_videos(raw.get("latestVideo") for raw in raws)
+    clips = parse_clips(raw.get("topClip") for raw in raws)
+    schedules = parse_schedules(raw.get("nextSchedule") for raw in raws)
+
+    # Values carried over from the previous run by delta mode instead of being refetched.
+    for i, raw in enumerate(raws):
+        reused = raw.get("reused")
+        if reused:
+            if not raw.get("latestVideo") and reused.get("latestVideo"):
+                videos[i] = Video.from_dict(reused["latestVideo"])
+            if not raw.get("topClip") and reused.get("topClip"):
+                clips[i] = Clip.from_dict(reused["topClip"])
+            if not raw.get("nextSchedule") and reused.get("nextSchedule"):
+                schedules[i] = ScheduleSegment.from_dict(reused["nextSchedule"])
+
+    return build_channel_records(channels, streams, videos, clips, schedules, keyword)
+
+def enrich_channels(
+    handler: RequestHandler,
+    channels: List[Dict[str, Any]],
+    keyword: str,
+    workers: int = 1,
+    batch: bool = False,
+    async_handler: Optional[AsyncRequestHandler] = None,
+    index: Optional[EnrichmentIndex] = None,
+    delta: Optional[DeltaStateStore] = None,
+    fields: Optional[Collection[str]] = None,
+    channel_filter: Optional[ChannelFilter] = None,
+) -> List[ChannelRecord]:
+    """
+    Enrich raw search results with stream, video, clip, and schedule data.
+    Records are returned in the same order as ``channels``.
+
+    Channels rejected by ``channel_filter`` are dropped before any lookup, and
+    only the enrichment ``fields`` asked for are fetched (the others stay null).
+
+    When ``async_handler`` is given the lookups run on an asyncio event loop
+    (``workers`` then bounds the number of in-flight requests). When ``index``
+    is given, channels already enriched earlier in the run are not fetched again.
+    When ``delta`` is given, offline channels with an unchanged profile keep their
+    previous video/clip/schedule until those fields' TTL expires.
+    """
+    if channel_filter is not None and channel_filter.active:
+        kept = channel_filter.apply(channels)
+        if len(kept) < len(channels):
+            logging.debug(
+                "Filtered out %d of %d channels for keyword '%s'", len(channels) - len(kept), len(channels), keyword
+            )
+        channels = kept
+
+    targets: List[Tuple[Dict[str, Any], str]] = []
+    for ch in channels:
+        channel_id = channel_id_of(ch)
+        if not channel_id:
+            logging.debug("Skipping channel without id: %s", ch)
+            continue
+        targets.append((ch, channel_id))
+
+    channel_ids = list(dict.fromkeys(channel_id for _, channel_id in targets))
+    to_fetch = index.claim(channel_ids) if index is not None else channel_ids
+
+    reused: Dict[str, Dict[str, Any]] = {}
+    if delta is not None and to_fetch:
+        channel_by_id = {channel_id: ch for ch, channel_id in targets}
+        for channel_id in to_fetch:
+            ch = channel_by_id[channel_id]
+            reusable = delta.reusable_fields(channel_id, profile_fields(ch), bool(ch.get("is_live")))
+            if reusable:
+                reused[channel_id] = reusable
+    skip = {channel_id: set(values) for channel_id, values in reused.items()}
+
+    raw_by_id: Dict[str, Dict[str, Optional[Dict[str, Any]]]] = {}
+    built: Dict[str, ChannelRecord] = {}
+    try:
+        with timed(handler.metrics, "enrich"):
+            if to_fetch and async_handler is not None:
+                # Runs on the handler's long-lived loop so its connection pool survives between pages.
+                raw_by_id = async_handler.run(
+                    fetch_enrichment_async(
+                        async_handler, to_fetch, concurrency=workers, batch=batch, skip=skip, fields=fields
+                    )
+                )
+            elif to_fetch:
+                raw_by_id = fetch_enrichment(
+                    handler, to_fetch, workers=workers, batch=batch, skip=skip, fields=fields
+                )
+        if delta is not None:
+            for channel_id, raw in raw_by_id.items():
+                delta.record_fetched(channel_id, raw)
+        for channel_id, values in reused.items():
+            raw_by_id[channel_id]["reused"] = values
+        if to_fetch:
+            channel_by_id = {channel_id: ch for ch, channel_id in targets}
+            with timed(handler.metrics, "parse"):
+                fetched = build_enriched_records(
+                    [(channel_by_id[channel_id], raw_by_id.get(channel_id) or {}) for channel_id in to_fetch], keyword
+                )
+            built = dict(zip(to_fetch, fetched))
+    finally:
+        if index is not None:
+            # Only the parsed records are kept for reuse; the raw payloads go out of scope here.
+            index.update(built, claimed=to_fetch)
+
+    if index is not None:
+        # Channels claimed by a concurrently running keyword may still be in flight.
+        index.wait_for(channel_ids)
+        if len(to_fetch) < len(channel_ids):
+            logging.info(
+                "Reusing enrichment for %d of %d channels for keyword '%s'",
+                len(channel_ids) - len(to_fetch),
+                len(channel_ids),
+                keyword,
+            )
+
+    records: List[Optional[ChannelRecord]] = []
+    missing: List[Tuple[Dict[str, Any], Dict[str, Optional[Dict[str, Any]]]]] = []
+    with timed(handler.metrics, "parse"):
+        for ch, channel_id in targets:
+            record = built.get(channel_id)
+            if record is None and index is not None:
+                prior = index.record_for(channel_id)
+                # Enriched for another keyword, or in an earlier session of a resumed run.
+                record = replace(prior, keyword=keyword) if prior is not None else None
+            records.append(record)
+            if record is None:
+                # The lookups for it failed in another keyword's call.
+                missing.append((ch, {}))
+        rebuilt = iter(build_enriched_records(missing, keyword))
+        return [record if record is not None else next(rebuilt) for record in records]
@@ -0,0 +1,30 @@
+import logging
+from itertools import chain
+from pathlib import Path
+from typing import Any, Dict, List
+
+from extractors.channel_parser import merge_keyword_matches  # type: ignore
+from outputs.columnar_exporter import ColumnarRecordWriter  # type: ignore
+from outputs.exporter import export_to_json, export_to_jsonl, iter_records  # type: ignore
+
+def export_records(records: List[Dict[str, Any]], output: Path) -> None:
+    """Write records in the format given by the suffix: NDJSON, Parquet/Arrow or a JSON array."""
+    output.parent.mkdir(parents=True, exist_ok=True)
+    suffixes = output.suffixes
+    if ".jsonl" in suffixes or ".ndjson" in suffixes:
+        export_to_jsonl(records, output)
+    elif output.suffix in (".parquet", ".arrow", ".feather", ".ipc"):
+        with ColumnarRecordWriter(output) as writer:
+            writer.write_many(records)
+    else:
+        export_to_json(records, output)
+
+def merge_exports(inputs: List[Path], output: Path) -> int:
+    """
+    Combine several exports (e.g. shard outputs) into one, deduplicated by channelId.
+    The output format follows the suffix (see export_records).
+    """
+    records = merge_keyword_matches(chain.from_iterable(iter_records(path) for path in inputs))
+    export_records(records, output)
+    logging.info("Merged %d inputs into %d records at %s", len(inputs), len(records), output)
+    return len(records)
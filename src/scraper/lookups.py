@@ -0,0 +1,315 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Collection, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from extractors.filters import ENRICHMENT_FIELDS  # type: ignore
+from utils.async_request_handler import AsyncRequestHandler  # type: ignore
+from utils.metrics import timed  # type: ignore
+from utils.request_handler import RequestHandler  # type: ignore
+
+def _first_item(response: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    data = response.get("data") or []
+    return data[0] if data else None
+
+def _schedule_payload(response: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    # Twitch schedule API structure is slightly different; we handle it defensively.
+    schedule = response.get("data") or response.get("schedule") or {}
+    if not schedule:
+        return None
+    return schedule
+
+# Per-channel enrichment lookup shared by the sync and async paths: (record field,
+# path, params for a channel id, payload taken from the response, label used in log messages)
+ChannelLookup = Tuple[str, str, Callable[[str], Dict[str, Any]], Callable[[Dict[str, Any]], Any], str]
+
+# Batched lookup: (path, params for a chunk of up to 100 ids, id key of the returned items)
+BatchLookup = Tuple[str, Callable[[List[str]], Dict[str, Any]], str]
+
+ENRICHMENT_LOOKUPS: Tuple[ChannelLookup, ...] = (
+    ("stream", "/streams", lambda user_id: {"user_id": user_id, "first": 1}, _first_item, "stream"),
+    (
+        "latestVideo",
+        "/videos",
+        lambda user_id: {"user_id": user_id, "sort": "time", "first": 1},
+        _first_item,
+        "latest video",
+    ),
+    ("topClip", "/clips", lambda user_id: {"broadcaster_id": user_id, "first": 1}, _first_item, "top clip"),
+    (
+        "nextSchedule",
+        "/schedule",
+        lambda user_id: {"broadcaster_id": user_id, "first": 1},
+        _schedule_payload,
+        "schedule",
+    ),
+)
+
+_LOOKUPS_BY_FIELD = {lookup[0]: lookup for lookup in ENRICHMENT_LOOKUPS}
+
+def _fetch_one(handler: RequestHandler, field: str, user_id: str) -> Optional[Dict[str, Any]]:
+    _, path, params, extract, _ = _LOOKUPS_BY_FIELD[field]
+    return extract(handler.get(path, params=params(user_id)))
+
+def fetch_stream_for_user(handler: RequestHandler, user_id: str) -> Optional[Dict[str, Any]]:
+    return _fetch_one(handler, "stream", user_id)
+
+def fetch_latest_video_for_user(handler: RequestHandler, user_id: str) -> Optional[Dict[str, Any]]:
+    return _fetch_one(handler, "latestVideo", user_id)
+
+def fetch_top_clip_for_user(handler: RequestHandler, user_id: str) -> Optional[Dict[str, Any]]:
+    return _fetch_one(handler, "topClip", user_id)
+
+def fetch_schedule_for_user(handler: RequestHandler, user_id: str) -> Optional[Dict[str, Any]]:
+    return _fetch_one(handler, "nextSchedule", user_id)
+
+# Helix accepts up to 100 repeated id params on /streams and /users.
+HELIX_BATCH_SIZE = 100
+
+STREAMS_LOOKUP: BatchLookup = (
+    "/streams",
+    lambda user_ids: {"user_id": user_ids, "first": HELIX_BATCH_SIZE},
+    "user_id",
+)
+
+USERS_LOOKUP: BatchLookup = ("/users", lambda user_ids: {"id": user_ids}, "id")
+GAMES_LOOKUP: BatchLookup = ("/games", lambda names: {"name": names}, "name")
+
+def _chunked(items: List[str], size: int) -> Iterator[List[str]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+def _chunk_requests(lookup: BatchLookup, ids: List[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """``(path, params)`` of each request of a batched lookup, 100 ids per request."""
+    path, params, _ = lookup
+    for chunk in _chunked(ids, HELIX_BATCH_SIZE):
+        yield path, params(chunk)
+
+def _scatter(
+    responses: Iterable[Dict[str, Any]], key: str, require_data: bool = False
+) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Index the items of a batched lookup's responses by ``key``. Ids Helix did
+    not return (offline channels, unknown users) are absent. With
+    ``require_data`` a response without ``data`` (a failed request) makes the
+    whole lookup None instead of looking like an empty answer.
+    """
+    items: Dict[str, Dict[str, Any]] = {}
+    for response in responses:
+        if require_data and "data" not in response:
+            return None
+        for item in response.get("data") or []:
+            item_id = str(item.get(key) or "")
+            if item_id:
+                items[item_id] = item
+    return items
+
+def batched_get(
+    handler: RequestHandler, lookup: BatchLookup, ids: List[str], require_data: bool = False
+) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Run a batched lookup for ``ids``, 100 per request, and index the returned
+    items by the lookup's id key (see _scatter for ``require_data``).
+    """
+    responses = (handler.get(path, params=params) for path, params in _chunk_requests(lookup, ids))
+    return _scatter(responses, lookup[2], require_data=require_data)
+
+async def batched_get_async(
+    handler: AsyncRequestHandler, lookup: BatchLookup, ids: List[str]
+) -> Dict[str, Dict[str, Any]]:
+    responses = await asyncio.gather(
+        *(handler.get(path, params=params) for path, params in _chunk_requests(lookup, ids))
+    )
+    return _scatter(responses, lookup[2]) or {}
+
+def fetch_streams_for_users(handler: RequestHandler, user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Resolve live streams for many users, one /streams request per 100 ids.
+    Channels that are offline are simply absent from the returned mapping.
+    """
+    return batched_get(handler, STREAMS_LOOKUP, user_ids) or {}
+
+def fetch_users_by_ids(handler: RequestHandler, user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Resolve /users profiles (profile image, description, broadcaster_type) in batches of 100.
+    """
+    return batched_get(handler, USERS_LOOKUP, user_ids) or {}
+
+def _fetch_failed(label: str, target: str, exc: Exception) -> None:
+    logging.warning("Failed to fetch %s for %s: %s", label, target, exc)
+
+def _safe_fetch(handler: RequestHandler, lookup: ChannelLookup, channel_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Run a single enrichment lookup, logging and swallowing any failure so one
+    broken endpoint never takes down the rest of the channel record.
+    """
+    _, path, params, extract, label = lookup
+    try:
+        with timed(handler.metrics, "fetch." + label.replace(" ", "_")):
+            return extract(handler.get(path, params=params(channel_id)))
+    except Exception as e:
+        _fetch_failed(label, channel_id, e)
+        return None
+
+def _safe_batch_fetch(
+    handler: RequestHandler,
+    lookup: BatchLookup,
+    channel_ids: List[str],
+    label: str,
+) -> Dict[str, Dict[str, Any]]:
+    try:
+        with timed(handler.metrics, "batch." + label):
+            return batched_get(handler, lookup, channel_ids) or {}
+    except Exception as e:
+        _fetch_failed(label, f"{len(channel_ids)} channels", e)
+        return {}
+
+def _per_channel_lookups(fields: Optional[Collection[str]], batch: bool) -> List[ChannelLookup]:
+    """The per-channel lookups for ``fields``; a batched run gets streams from /streams in bulk."""
+    fields = ENRICHMENT_FIELDS if fields is None else fields
+    return [lookup for lookup in ENRICHMENT_LOOKUPS if lookup[0] in fields and not (batch and lookup[0] == "stream")]
+
+def _batch_lookups(fields: Optional[Collection[str]], batch: bool) -> List[Tuple[str, BatchLookup, str]]:
+    """``(record field, batched lookup, label)`` for the fields fetched 100 channels at a time."""
+    fields = ENRICHMENT_FIELDS if fields is None else fields
+    if not batch:
+        return []
+    return [
+        (field, lookup, label)
+        for field, lookup, label in (("stream", STREAMS_LOOKUP, "streams"), ("profile", USERS_LOOKUP, "users"))
+        if field in fields
+    ]
+
+def fetch_enrichment(
+    handler: RequestHandler,
+    channel_ids: List[str],
+    workers: int = 1,
+    batch: bool = False,
+    skip: Optional[Dict[str, Set[str]]] = None,
+    fields: Optional[Collection[str]] = None,
+) -> Dict[str, Dict[str, Optional[Dict[str, Any]]]]:
+    """
+    Fetch the raw enrichment payloads for each channel id.
+
+    Returns a mapping of channel id to ``{record field: raw payload}``. With
+    ``batch`` enabled, streams are resolved through batched /streams calls and
+    the /users profile is added under the ``"profile"`` key. With ``workers > 1``
+    the remaining per-channel lookups are fanned out over a thread pool.
+    ``skip`` maps channel ids to per-channel fields that should not be fetched;
+    ``fields`` limits every channel to those fields (see ENRICHMENT_FIELDS).
+    """
+    lookups = _per_channel_lookups(fields, batch)
+    skip = skip or {}
+
+    raw_by_id: Dict[str, Dict[str, Optional[Dict[str, Any]]]] = {}
+
+    if workers > 1 and channel_ids:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                channel_id: {
+                    lookup[0]: pool.submit(_safe_fetch, handler, lookup, channel_id)
+                    for lookup in lookups
+                    if lookup[0] not in skip.get(channel_id, ())
+                }
+                for channel_id in channel_ids
+            }
+            for channel_id, pending in futures.items():
+                raw_by_id[channel_id] = {field: fut.result() for field, fut in pending.items()}
+    else:
+        for channel_id in channel_ids:
+            raw_by_id[channel_id] = {
+                lookup[0]: _safe_fetch(handler, lookup, channel_id)
+                for lookup in lookups
+                if lookup[0] not in skip.get(channel_id, ())
+            }
+
+    for field, lookup, label in _batch_lookups(fields, batch) if channel_ids else ():
+        found = _safe_batch_fetch(handler, lookup, channel_ids, label)
+        for channel_id in channel_ids:
+            raw_by_id[channel_id][field] = found.get(channel_id)
+
+    return raw_by_id
+
+async def _safe_fetch_async(
+    handler: AsyncRequestHandler,
+    lookup: ChannelLookup,
+    channel_id: str,
+    limiter: asyncio.Semaphore,
+) -> Optional[Dict[str, Any]]:
+    _, path, params, extract, label = lookup
+    async with limiter:
+        try:
+            with timed(handler.metrics, "fetch." + label.replace(" ", "_")):
+                return extract(await handler.get(path, params=params(channel_id)))
+        except Exception as e:
+            _fetch_failed(label, channel_id, e)
+            return None
+
+async def _safe_batch_fetch_async(
+    handler: AsyncRequestHandler,
+    lookup: BatchLookup,
+    channel_ids: List[str],
+    label: str,
+) -> Dict[str, Dict[str, Any]]:
+    try:
+        with timed(handler.metrics, "batch." + label):
+            return await batched_get_async(handler, lookup, channel_ids)
+    except Exception as e:
+        _fetch_failed(label, f"{len(channel_ids)} channels", e)
+        return {}
+
+async def fetch_enrichment_async(
+    handler: AsyncRequestHandler,
+    channel_ids: List[str],
+    concurrency: int = 10,
+    batch: bool = False,
+    skip: Optional[Dict[str, Set[str]]] = None,
+    fields: Optional[Collection[str]] = None,
+) -> Dict[str, Dict[str, Optional[Dict[str, Any]]]]:
+    """
+    asyncio variant of fetch_enrichment: all lookups run as coroutines on one
+    event loop, with at most ``concurrency`` per-channel requests in flight.
+    """
+    lookups = _per_channel_lookups(fields, batch)
+    skip = skip or {}
+
+    limiter = asyncio.Semaphore(max(1, concurrency))
+    keys = [
+        (channel_id, lookup)
+        for channel_id in channel_ids
+        for lookup in lookups
+        if lookup[0] not in skip.get(channel_id, ())
+    ]
+    pending = [_safe_fetch_async(handler, lookup, channel_id, limiter) for channel_id, lookup in keys]
+    batch_lookups = _batch_lookups(fields, batch) if channel_ids else []
+    pending.extend(
+        _safe_batch_fetch_async(handler, lookup, channel_ids, label) for _, lookup, label in batch_lookups
+    )
+
+    results = await asyncio.gather(*pending)
+
+    raw_by_id: Dict[str, Dict[str, Optional[Dict[str, Any]]]] = {
+        channel_id: {} for channel_id in channel_ids
+    }
+    for (channel_id, lookup), result in zip(keys, results):
+        raw_by_id[channel_id][lookup[0]] = result
+
+    for (field, _, _), batch_result in zip(batch_lookups, results[len(keys):]):
+        for channel_id in channel_ids:
+            raw_by_id[channel_id][field] = batch_result.get(channel_id)
+
+    return raw_by_id
+
+def fetch_game_ids(handler: RequestHandler, names: List[str]) -> Dict[str, str]:
+    """
+    Resolve category (game) names to Helix game ids, 100 names per /games request.
+    Matching ignores case; names Helix does not know are absent from the result.
+    """
+    wanted = {name.lower(): name for name in names}
+    games = batched_get(handler, GAMES_LOOKUP, list(wanted.values())) or {}
+    game_ids: Dict[str, str] = {}
+    for returned, item in games.items():
+        name = wanted.get(returned.lower())
+        if name and item.get("id"):
+            game_ids[name] = str(item["id"])
+    return game_ids
@@ -0,0 +1,58 @@
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from extractors.channel_parser import merge_keyword_matches  # type: ignore
+from utils import serialization  # type: ignore
+from utils.channel_store import ChannelStore  # type: ignore
+
+from .exports import export_records
+from .settings import REPO_ROOT, load_keywords
+
+def run_query(
+    settings: Dict[str, Any],
+    keywords: List[str],
+    limit: Optional[int] = None,
+    output: Optional[Path] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Look keywords up in the local channel index instead of /search/channels.
+    Records from earlier runs are returned as stored (``indexMaxAgeSeconds``
+    drops stale ones), tagged with the keyword that found them.
+    """
+    index_file = settings.get("channelIndexFile")
+    if not index_file or not (REPO_ROOT / index_file).exists():
+        logging.error("No channel index found; set channelIndexFile and run a scrape first.")
+        sys.exit(1)
+    if not keywords:
+        keywords = load_keywords(REPO_ROOT / settings.get("keywordsFile", "data/keywords.sample.txt"))
+    limit = limit or int(settings.get("maxChannelsPerKeyword", 50))
+    max_age = settings.get("indexMaxAgeSeconds")
+
+    store = ChannelStore(REPO_ROOT / index_file)
+    records: List[Dict[str, Any]] = []
+    try:
+        for kw in keywords:
+            started = time.perf_counter()
+            found = store.search(kw, limit=limit, max_age=float(max_age) if max_age else None)
+            logging.info(
+                "Found %d indexed channels for keyword '%s' in %.1f ms",
+                len(found),
+                kw,
+                (time.perf_counter() - started) * 1000,
+            )
+            records.extend(found)
+    finally:
+        store.close()
+
+    if settings.get("mergeKeywordMatches", False):
+        records = merge_keyword_matches(records)
+    if output is not None:
+        export_records(records, output)
+        logging.info("Exported %d records to %s", len(records), output)
+    else:
+        for record in records:
+            sys.stdout.write(serialization.dumps(record) + "\n")
+    return records
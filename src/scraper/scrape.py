@@ -0,0 +1,558 @@
+import logging
+import math
+import sys
+from pathlib import Path
+from typing import Any, Collection, Dict, Iterator, List, Optional, Set, Tuple
+
+from extractors.channel_parser import merge_keyword_matches  # type: ignore
+from extractors.filters import ENRICHMENT_FIELDS, ENRICHMENT_RECORD_FIELDS, channel_priority  # type: ignore
+from extractors.records import ChannelRecord, Record  # type: ignore
+from outputs.columnar_exporter import ColumnarRecordWriter  # type: ignore
+from outputs.exporter import JsonLinesWriter, export_to_json, iter_jsonl, jsonl_to_json  # type: ignore
+from utils.async_request_handler import AsyncRequestHandler  # type: ignore
+from utils.budget_scheduler import PriorityScheduler, RunBudget  # type: ignore
+from utils.channel_store import ChannelStore  # type: ignore
+from utils.checkpoint import CheckpointJournal, KeywordProgress  # type: ignore
+from utils.delta_state import DEFAULT_FIELD_TTLS, DeltaStateStore  # type: ignore
+from utils.enrichment_index import EnrichmentIndex  # type: ignore
+from utils.keyword_pipeline import KeywordPipeline  # type: ignore
+from utils.metrics import RunMetrics, timed  # type: ignore
+from utils.request_handler import RequestHandler  # type: ignore
+from utils.response_cache import DEFAULT_TTLS, ResponseCache  # type: ignore
+from utils.sharding import select_shard  # type: ignore
+
+from .discovery import (
+    CATEGORY_DEFAULT_FIELDS,
+    DISCOVERY_MODES,
+    build_category_records,
+    iter_category_pages,
+    iter_search_pages,
+)
+from .enrichment import channel_id_of, enrich_channels
+from .lookups import HELIX_BATCH_SIZE, fetch_game_ids
+from .settings import (
+    REPO_ROOT,
+    build_channel_filter,
+    credential_pool_for,
+    enrichment_fields,
+    load_keywords,
+    open_response_archive,
+    replay_settings,
+)
+from .shards import shard_settings
+
+# Lookups made once per channel; stream (when batched) and profile cost one request per 100 channels.
+PER_CHANNEL_FIELDS = ("latestVideo", "topClip", "nextSchedule")
+
+# What channels past the budget's full-enrichment head get when budgetTailFields is unset.
+DEFAULT_BUDGET_TAIL_FIELDS = frozenset({"stream"})
+
+def estimate_enrichment_requests(
+    fields: Optional[Collection[str]],
+    channels: int,
+    discovery: str = "search",
+    batch: bool = True,
+) -> int:
+    """
+    Requests needed to enrich ``channels`` channels of one keyword with
+    ``fields`` (None = the mode's default), assuming nothing is reused.
+    """
+    if channels <= 0:
+        return 0
+    if fields is None:
+        fields = CATEGORY_DEFAULT_FIELDS if discovery == "category" else ENRICHMENT_FIELDS
+    batches = math.ceil(channels / HELIX_BATCH_SIZE)
+    requests = channels * sum(1 for field in PER_CHANNEL_FIELDS if field in fields)
+    if "stream" in fields and discovery != "category":
+        requests += batches if batch else channels
+    if "profile" in fields and (batch or discovery == "category"):
+        requests += batches
+    return requests
+
+def run_scrape(
+    settings: Dict[str, Any],
+    resume: bool = False,
+    shard: Optional[Tuple[int, int]] = None,
+) -> None:
+    """
+    Run one scrape: search every keyword (or this shard's share of them), enrich
+    the channels and export the records. With discoveryMode "category" the
+    keywords are category names whose live streams are listed instead.
+    """
+    if shard is not None:
+        settings = shard_settings(settings, *shard)
+    credentials = credential_pool_for(settings)
+    # Optional deadline / request quota for the whole run, counted from here.
+    deadline = settings.get("runDeadlineSeconds")
+    request_budget = settings.get("requestBudget")
+    budget = RunBudget(
+        deadline_seconds=float(deadline) if deadline is not None else None,
+        max_requests=int(request_budget) if request_budget is not None else None,
+        requests_used=credentials.requests,
+    )
+
+    archive = open_response_archive(settings)
+    if archive is not None and archive.replaying:
+        settings = replay_settings(settings)
+
+    keywords_file = REPO_ROOT / settings.get("keywordsFile", "data/keywords.sample.txt")
+    output_file = REPO_ROOT / settings.get("outputFile", "data/sample_output.json")
+    max_per_keyword = int(settings.get("maxChannelsPerKeyword", 50))
+    workers = max(1, int(settings.get("enrichmentWorkers", 1)))
+    batch_lookups = bool(settings.get("batchLookups", True))
+    index = EnrichmentIndex() if settings.get("dedupeChannels", True) else None
+    fields = enrichment_fields(settings)
+    channel_filter = build_channel_filter(settings)
+    discovery = settings.get("discoveryMode") or "search"
+    if discovery not in DISCOVERY_MODES:
+        logging.error("Unknown discoveryMode '%s' (expected %s)", discovery, " or ".join(DISCOVERY_MODES))
+        sys.exit(1)
+    # The budget's middle level must be a cheaper subset of what the head gets.
+    tail_fields = enrichment_fields(settings, "budgetTailFields")
+    if tail_fields is None:
+        tail_fields = DEFAULT_BUDGET_TAIL_FIELDS
+    head_fields = fields if fields is not None else (
+        CATEGORY_DEFAULT_FIELDS if discovery == "category" else frozenset(ENRICHMENT_FIELDS)
+    )
+    if not tail_fields <= head_fields:
+        logging.error(
+            "budgetTailFields must be a subset of the enriched fields (%s); got %s",
+            ", ".join(f for f in ENRICHMENT_FIELDS if f in head_fields),
+            ", ".join(f for f in ENRICHMENT_FIELDS if f in tail_fields),
+        )
+        sys.exit(1)
+    max_per_category = settings.get("maxChannelsPerCategory")
+    max_per_category = int(max_per_category) if max_per_category is not None else None
+
+    keyword_workers = max(1, int(settings.get("keywordWorkers", 1)))
+    # Every concurrent keyword can have `workers` lookups plus a search page in flight.
+    pool_size = max(int(settings.get("httpPoolSize", 10)), keyword_workers * (workers + 1))
+    max_backoff = float(settings.get("maxBackoffSeconds", 60))
+
+    # Run metrics: per-endpoint request stats from the handlers plus phase timers.
+    metrics: Optional[RunMetrics] = None
+    if settings.get("metricsFile") or settings.get("prometheusMetricsFile"):
+        metrics = RunMetrics()
+    run_stats: Dict[str, Any] = {}
+
+    response_cache: Optional[ResponseCache] = None
+    cache_file = settings.get("responseCacheFile")
+    if cache_file and not (archive is not None and archive.replaying):
+        response_cache = ResponseCache(
+            REPO_ROOT / cache_file,
+            ttls=settings.get("responseCacheTtlSeconds") or DEFAULT_TTLS,
+            max_bytes=int(float(settings.get("responseCacheMaxMB", 256)) * 1024 * 1024),
+        )
+
+    # One credential pool (and so the same rate-limit buckets) shared by the
+    # sync and async handlers so they pace together.
+    primary = credentials.credentials[0]
+    handler = RequestHandler(
+        base_url=settings.get("baseUrl", "https://api.twitch.tv/helix"),
+        client_id=primary.client_id,
+        access_token=primary.access_token,
+        max_retries=int(settings.get("maxRetries", 3)),
+        timeout=float(settings.get("timeoutSeconds", 15)),
+        pool_size=pool_size,
+        max_backoff=max_backoff,
+        cache=response_cache,
+        metrics=metrics,
+        credentials=credentials,
+        archive=archive,
+    )
+
+    async_handler: Optional[AsyncRequestHandler] = None
+    if settings.get("asyncEnrichment", False):
+        async_handler = AsyncRequestHandler(
+            base_url=handler.base_url,
+            client_id=primary.client_id,
+            access_token=primary.access_token,
+            max_retries=handler.max_retries,
+            timeout=handler.timeout,
+            pool_size=pool_size,
+            max_backoff=max_backoff,
+            cache=response_cache,
+            metrics=metrics,
+            credentials=credentials,
+            archive=archive,
+        )
+
+    keywords = load_keywords(keywords_file)
+    logging.info("Loaded %d keywords from %s", len(keywords), keywords_file)
+    if shard is not None:
+        keywords = select_shard(keywords, *shard)
+        logging.info("Shard %d/%d owns %d keywords", shard[0], shard[1], len(keywords))
+
+    resuming = resume
+    journal: Optional[CheckpointJournal] = None
+    checkpoint_file = settings.get("checkpointFile")
+    stream_file = settings.get("streamOutputFile")
+    if resuming and not (checkpoint_file and stream_file):
+        logging.error("--resume needs both checkpointFile and streamOutputFile to be configured.")
+        sys.exit(1)
+    if checkpoint_file:
+        if stream_file:
+            journal = CheckpointJournal(REPO_ROOT / checkpoint_file, resume=resuming)
+        else:
+            logging.warning("checkpointFile is set but streamOutputFile is not; checkpointing disabled.")
+
+    # Delta mode: export only new, changed and disappeared channels compared to
+    # the previous run, and skip refetching slow fields that cannot have changed.
+    delta: Optional[DeltaStateStore] = None
+    delta_file = settings.get("deltaStateFile")
+    if delta_file:
+        delta = DeltaStateStore(
+            REPO_ROOT / delta_file,
+            field_ttls=settings.get("deltaFieldTtlSeconds") or DEFAULT_FIELD_TTLS,
+            resume=resuming,
+        )
+
+    # Local full-text index of every channel scraped, for the query command.
+    channel_store: Optional[ChannelStore] = None
+    if settings.get("channelIndexFile"):
+        channel_store = ChannelStore(REPO_ROOT / settings["channelIndexFile"])
+
+    if resuming and index is not None and journal is not None and journal.state.enriched_ids:
+        previous = REPO_ROOT / stream_file
+        if previous.exists():
+            seeded = index.seed_records(
+                iter_jsonl(previous, settings.get("outputCompression")),
+                journal.state.enriched_ids,
+                convert=ChannelRecord.from_dict,
+            )
+            logging.info("Reusing %d channel records from the previous session", seeded)
+
+    # Optional streaming output: each page's records are appended as NDJSON as
+    # soon as they are built instead of being held in memory until the end.
+    stream_writer: Optional[JsonLinesWriter] = None
+    if stream_file:
+        stream_writer = JsonLinesWriter(
+            REPO_ROOT / stream_file,
+            compression=settings.get("outputCompression"),
+            append=resuming,
+        )
+
+    # Parquet cannot be appended to, so a resumed run rebuilds it from the
+    # NDJSON output once the run is complete.
+    columnar_writer: Optional[ColumnarRecordWriter] = None
+    columnar_file = settings.get("columnarOutputFile")
+    if columnar_file and not resuming:
+        columnar_writer = ColumnarRecordWriter(
+            REPO_ROOT / columnar_file,
+            row_group_size=int(settings.get("columnarRowGroupSize", 50000)),
+        )
+
+    # Held as compact ChannelRecords; converted to dicts only by the exporters.
+    all_results: List[Record] = []
+    # Per keyword: records exported and raw search results consumed (resume pages by the latter).
+    collected: Dict[str, int] = {}
+    searched: Dict[str, int] = {}
+    completed: Set[str] = set()
+    total_records = 0
+    if journal is not None:
+        total_records = sum(p.collected for p in journal.state.keywords.values())
+
+    def emit(records: List[Record]) -> None:
+        with timed(metrics, "export"):
+            if columnar_writer is not None:
+                columnar_writer.write_many(records)
+            if stream_writer is not None:
+                stream_writer.write_many(records)
+                stream_writer.flush()
+            else:
+                all_results.extend(records)
+
+    def handle_page(kw: str, results: List[ChannelRecord], cursor: Optional[str], page_size: int) -> None:
+        nonlocal total_records
+        collected[kw] = collected.get(kw, 0) + len(results)
+        searched[kw] = searched.get(kw, 0) + page_size
+        total_records += len(results)
+        channel_ids = [r.channelId for r in results]
+        rows = [r.to_dict() for r in results] if delta is not None or channel_store is not None else []
+        if channel_store is not None:
+            keep = {
+                channel_id: [
+                    name
+                    for field, names in ENRICHMENT_RECORD_FIELDS.items()
+                    if field not in built_with.get(channel_id, ())
+                    for name in names
+                ]
+                for channel_id in channel_ids
+            }
+            channel_store.upsert(rows, keep=keep)
+        if delta is not None:
+            emit(delta.diff(rows, profiles={r.channelId: r.profile_fields() for r in results}))
+        else:
+            emit(results)
+        if archive is not None:
+            archive.flush()
+        if journal is not None:
+            journal.record_page(kw, cursor, collected[kw], channel_ids, searched=searched[kw])
+
+    def handle_keyword_done(kw: str) -> None:
+        completed.add(kw)
+        if journal is not None:
+            journal.record_done(kw)
+        logging.info(
+            "Collected %d channels for keyword '%s' (total so far: %d)",
+            collected.get(kw, 0),
+            kw,
+            total_records,
+        )
+
+    def progress_of(kw: str) -> KeywordProgress:
+        return journal.state.progress(kw) if journal is not None else KeywordProgress()
+
+    pending_keywords: List[str] = []
+    for kw in keywords:
+        if journal is not None and journal.state.is_done(kw):
+            logging.info("Skipping keyword '%s' (completed in a previous session)", kw)
+            continue
+        collected[kw] = progress_of(kw).collected
+        searched[kw] = progress_of(kw).searched
+        pending_keywords.append(kw)
+
+    if discovery == "category":
+        # Keywords are category names here; resolve them all up front.
+        game_ids = fetch_game_ids(handler, pending_keywords) if pending_keywords else {}
+        for kw in [kw for kw in pending_keywords if kw not in game_ids]:
+            logging.warning("Unknown category '%s'; skipping it", kw)
+            pending_keywords.remove(kw)
+            handle_keyword_done(kw)
+
+        def search_pages(kw: str) -> Iterator[Tuple[List[Dict[str, Any]], Optional[str]]]:
+            return iter_category_pages(
+                handler,
+                kw,
+                game_ids[kw],
+                max_per_category,
+                start_cursor=progress_of(kw).cursor,
+                already_collected=progress_of(kw).searched,
+                languages=channel_filter.languages,
+            )
+
+        def enrich_page(
+            kw: str, page: List[Dict[str, Any]], selected: Optional[Collection[str]] = fields
+        ) -> List[ChannelRecord]:
+            return build_category_records(
+                handler,
+                page,
+                kw,
+                workers=workers,
+                async_handler=async_handler,
+                fields=selected,
+                channel_filter=channel_filter,
+                delta=delta,
+            )
+
+        def page_channel_id(stream: Dict[str, Any]) -> str:
+            return str(stream.get("user_id") or "")
+    else:
+
+        def search_pages(kw: str) -> Iterator[Tuple[List[Dict[str, Any]], Optional[str]]]:
+            return iter_search_pages(
+                handler,
+                kw,
+                max_per_keyword,
+                start_cursor=progress_of(kw).cursor,
+                already_collected=progress_of(kw).searched,
+                live_only=channel_filter.live_only,
+            )
+
+        def enrich_page(
+            kw: str, page: List[Dict[str, Any]], selected: Optional[Collection[str]] = fields
+        ) -> List[ChannelRecord]:
+            return enrich_channels(
+                handler,
+                page,
+                kw,
+                workers=workers,
+                batch=batch_lookups,
+                async_handler=async_handler,
+                index=index,
+                delta=delta,
+                fields=selected,
+                channel_filter=channel_filter,
+            )
+
+        page_channel_id = channel_id_of
+
+    # Enrichment fields each channel's record was built with, so the channel index
+    # keeps its stored values for fields a projection or budget level skipped.
+    built_with: Dict[str, Set[str]] = {}
+    default_fields = CATEGORY_DEFAULT_FIELDS if discovery == "category" else ENRICHMENT_FIELDS
+
+    def enrich(
+        kw: str, page: List[Dict[str, Any]], selected: Optional[Collection[str]] = fields
+    ) -> List[ChannelRecord]:
+        records = enrich_page(kw, page, selected)
+        if channel_store is not None:
+            for record in records:
+                built_with.setdefault(record.channelId, set()).update(
+                    default_fields if selected is None else selected
+                )
+        return records
+
+    if budget.active:
+        # Search every keyword first (one request per page, until the budget is
+        # spent), then enrich the channels by priority, degrading the tail so the
+        # run stays within its budget.
+        pages: List[Tuple[str, List[Dict[str, Any]], Optional[str]]] = []
+        searched_keywords: List[str] = []
+        for kw in pending_keywords:
+            if budget.exhausted():
+                logging.warning("Run budget exhausted; not searching the remaining keywords")
+                break
+            try:
+                for page, cursor in search_pages(kw):
+                    pages.append((kw, page, cursor))
+                    if cursor is not None and budget.exhausted():
+                        logging.warning("Run budget exhausted; stopping the search for keyword '%s'", kw)
+                        break
+                else:
+                    searched_keywords.append(kw)
+            except Exception as e:
+                logging.exception("Failed to collect channels for keyword '%s': %s", kw, e)
+        scheduler = PriorityScheduler(
+            budget,
+            levels=[fields, tail_fields, frozenset()],
+            estimate_requests=lambda selected, count: estimate_enrichment_requests(
+                selected, count, discovery, batch_lookups
+            ),
+            chunk_size=HELIX_BATCH_SIZE,
+            reuse=index is not None and discovery == "search",
+        )
+
+        def handle_scheduled_page(position: int, records: List[ChannelRecord]) -> None:
+            # Exported and journaled as soon as the scheduler has finished the page.
+            kw, page, cursor = pages[position]
+            handle_page(kw, records, cursor, len(page))
+            if cursor is None and kw in searched_keywords:
+                handle_keyword_done(kw)
+
+        scheduler.run(
+            pages, priority=channel_priority, channel_id=page_channel_id, enrich=enrich, on_page=handle_scheduled_page
+        )
+        for kw in searched_keywords:
+            if kw not in completed:
+                handle_keyword_done(kw)
+        logging.info("Budget scheduler stats: %s", scheduler.stats())
+        run_stats["budget"] = scheduler.stats()
+    elif keyword_workers > 1:
+        # Search several keywords at once and overlap it with enrichment.
+        pipeline = KeywordPipeline(
+            search_workers=keyword_workers,
+            enrich_workers=keyword_workers,
+            queue_size=int(settings.get("workQueueSize", 2 * keyword_workers)),
+        )
+        pipeline.run(
+            pending_keywords,
+            search_pages=search_pages,
+            enrich=enrich,
+            on_page=handle_page,
+            on_keyword_done=handle_keyword_done,
+        )
+    else:
+        for kw in pending_keywords:
+            try:
+                for page, cursor in search_pages(kw):
+                    handle_page(kw, enrich(kw, page), cursor, len(page))
+                handle_keyword_done(kw)
+            except Exception as e:
+                logging.exception("Failed to collect channels for keyword '%s': %s", kw, e)
+
+    if delta is not None:
+        # A channel only counts as gone if every keyword was searched to the end.
+        if completed.issuperset(pending_keywords):
+            tombstones = delta.tombstones()
+            emit(tombstones)
+            total_records += len(tombstones)
+        else:
+            logging.warning("Some keywords did not finish; not reporting disappeared channels this run.")
+        logging.info("Delta stats: %s", delta.stats())
+        run_stats["delta"] = delta.stats()
+        delta.close()
+
+    handler.close()
+    if async_handler is not None:
+        async_handler.shutdown()
+    run_stats["credentials"] = credentials.stats()
+    if archive is not None:
+        logging.info("Response archive stats: %s", archive.stats())
+        run_stats["responseArchive"] = archive.stats()
+        archive.close()
+    if channel_store is not None:
+        logging.info("Channel index stats: %s", channel_store.stats())
+        run_stats["channelIndex"] = channel_store.stats()
+        channel_store.close()
+    if response_cache is not None:
+        logging.info("Response cache stats: %s", response_cache.stats())
+        run_stats["responseCache"] = response_cache.stats()
+        response_cache.close()
+    if stream_writer is not None:
+        stream_writer.close()
+    if columnar_writer is not None:
+        columnar_writer.close()
+    if journal is not None:
+        journal.close()
+
+    if not total_records:
+        logging.warning("No results collected; nothing to export.")
+    else:
+        if index is not None:
+            logging.info(
+                "Enriched %d unique channels; %d keyword hits reused existing enrichment",
+                len(index),
+                index.reused,
+            )
+            run_stats["enrichmentIndex"] = {"channels": len(index), "reused": index.reused}
+        with timed(metrics, "finalize"):
+            _finalize_exports(settings, output_file, stream_writer, all_results, resuming)
+
+    if metrics is not None:
+        metrics_file = settings.get("metricsFile")
+        prometheus_file = settings.get("prometheusMetricsFile")
+        metrics.write(
+            REPO_ROOT / metrics_file if metrics_file else None,
+            REPO_ROOT / prometheus_file if prometheus_file else None,
+            extra=run_stats,
+        )
+        logging.info("Wrote run metrics to %s", metrics_file or prometheus_file)
+
+def _finalize_exports(
+    settings: Dict[str, Any],
+    output_file: Path,
+    stream_writer: Optional[JsonLinesWriter],
+    all_results: List[Record],
+    resuming: bool,
+) -> None:
+    """
+    Produce the final exports once every keyword is processed: rebuild the
+    columnar file after a resumed run and write the JSON array (merged per
+    channel if requested), from the NDJSON stream when there is one.
+    """
+    merge_matches = bool(settings.get("mergeKeywordMatches", False))
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+
+    columnar_file = settings.get("columnarOutputFile")
+    if columnar_file and resuming and stream_writer is not None:
+        with ColumnarRecordWriter(
+            REPO_ROOT / columnar_file,
+            row_group_size=int(settings.get("columnarRowGroupSize", 50000)),
+        ) as rebuilt:
+            rebuilt.write_many(iter_jsonl(stream_writer.path, stream_writer.compression))
+
+    if stream_writer is not None:
+        if not settings.get("finalizeJson", True):
+            return
+        if not merge_matches:
+            count = jsonl_to_json(stream_writer.path, output_file, stream_writer.compression)
+            logging.info("Exported %d records to %s", count, output_file)
+            return
+        all_results = list(iter_jsonl(stream_writer.path, stream_writer.compression))
+
+    if merge_matches:
+        all_results = merge_keyword_matches(all_results)
+
+    export_to_json(all_results, output_file)
+    logging.info("Exported %d records to %s", len(all_results), output_file)
@@ -0,0 +1,183 @@
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional
+
+from extractors.filters import ENRICHMENT_FIELDS, ChannelFilter  # type: ignore
+from utils.credentials import TOKEN_URL, Credential, CredentialPool  # type: ignore
+from utils.rate_limiter import TokenBucketRateLimiter  # type: ignore
+from utils.response_archive import ResponseArchive  # type: ignore
+
+SRC_DIR = Path(__file__).resolve().parent.parent
+REPO_ROOT = SRC_DIR.parent
+
+def setup_logger(level: str) -> None:
+    log_level = getattr(logging, level.upper(), logging.INFO)
+    logging.basicConfig(
+        level=log_level,
+        format="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
+    )
+
+def load_settings(config_path: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Load settings from ``config_path`` if given, else from settings.json if present,
+    otherwise from settings.example.json.
+    """
+    config_dir = SRC_DIR / "config"
+    primary = config_dir / "settings.json"
+    fallback = config_dir / "settings.example.json"
+
+    if config_path is not None:
+        path = config_path
+    elif primary.exists():
+        path = primary
+    else:
+        path = fallback
+
+    with path.open("r", encoding="utf-8") as f:
+        settings = json.load(f)
+
+    # Allow overriding via environment variables if present
+    settings["clientId"] = os.getenv("TWITCH_CLIENT_ID", settings.get("clientId", ""))
+    settings["accessToken"] = os.getenv("TWITCH_ACCESS_TOKEN", settings.get("accessToken", ""))
+    settings["clientSecret"] = os.getenv("TWITCH_CLIENT_SECRET", settings.get("clientSecret") or "")
+
+    return settings
+
+def load_keywords(path: Path) -> List[str]:
+    if not path.exists():
+        logging.warning("Keywords file %s not found, using default ['warframe']", path)
+        return ["warframe"]
+
+    keywords: List[str] = []
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            keywords.append(line)
+
+    if not keywords:
+        logging.warning("No keywords found in %s, using default ['warframe']", path)
+        return ["warframe"]
+
+    return keywords
+
+def build_credential_pool(settings: Dict[str, Any]) -> CredentialPool:
+    """
+    App credentials for this process: the primary clientId/accessToken/clientSecret
+    plus every entry of ``credentials``. Each credential gets its own
+    ``rateLimitPerMinute`` bucket, since Helix rate-limits per client id. Only
+    ``rateLimitShare`` of the primary's bucket is used (an entry may set its
+    own), for processes that share the primary clientId. An entry needs a clientId and an accessToken, a
+    clientSecret (to issue tokens), or both.
+    """
+    entries = [
+        {
+            "clientId": settings.get("clientId", ""),
+            "accessToken": settings.get("accessToken", ""),
+            "clientSecret": settings.get("clientSecret", ""),
+            "rateLimitShare": settings.get("rateLimitShare", 1.0),
+        }
+    ]
+    entries += settings.get("credentials") or []
+
+    rate_limit_per_minute = float(settings.get("rateLimitPerMinute", 800))
+    credentials: List[Credential] = []
+    seen = set()
+    for entry in entries:
+        client_id = (entry.get("clientId") or "").strip()
+        access_token = (entry.get("accessToken") or "").strip()
+        client_secret = (entry.get("clientSecret") or "").strip() or None
+        if not client_id or not (access_token or client_secret) or (client_id, access_token) in seen:
+            continue
+        seen.add((client_id, access_token))
+        share = float(entry.get("rateLimitShare", 1.0))
+        rate_limiter = (
+            TokenBucketRateLimiter(capacity=rate_limit_per_minute, share=share) if rate_limit_per_minute > 0 else None
+        )
+        credentials.append(Credential(client_id, access_token, client_secret, rate_limiter))
+
+    if not credentials:
+        logging.error(
+            "Twitch clientId or accessToken missing.\n"
+            "Please update src/config/settings.example.json or create src/config/settings.json "
+            "with valid Twitch API credentials, or set TWITCH_CLIENT_ID/TWITCH_ACCESS_TOKEN "
+            "(or TWITCH_CLIENT_SECRET to issue app tokens automatically)."
+        )
+        sys.exit(1)
+    logging.info("Using %d app credential(s)", len(credentials))
+    return CredentialPool(
+        credentials,
+        token_url=settings.get("tokenUrl") or TOKEN_URL,
+        timeout=float(settings.get("timeoutSeconds", 15)),
+    )
+
+def open_response_archive(settings: Dict[str, Any]) -> Optional[ResponseArchive]:
+    """
+    The archive named by ``responseArchiveFile``: every API response is appended
+    to it, or, with ``responseArchiveReplay`` (set by --replay), the handlers
+    answer from it instead of calling Helix.
+    """
+    archive_file = settings.get("responseArchiveFile")
+    if not archive_file:
+        return None
+    replay = bool(settings.get("responseArchiveReplay", False))
+    try:
+        archive = ResponseArchive(REPO_ROOT / archive_file, replay=replay)
+    except FileNotFoundError as exc:
+        logging.error("%s", exc)
+        sys.exit(1)
+    if replay:
+        logging.info("Replaying API responses from %s", archive.path)
+    else:
+        logging.info("Recording API responses to %s", archive.path)
+    return archive
+
+# Run state a replay leaves alone: it would truncate the live checkpoint, start a
+# new delta run and index the archived payloads as if they were fetched now.
+REPLAY_DISABLED_FILES = ("checkpointFile", "deltaStateFile", "channelIndexFile")
+
+def replay_settings(settings: Dict[str, Any]) -> Dict[str, Any]:
+    """``settings`` for a replayed run, with the REPLAY_DISABLED_FILES turned off."""
+    disabled = [key for key in REPLAY_DISABLED_FILES if settings.get(key)]
+    if disabled:
+        logging.info("Replaying; not using %s", ", ".join(disabled))
+    return {**settings, **{key: None for key in REPLAY_DISABLED_FILES}}
+
+def credential_pool_for(settings: Dict[str, Any]) -> CredentialPool:
+    # A replay never reaches Helix, so it runs without credentials.
+    if settings.get("responseArchiveReplay") and settings.get("responseArchiveFile"):
+        return CredentialPool([Credential("replay")])
+    return build_credential_pool(settings)
+
+def enrichment_fields(settings: Dict[str, Any], key: str = "fields") -> Optional[FrozenSet[str]]:
+    """
+    The enrichment fields selected by the ``fields`` setting, or another field
+    list setting given as ``key`` (None means the mode's default). Unknown names
+    are a configuration error.
+    """
+    fields = settings.get(key)
+    if fields is None:
+        return None
+    unknown = sorted(set(fields) - set(ENRICHMENT_FIELDS))
+    if unknown:
+        logging.error(
+            "Unknown entries in %s: %s (expected any of %s)", key, ", ".join(unknown), ", ".join(ENRICHMENT_FIELDS)
+        )
+        sys.exit(1)
+    if key == "fields":
+        logging.info("Fetching only %s", ", ".join(f for f in ENRICHMENT_FIELDS if f in fields) or "search results")
+    return frozenset(fields)
+
+def build_channel_filter(settings: Dict[str, Any]) -> ChannelFilter:
+    filters = settings.get("filters") or {}
+    min_followers = filters.get("minFollowers")
+    return ChannelFilter(
+        live_only=bool(filters.get("liveOnly", False)),
+        languages=filters.get("languages"),
+        games=filters.get("games"),
+        min_followers=int(min_followers) if min_followers else None,
+    )
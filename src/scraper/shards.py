@@ -0,0 +1,102 @@
+import argparse
+import logging
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+from utils.sharding import shard_path  # type: ignore
+
+from .exports import merge_exports
+from .settings import REPO_ROOT, SRC_DIR
+
+# Settings that name per-run files; each shard gets its own copy of them.
+SHARDED_PATH_SETTINGS = (
+    "outputFile",
+    "streamOutputFile",
+    "columnarOutputFile",
+    "checkpointFile",
+    "responseCacheFile",
+    "deltaStateFile",
+    "metricsFile",
+    "prometheusMetricsFile",
+    "responseArchiveFile",
+)
+
+def local_shard_rate_share(settings: Dict[str, Any], shard_index: int, shard_count: int) -> float:
+    """
+    The share of its primary clientId's rate limit a ``--processes`` shard gets:
+    1 / the number of local shards using that clientId (see run_local_shards).
+    """
+    shard_credentials = settings.get("shardCredentials") or []
+    if not shard_credentials:
+        return 1.0 / shard_count
+    return 1.0 / len(range(shard_index % len(shard_credentials), shard_count, len(shard_credentials)))
+
+def shard_settings(settings: Dict[str, Any], shard_index: int, shard_count: int) -> Dict[str, Any]:
+    """
+    Settings for one shard: per-shard copies of the run files, and this shard's
+    part of the ``credentials`` list, which is split between the shards. The
+    primary clientId keeps ``rateLimitShare`` as configured, since shards run
+    elsewhere may well use their own; local ``--processes`` shards that share
+    it are given their share explicitly.
+    """
+    sharded = dict(settings)
+    for key in SHARDED_PATH_SETTINGS:
+        if sharded.get(key):
+            sharded[key] = str(shard_path(Path(sharded[key]), shard_index, shard_count))
+
+    sharded["credentials"] = [
+        {**entry, "rateLimitShare": 1.0} for entry in (settings.get("credentials") or [])[shard_index::shard_count]
+    ]
+    return sharded
+
+# The command line entry point each local shard runs.
+MAIN_SCRIPT = SRC_DIR / "main.py"
+
+def run_local_shards(args: argparse.Namespace, settings: Dict[str, Any]) -> None:
+    """
+    Run ``--processes`` shards as child processes of this script, then merge their
+    outputs. Each shard can use its own app credentials from ``shardCredentials``;
+    shard N uses entry N modulo their number as its primary credential. Shards
+    that end up on the same primary clientId split its rate limit evenly.
+    """
+    shard_count = args.processes
+    credentials = settings.get("shardCredentials") or []
+    children = []
+    for shard_index in range(shard_count):
+        cmd = [sys.executable, str(MAIN_SCRIPT), "--shard", f"{shard_index}/{shard_count}"]
+        cmd += ["--rate-limit-share", str(local_shard_rate_share(settings, shard_index, shard_count))]
+        if args.config:
+            cmd += ["--config", str(args.config)]
+        if args.resume:
+            cmd.append("--resume")
+        if args.discovery:
+            cmd += ["--discovery", args.discovery]
+        if args.replay:
+            cmd += ["--replay", str(args.replay)]
+        env = dict(os.environ)
+        if credentials:
+            creds = credentials[shard_index % len(credentials)]
+            env["TWITCH_CLIENT_ID"] = creds.get("clientId", "")
+            env["TWITCH_ACCESS_TOKEN"] = creds.get("accessToken", "")
+            env["TWITCH_CLIENT_SECRET"] = creds.get("clientSecret", "")
+        logging.info("Starting shard %d/%d", shard_index, shard_count)
+        children.append(subprocess.Popen(cmd, env=env))
+
+    for shard_index, child in enumerate(children):
+        if child.wait() != 0:
+            logging.error("Shard %d/%d exited with status %d", shard_index, shard_count, child.returncode)
+
+    # Prefer the NDJSON stream (complete even without finalizeJson) over the JSON export.
+    source_key = "streamOutputFile" if settings.get("streamOutputFile") else "outputFile"
+    inputs = [
+        REPO_ROOT / shard_path(Path(settings[source_key]), shard_index, shard_count)
+        for shard_index in range(shard_count)
+    ]
+    existing = [path for path in inputs if path.exists()]
+    if not existing:
+        logging.warning("No shard produced any output; nothing to merge.")
+        return
+    merge_exports(existing, REPO_ROOT / settings.get("outputFile", "data/sample_output.json"))
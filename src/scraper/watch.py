@@ -0,0 +1,154 @@
+import logging
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from extractors.records import Stream  # type: ignore
+from extractors.stream_parser import parse_stream  # type: ignore
+from outputs.exporter import JsonLinesWriter, iter_records  # type: ignore
+from utils.metrics import timed  # type: ignore
+from utils.poll_schedule import AdaptivePollSchedule  # type: ignore
+from utils.request_handler import RequestHandler  # type: ignore
+
+from .lookups import HELIX_BATCH_SIZE, STREAMS_LOOKUP, batched_get
+from .settings import REPO_ROOT, credential_pool_for, open_response_archive
+
+def load_watch_channels(settings: Dict[str, Any], channels_file: Optional[Path] = None) -> List[str]:
+    """
+    Channel ids for watch mode: one id per line from ``channels_file`` (or the
+    ``watchChannelsFile`` setting), otherwise every channel in the last crawl's output.
+    """
+    if channels_file is None and settings.get("watchChannelsFile"):
+        channels_file = REPO_ROOT / settings["watchChannelsFile"]
+    if channels_file is not None:
+        if not channels_file.exists():
+            logging.error("Channels file %s not found", channels_file)
+            sys.exit(1)
+        with channels_file.open("r", encoding="utf-8") as f:
+            ids = [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+        if not ids:
+            logging.error("No channel ids found in %s", channels_file)
+            sys.exit(1)
+        return list(dict.fromkeys(ids))
+
+    for key in ("streamOutputFile", "outputFile"):
+        path = REPO_ROOT / settings[key] if settings.get(key) else None
+        if path is not None and path.exists():
+            ids = [
+                str(record["channelId"])
+                for record in iter_records(path)
+                if record.get("channelId") and record.get("change") != "deleted"
+            ]
+            logging.info("Watching channels from previous output %s", path)
+            return list(dict.fromkeys(ids))
+    return []
+
+def poll_streams(handler: RequestHandler, user_ids: List[str]) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Live streams for watch mode, like fetch_streams_for_users, but None when a
+    /streams batch failed. The handler answers a failed request with an empty
+    body, which must not be read as every channel being offline.
+    """
+    try:
+        with timed(handler.metrics, "batch.streams"):
+            streams = batched_get(handler, STREAMS_LOOKUP, user_ids, require_data=True)
+    except Exception as e:
+        logging.warning("Polling /streams for %d channels failed: %s", len(user_ids), e)
+        return None
+    if streams is None:
+        logging.warning("Polling /streams for %d channels failed", len(user_ids))
+    return streams
+
+def _viewer_point(channel_id: str, stream: Optional[Stream], timestamp: str) -> Dict[str, Any]:
+    return {
+        "channelId": channel_id,
+        "timestamp": timestamp,
+        "live": stream is not None,
+        "viewerCount": stream.viewerCount if stream else None,
+        "streamId": stream.id if stream else None,
+        "gameName": stream.gameName if stream else None,
+        "title": stream.title if stream else None,
+    }
+
+def run_watch(
+    settings: Dict[str, Any],
+    channels_file: Optional[Path] = None,
+    duration: Optional[float] = None,
+) -> None:
+    """
+    Long-running watch mode: poll /streams for a fixed set of channels in batches
+    of 100 ids, on per-channel adaptive intervals, and append a viewerCount point
+    per live channel per poll (plus one point when a channel goes offline) to
+    ``watchOutputFile``. Runs for ``duration`` seconds or until interrupted.
+    """
+    credentials = credential_pool_for(settings)
+
+    channel_ids = load_watch_channels(settings, channels_file)
+    if not channel_ids:
+        logging.error("No channels to watch; pass --channels or run a crawl first.")
+        sys.exit(1)
+
+    archive = open_response_archive(settings)
+    # No response cache: watch mode exists to see fresh /streams answers.
+    primary = credentials.credentials[0]
+    handler = RequestHandler(
+        base_url=settings.get("baseUrl", "https://api.twitch.tv/helix"),
+        client_id=primary.client_id,
+        access_token=primary.access_token,
+        max_retries=int(settings.get("maxRetries", 3)),
+        timeout=float(settings.get("timeoutSeconds", 15)),
+        max_backoff=float(settings.get("maxBackoffSeconds", 60)),
+        credentials=credentials,
+        archive=archive,
+    )
+
+    schedule = AdaptivePollSchedule(
+        channel_ids,
+        live_interval=float(settings.get("watchLiveIntervalSeconds", 30)),
+        offline_interval=float(settings.get("watchOfflineIntervalSeconds", 120)),
+        max_interval=float(settings.get("watchMaxIntervalSeconds", 1800)),
+        backoff=float(settings.get("watchBackoffFactor", 2.0)),
+    )
+    writer = JsonLinesWriter(
+        REPO_ROOT / settings.get("watchOutputFile", "data/live_viewers.jsonl"),
+        compression=settings.get("outputCompression"),
+        append=True,
+    )
+    logging.info("Watching %d channels", len(schedule))
+
+    deadline = time.monotonic() + duration if duration is not None else None
+    polls = 0
+    try:
+        while deadline is None or time.monotonic() < deadline:
+            due = schedule.due(HELIX_BATCH_SIZE)
+            streams = poll_streams(handler, due) if due else None
+            if due and streams is None:
+                # Failed poll: try these channels again later without recording a result.
+                for channel_id in due:
+                    schedule.postpone(channel_id, schedule.live_interval)
+            elif streams is not None:
+                timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+                for channel_id in due:
+                    stream = parse_stream(streams.get(channel_id))
+                    # Offline channels only produce a point on the live -> offline edge.
+                    if stream is not None or schedule.is_live(channel_id):
+                        writer.write(_viewer_point(channel_id, stream, timestamp))
+                    schedule.record(channel_id, stream is not None)
+                writer.flush()
+                polls += 1
+                logging.debug("Polled %d channels (%d points so far)", len(due), writer.count)
+
+            wait = schedule.next_due_in()
+            if deadline is not None:
+                wait = min(wait, max(0.0, deadline - time.monotonic()))
+            time.sleep(wait)
+    except KeyboardInterrupt:
+        logging.info("Watch interrupted")
+    finally:
+        handler.close()
+        writer.close()
+        if archive is not None:
+            archive.close()
+        logging.info("Watch finished after %d polls", polls)
@@ -0,0 +1,195 @@
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, TypeVar
+
+from .credentials import CredentialPool
+from .metrics import RunMetrics
+from .rate_limiter import TokenBucketRateLimiter
+from .request_core import DONE, RATE_LIMITED, UNAUTHORIZED, RequestCore
+from .response_archive import ResponseArchive
+from .response_cache import ResponseCache
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None  # type: ignore
+
+T = TypeVar("T")
+
+def _encode_params(params: Optional[Dict[str, Any]]) -> List[Tuple[str, str]]:
+    """
+    Flatten params into (key, value) pairs the same way requests does: list values
+    become repeated keys and None values are dropped. Booleans are lowercased
+    because aiohttp refuses to encode them.
+    """
+    encoded: List[Tuple[str, str]] = []
+    for key, value in (params or {}).items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for v in values:
+            if v is None:
+                continue
+            if isinstance(v, bool):
+                v = "true" if v else "false"
+            encoded.append((key, str(v)))
+    return encoded
+
+class AsyncRequestHandler(RequestCore):
+    """
+    asyncio counterpart of RequestHandler backed by a pooled aiohttp session.
+
+    One instance can be shared by any number of coroutines; each event loop
+    gets its own pooled session. Synchronous code should go through ``run``,
+    which executes coroutines on one background loop owned by the handler, so
+    every caller (from any thread) shares a single session and its keep-alive
+    connections for the handler's lifetime; ``shutdown`` releases them. Retry,
+    429, 401 and cache handling come from RequestCore, as for RequestHandler:
+    failures are retried with exponential backoff and an empty dict is returned
+    once ``max_retries`` is exhausted.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        client_id: str,
+        access_token: str,
+        max_retries: int = 3,
+        timeout: float = 15.0,
+        pool_size: int = 10,
+        rate_limiter: Optional[TokenBucketRateLimiter] = None,
+        max_backoff: float = 60.0,
+        cache: Optional[ResponseCache] = None,
+        metrics: Optional[RunMetrics] = None,
+        credentials: Optional[CredentialPool] = None,
+        archive: Optional[ResponseArchive] = None,
+    ) -> None:
+        if aiohttp is None:
+            raise ImportError(
+                "AsyncRequestHandler requires aiohttp. Install it with 'pip install aiohttp'."
+            )
+        super().__init__(
+            base_url,
+            client_id,
+            access_token,
+            max_retries=max_retries,
+            timeout=timeout,
+            pool_size=pool_size,
+            rate_limiter=rate_limiter,
+            max_backoff=max_backoff,
+            cache=cache,
+            metrics=metrics,
+            credentials=credentials,
+            archive=archive,
+        )
+        self._sessions: Dict[asyncio.AbstractEventLoop, "aiohttp.ClientSession"] = {}
+        self._sessions_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        loop = asyncio.get_running_loop()
+        with self._sessions_lock:
+            session = self._sessions.get(loop)
+            if session is None or session.closed:
+                connector = aiohttp.TCPConnector(limit=self.pool_size)
+                session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                )
+                self._sessions[loop] = session
+        return session
+
+    async def close(self) -> None:
+        """Close the session belonging to the running event loop."""
+        with self._sessions_lock:
+            session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+
+    def _background_loop(self) -> asyncio.AbstractEventLoop:
+        with self._sessions_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever, name="async-request-handler", daemon=True
+                )
+                self._loop_thread.start()
+            return self._loop
+
+    def run(self, coro: Awaitable[T]) -> T:
+        """
+        Run ``coro`` on the handler's background event loop and wait for its
+        result. Safe to call from several threads at once.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._background_loop()).result()  # type: ignore[arg-type]
+
+    def shutdown(self) -> None:
+        """Close the background loop's session and stop the loop (see ``run``)."""
+        with self._sessions_lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = self._loop_thread = None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join()
+        loop.close()
+
+    async def __aenter__(self) -> "AsyncRequestHandler":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        replayed = self._replayed(path, params)
+        if replayed is not None:
+            return replayed
+        return self._record(path, params, await self._get(path, params))
+
+    async def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        state, cached_body = self._start(path, params)
+        if cached_body is not None:
+            return cached_body
+        query = _encode_params(params)
+
+        while True:
+            state.attempt += 1
+            try:
+                self.logger.debug("GET %s params=%s attempt=%d", state.url, params, state.attempt)
+                credential = await self.credentials.acquire_async()
+                token = credential.access_token
+                session = self._get_session()
+                started = time.perf_counter()
+                try:
+                    async with session.get(
+                        state.url, headers=self._headers(credential, state.extra_headers()), params=query
+                    ) as resp:
+                        # Read the body up front so latency and byte counts cover the whole response.
+                        payload = await resp.read()
+                        status, headers = resp.status, resp.headers
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    self._observe(state, time.perf_counter() - started, None)
+                    raise
+                self._observe(state, time.perf_counter() - started, status, len(payload))
+
+                action, value = self._classify(state, credential, status, headers, payload)
+                if action == DONE:
+                    return value
+                if action == RATE_LIMITED:
+                    if value:
+                        await asyncio.sleep(value)
+                    continue
+                # Expired or revoked app token: issue a new one and retry straight away.
+                if action == UNAUTHORIZED and self._after_refresh(
+                    state, credential, await self.credentials.refresh_async(credential, token)
+                ):
+                    continue
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                self.logger.warning("Request error calling %s: %s", state.url, exc)
+
+            sleep_for = self._next_backoff(state)
+            if sleep_for is None:
+                return {}
+            await asyncio.sleep(sleep_for)
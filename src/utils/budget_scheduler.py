@@ -0,0 +1,209 @@
+import logging
+import math
+import time
+from typing import Any, Callable, Collection, Dict, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (keyword, raw page, cursor after the page) as produced by the search phase.
+Page = Tuple[str, List[Dict[str, Any]], Optional[str]]
+# (keyword, raw channel, channel id) queued for enrichment.
+Item = Tuple[str, Dict[str, Any], str]
+
+def _describe(fields: Optional[Collection[str]]) -> str:
+    if fields is None:
+        return "all fields"
+    return ", ".join(sorted(fields)) or "search results only"
+
+class RunBudget:
+    """
+    Wall-clock deadline and/or request quota for one run, counted from its
+    creation. ``requests_used`` reports the requests made so far.
+    """
+
+    def __init__(
+        self,
+        deadline_seconds: Optional[float] = None,
+        max_requests: Optional[int] = None,
+        requests_used: Callable[[], int] = lambda: 0,
+    ) -> None:
+        self.deadline = time.monotonic() + deadline_seconds if deadline_seconds is not None else None
+        self.max_requests = max_requests
+        self.requests_used = requests_used
+
+    @property
+    def active(self) -> bool:
+        return self.deadline is not None or self.max_requests is not None
+
+    def remaining_seconds(self) -> float:
+        return self.deadline - time.monotonic() if self.deadline is not None else math.inf
+
+    def remaining_requests(self) -> float:
+        return self.max_requests - self.requests_used() if self.max_requests is not None else math.inf
+
+    def exhausted(self) -> bool:
+        """True once the deadline has passed or the request quota is used up."""
+        return self.remaining_seconds() <= 0 or self.remaining_requests() <= 0
+
+class PriorityScheduler:
+    """
+    Enriches every channel a run found in priority order within a RunBudget,
+    degrading gracefully instead of running over it.
+
+    ``levels`` lists the field selections from richest to cheapest, e.g. full
+    enrichment, then stream only, then nothing (search payload only). Channels
+    are taken in chunks; the head of each chunk gets the richest level that fits
+    the remaining requests and time while still leaving enough to give every
+    lower-priority channel the next level down. Levels never go back up, so the
+    highest-priority channels are always the best served.
+
+    Request costs come from ``estimate_requests(fields, channels)``; with
+    ``reuse`` a channel already enriched under another keyword costs nothing.
+    Time costs are measured per level, starting with a small probe when a
+    deadline is set.
+    """
+
+    def __init__(
+        self,
+        budget: RunBudget,
+        levels: Sequence[Optional[Collection[str]]],
+        estimate_requests: Callable[[Optional[Collection[str]], int], int],
+        chunk_size: int = 100,
+        probe_size: int = 10,
+        reuse: bool = False,
+    ) -> None:
+        self.budget = budget
+        self.levels = list(levels)
+        self.estimate_requests = estimate_requests
+        self.chunk_size = max(1, chunk_size)
+        self.probe_size = max(1, probe_size)
+        self.reuse = reuse
+        self.channels_per_level = [0] * len(self.levels)
+        self._seconds = [0.0] * len(self.levels)
+        self._enriched: Set[str] = set()
+
+    def _seconds_per_channel(self, level: int) -> float:
+        count = self.channels_per_level[level]
+        return self._seconds[level] / count if count else 0.0
+
+    def _new(self, items: Sequence[Item]) -> List[Item]:
+        if not self.reuse:
+            return list(items)
+        fresh: Dict[str, Item] = {}
+        for item in items:
+            if item[2] not in self._enriched:
+                fresh.setdefault(item[2], item)
+        return list(fresh.values())
+
+    def _cost(self, level: int, items: Sequence[Item]) -> Tuple[int, float]:
+        groups: Dict[str, int] = {}
+        for keyword, _, _ in self._new(items):
+            groups[keyword] = groups.get(keyword, 0) + 1
+        requests = sum(self.estimate_requests(self.levels[level], size) for size in groups.values())
+        return requests, self._seconds_per_channel(level) * sum(groups.values())
+
+    def _fits(self, level: int, head: Sequence[Item], tail: Sequence[Item]) -> bool:
+        requests, seconds = self._cost(level, head)
+        # Leave room for the lower-priority channels at the next cheaper level.
+        if level + 1 < len(self.levels):
+            tail_requests, tail_seconds = self._cost(level + 1, tail)
+            requests += tail_requests
+            seconds += tail_seconds
+        if requests > self.budget.remaining_requests():
+            return False
+        return requests == 0 or seconds < self.budget.remaining_seconds()
+
+    def _affordable(self, level: int, chunk: Sequence[Item], rest: Sequence[Item]) -> int:
+        """How many channels at the head of ``chunk`` can get ``level``."""
+        low, high = 0, len(chunk)
+        if self.budget.deadline is not None and not self.channels_per_level[level]:
+            high = min(high, self.probe_size)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self._fits(level, chunk[:middle], list(chunk[middle:]) + list(rest)):
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+    def run(
+        self,
+        pages: Sequence[Page],
+        priority: Callable[[Dict[str, Any]], Any],
+        channel_id: Callable[[Dict[str, Any]], str],
+        enrich: Callable[[str, List[Dict[str, Any]], Optional[Collection[str]]], List[Any]],
+        on_page: Optional[Callable[[int, List[Any]], None]] = None,
+    ) -> List[List[Any]]:
+        """
+        Enrich the channels of ``pages``, highest ``priority`` first, and return
+        each page's records in page order. ``enrich(keyword, channels, fields)``
+        builds records for channels of one keyword; records are matched back to
+        channels by ``channelId``.
+
+        ``on_page(i, records)`` is called as soon as every channel of ``pages[i]``
+        and of the keyword's earlier pages has been enriched, so callers can
+        export and checkpoint pages while lower-priority channels are still queued.
+        """
+        queue: List[Item] = [(keyword, raw, channel_id(raw)) for keyword, page, _ in pages for raw in page]
+        queue.sort(key=lambda item: priority(item[1]), reverse=True)
+
+        # Channels each page still waits for, and each keyword's pages in order.
+        waiting: List[Set[str]] = [{channel_id(raw) for raw in page} for _, page, _ in pages]
+        pages_of: Dict[str, List[int]] = {}
+        for i, (keyword, _, _) in enumerate(pages):
+            pages_of.setdefault(keyword, []).append(i)
+        built: Dict[Tuple[str, str], Any] = {}
+
+        def records_of(i: int) -> List[Any]:
+            keyword, page, _ = pages[i]
+            return [built[key] for key in ((keyword, channel_id(raw)) for raw in page) if key in built]
+
+        def flush(keyword: str, done: Set[str]) -> None:
+            order = pages_of[keyword]
+            for i in order:
+                waiting[i] -= done
+            while order and not waiting[order[0]]:
+                i = order.pop(0)
+                if on_page is not None:
+                    on_page(i, records_of(i))
+
+        level = 0
+        last = len(self.levels) - 1
+        position = 0
+        while position < len(queue):
+            chunk = queue[position:position + self.chunk_size]
+            rest = queue[position + len(chunk):]
+            count = len(chunk) if level == last else self._affordable(level, chunk, rest)
+            while count == 0:
+                level += 1
+                logger.info(
+                    "Budget: enriching the remaining %d channels with %s",
+                    len(queue) - position,
+                    _describe(self.levels[level]),
+                )
+                count = len(chunk) if level == last else self._affordable(level, chunk, rest)
+
+            taken = chunk[:count]
+            by_keyword: Dict[str, List[Item]] = {}
+            for item in taken:
+                by_keyword.setdefault(item[0], []).append(item)
+            for keyword, items in by_keyword.items():
+                started = time.monotonic()
+                for record in enrich(keyword, [raw for _, raw, _ in items], self.levels[level]):
+                    built[(keyword, record.channelId)] = record
+                self._seconds[level] += time.monotonic() - started
+                flush(keyword, {item[2] for item in items})
+            self.channels_per_level[level] += len(self._new(taken))
+            self._enriched.update(item[2] for item in taken)
+            position += count
+
+        for keyword in pages_of:
+            # Pages without any channel left to wait for (e.g. empty ones).
+            flush(keyword, set())
+        return [records_of(i) for i in range(len(pages))]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "channelsPerLevel": self.channels_per_level,
+            "requestsRemaining": self.budget.remaining_requests() if self.budget.max_requests is not None else None,
+        }
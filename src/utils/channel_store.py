@@ -0,0 +1,168 @@
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Collection, Dict, Iterable, List, Mapping, Optional
+
+from . import serialization
+
+# Fields that describe a particular search match rather than the channel.
+_MATCH_FIELDS = ("keyword", "keywords", "change")
+
+# bm25 column weights for display_name, login, description, stream_title, game_name.
+_BM25_WEIGHTS = "10.0, 10.0, 1.0, 2.0, 2.0"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+def match_expression(query: str) -> Optional[str]:
+    """
+    FTS5 query for a search keyword: every word must match, as a prefix
+    ("just chat" finds "Just Chatting"). None if the keyword has no words.
+    """
+    tokens = _TOKEN_RE.findall(query.lower())
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+class ChannelStore:
+    """
+    Persistent (SQLite) store of normalized channel records with an FTS5 index
+    over display name, login, description and the current stream's title and
+    game, so keyword lookups can be answered locally instead of through
+    /search/channels.
+
+    ``upsert`` keeps one row per channel (the latest version wins, except for
+    fields the caller asks to keep from the stored version); ``search``
+    returns the best matching records for a keyword, ranked by bm25 with name
+    matches weighted highest. Safe to share between threads.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.upserts = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Shard processes may write to the same index; wait for the lock instead of failing.
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS channels (
+                id INTEGER PRIMARY KEY,
+                channel_id TEXT NOT NULL UNIQUE,
+                record TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        try:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS channels_fts USING fts5("
+                "display_name, login, description, stream_title, game_name, "
+                "tokenize = 'unicode61 remove_diacritics 2')"
+            )
+        except sqlite3.OperationalError as exc:
+            self._conn.close()
+            raise RuntimeError(f"The channel index needs SQLite with FTS5 support: {exc}") from exc
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM channels").fetchone()[0])
+
+    def upsert(
+        self,
+        records: Iterable[Dict[str, Any]],
+        keep: Optional[Mapping[str, Collection[str]]] = None,
+    ) -> int:
+        """
+        Insert or replace channel records (dict form); returns the number stored.
+        ``keep`` maps channel ids to record fields that were not fetched this
+        time, which keep their stored values instead of being cleared.
+        """
+        keep = keep or {}
+        now = time.time()
+        stored = 0
+        with self._lock:
+            for record in records:
+                channel_id = record.get("channelId")
+                if not channel_id:
+                    continue
+                row = self._conn.execute(
+                    "SELECT id, record FROM channels WHERE channel_id = ?", (channel_id,)
+                ).fetchone()
+                kept = keep.get(channel_id)
+                if row is not None and kept:
+                    previous = serialization.loads(row[1])
+                    record = {**record, **{k: previous[k] for k in kept if k in previous}}
+                body = serialization.dumps({k: v for k, v in record.items() if k not in _MATCH_FIELDS})
+                if row is None:
+                    rowid = self._conn.execute(
+                        "INSERT INTO channels (channel_id, record, updated_at) VALUES (?, ?, ?)",
+                        (channel_id, body, now),
+                    ).lastrowid
+                else:
+                    rowid = row[0]
+                    self._conn.execute(
+                        "UPDATE channels SET record = ?, updated_at = ? WHERE id = ?", (body, now, rowid)
+                    )
+                    self._conn.execute("DELETE FROM channels_fts WHERE rowid = ?", (rowid,))
+                stream = record.get("stream") or {}
+                self._conn.execute(
+                    "INSERT INTO channels_fts "
+                    "(rowid, display_name, login, description, stream_title, game_name) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        rowid,
+                        record.get("displayName") or "",
+                        record.get("login") or "",
+                        record.get("description") or "",
+                        stream.get("title") or "",
+                        stream.get("gameName") or "",
+                    ),
+                )
+                stored += 1
+            self._conn.commit()
+            self.upserts += stored
+        return stored
+
+    def search(
+        self,
+        keyword: str,
+        limit: int = 100,
+        max_age: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Records matching ``keyword``, best first, with ``keyword`` set on each.
+        ``max_age`` (seconds) skips records that were not refreshed recently.
+        """
+        expression = match_expression(keyword)
+        if expression is None:
+            return []
+        sql = (
+            "SELECT c.record FROM channels_fts JOIN channels c ON c.id = channels_fts.rowid "
+            "WHERE channels_fts MATCH ?"
+        )
+        params: List[Any] = [expression]
+        if max_age is not None:
+            sql += " AND c.updated_at >= ?"
+            params.append(time.time() - max_age)
+        sql += f" ORDER BY bm25(channels_fts, {_BM25_WEIGHTS}) LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        records = []
+        for (body,) in rows:
+            record = serialization.loads(body)
+            record["keyword"] = keyword
+            records.append(record)
+        return records
+
+    def stats(self) -> Dict[str, int]:
+        return {"channels": len(self), "upserts": self.upserts}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,121 @@
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class KeywordProgress:
+    cursor: Optional[str] = None
+    # Records exported so far, and search results consumed (before filtering).
+    collected: int = 0
+    searched: int = 0
+    done: bool = False
+
+@dataclass
+class CheckpointState:
+    keywords: Dict[str, KeywordProgress] = field(default_factory=dict)
+    enriched_ids: Set[str] = field(default_factory=set)
+
+    def progress(self, keyword: str) -> KeywordProgress:
+        return self.keywords.get(keyword) or KeywordProgress()
+
+    def is_done(self, keyword: str) -> bool:
+        progress = self.progress(keyword)
+        # A last page (no next cursor) that was journaled counts as done even if
+        # the run died before writing the explicit "done" entry.
+        return progress.done or (progress.searched > 0 and progress.cursor is None)
+
+class CheckpointJournal:
+    """
+    Append-only NDJSON journal of run progress.
+
+    After each search page has been enriched and its records written out, a
+    ``page`` entry stores the keyword's next pagination cursor, how many search
+    results it has consumed and how many records it has produced so far (these
+    differ when channels are filtered out), and which channel ids were enriched. A
+    ``done`` entry marks a finished keyword. Replaying the journal gives the
+    state needed to resume a run exactly where it stopped; a torn last line
+    from a crash is ignored.
+    """
+
+    def __init__(self, path: Path, resume: bool = False) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.state = self.load(self.path) if resume else CheckpointState()
+        self._lock = threading.Lock()
+        self._fh = self.path.open("a" if resume else "w", encoding="utf-8")
+
+    @staticmethod
+    def load(path: Path) -> CheckpointState:
+        state = CheckpointState()
+        if not path.exists():
+            return state
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                keyword = entry.get("keyword")
+                if keyword is None:
+                    continue
+                progress = state.keywords.setdefault(keyword, KeywordProgress())
+                if entry.get("type") == "page":
+                    progress.cursor = entry.get("cursor")
+                    progress.collected = int(entry.get("collected") or 0)
+                    # Journals written before "searched" existed only had the one count.
+                    progress.searched = int(entry.get("searched") or progress.collected)
+                    state.enriched_ids.update(entry.get("channelIds") or [])
+                elif entry.get("type") == "done":
+                    progress.done = True
+        logger.info(
+            "Loaded checkpoint %s: %d keywords done, %d channels enriched",
+            path,
+            sum(1 for p in state.keywords.values() if p.done),
+            len(state.enriched_ids),
+        )
+        return state
+
+    def _append(self, entry: Dict[str, object]) -> None:
+        with self._lock:
+            self._fh.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")))
+            self._fh.write("\n")
+            self._fh.flush()
+
+    def record_page(
+        self,
+        keyword: str,
+        cursor: Optional[str],
+        collected: int,
+        channel_ids: List[str],
+        searched: Optional[int] = None,
+    ) -> None:
+        searched = collected if searched is None else searched
+        progress = self.state.keywords.setdefault(keyword, KeywordProgress())
+        progress.cursor = cursor
+        progress.collected = collected
+        progress.searched = searched
+        self.state.enriched_ids.update(channel_ids)
+        self._append(
+            {
+                "type": "page",
+                "keyword": keyword,
+                "cursor": cursor,
+                "collected": collected,
+                "searched": searched,
+                "channelIds": channel_ids,
+            }
+        )
+
+    def record_done(self, keyword: str) -> None:
+        self.state.keywords.setdefault(keyword, KeywordProgress()).done = True
+        self._append({"type": "done", "keyword": keyword})
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._fh.closed:
+                self._fh.close()
@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import requests
+
+from .rate_limiter import TokenBucketRateLimiter
+
+TOKEN_URL = "https://id.twitch.tv/oauth2/token"
+
+logger = logging.getLogger(__name__)
+
+class Credential:
+    """
+    One Helix app credential (client id + app access token) with its own
+    rate-limit bucket, since Helix meters every client id separately. With a
+    ``client_secret`` the token can be (re)issued via the client-credentials flow.
+    """
+
+    def __init__(
+        self,
+        client_id: str,
+        access_token: str = "",
+        client_secret: Optional[str] = None,
+        rate_limiter: Optional[TokenBucketRateLimiter] = None,
+    ) -> None:
+        self.client_id = client_id
+        self.access_token = access_token
+        self.client_secret = client_secret
+        self.rate_limiter = rate_limiter
+        self.expires_at: Optional[float] = None
+        self.requests = 0
+        self.refreshes = 0
+        self._lock = threading.Lock()
+        # Separate from _lock, which is held for the whole token refresh request.
+        self._count_lock = threading.Lock()
+
+    def headers(self) -> Dict[str, str]:
+        return {"Client-Id": self.client_id, "Authorization": f"Bearer {self.access_token}"}
+
+    def headroom(self) -> float:
+        return self.rate_limiter.headroom() if self.rate_limiter is not None else float("inf")
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        if self.rate_limiter is not None:
+            self.rate_limiter.update_from_headers(headers)
+
+    def count_request(self) -> None:
+        with self._count_lock:
+            self.requests += 1
+
+    def block_for(self, seconds: float) -> None:
+        if self.rate_limiter is not None:
+            self.rate_limiter.block_for(seconds)
+
+class CredentialPool:
+    """
+    Several app credentials used by one process. ``acquire`` routes each request
+    to the credential with the most rate-limit headroom (ties rotate) and waits
+    on that credential's bucket, so throughput scales with the number of
+    credentials. When Helix answers 401, ``refresh`` issues a new app token for
+    the credential; tokens that are about to expire are refreshed before use.
+    Safe to share between threads and event loops.
+    """
+
+    def __init__(
+        self,
+        credentials: Sequence[Credential],
+        token_url: str = TOKEN_URL,
+        timeout: float = 15.0,
+        refresh_margin: float = 300.0,
+    ) -> None:
+        if not credentials:
+            raise ValueError("CredentialPool needs at least one credential")
+        self.credentials = list(credentials)
+        self.token_url = token_url
+        self.timeout = timeout
+        self.refresh_margin = refresh_margin
+        self._turn = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.credentials)
+
+    def _pick(self) -> Credential:
+        if len(self.credentials) == 1:
+            return self.credentials[0]
+        with self._lock:
+            start = self._turn
+            self._turn = (self._turn + 1) % len(self.credentials)
+        rotated = self.credentials[start:] + self.credentials[:start]
+        return max(rotated, key=Credential.headroom)
+
+    def _needs_token(self, credential: Credential) -> bool:
+        if not credential.client_secret:
+            return False
+        if not credential.access_token:
+            return True
+        return credential.expires_at is not None and credential.expires_at - time.time() < self.refresh_margin
+
+    def acquire(self) -> Credential:
+        """Pick a credential for the next request, blocking until its bucket allows it."""
+        credential = self._pick()
+        if self._needs_token(credential):
+            self.refresh(credential, credential.access_token)
+        if credential.rate_limiter is not None:
+            credential.rate_limiter.acquire()
+        credential.count_request()
+        return credential
+
+    async def acquire_async(self) -> Credential:
+        """Coroutine-friendly variant of acquire()."""
+        credential = self._pick()
+        if self._needs_token(credential):
+            await self.refresh_async(credential, credential.access_token)
+        if credential.rate_limiter is not None:
+            await credential.rate_limiter.acquire_async()
+        credential.count_request()
+        return credential
+
+    def refresh(self, credential: Credential, rejected_token: str) -> bool:
+        """
+        Issue a new app token for ``credential`` after ``rejected_token`` was
+        refused. Returns True when a retry with the credential's current token
+        makes sense (refreshed now or already by another caller).
+        """
+        with credential._lock:
+            if credential.access_token != rejected_token:
+                return True
+            if not credential.client_secret:
+                return False
+            try:
+                resp = requests.post(
+                    self.token_url,
+                    data={
+                        "client_id": credential.client_id,
+                        "client_secret": credential.client_secret,
+                        "grant_type": "client_credentials",
+                    },
+                    timeout=self.timeout,
+                )
+                resp.raise_for_status()
+                body = resp.json()
+            except (requests.RequestException, ValueError) as exc:
+                logger.error("Could not refresh the app token for client %s: %s", credential.client_id, exc)
+                return False
+            token = body.get("access_token") if isinstance(body, dict) else None
+            if not token:
+                logger.error("Token endpoint returned no access_token for client %s", credential.client_id)
+                return False
+            credential.access_token = token
+            expires_in = body.get("expires_in")
+            credential.expires_at = time.time() + float(expires_in) if expires_in else None
+            credential.refreshes += 1
+        logger.info("Refreshed the app token for client %s", credential.client_id)
+        return True
+
+    async def refresh_async(self, credential: Credential, rejected_token: str) -> bool:
+        """refresh() on a worker thread, so the token request doesn't block the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.refresh, credential, rejected_token)
+
+    def requests(self) -> int:
+        """Requests sent through the pool so far, retries included."""
+        return sum(c.requests for c in self.credentials)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [
+            {"clientId": c.client_id, "requests": c.requests, "tokenRefreshes": c.refreshes}
+            for c in self.credentials
+        ]
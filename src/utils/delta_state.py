@@ -0,0 +1,226 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+# Record fields that are expensive to refresh (one request per channel each) and
+# how long a previous value stays good enough for an offline, unchanged channel.
+DEFAULT_FIELD_TTLS: Dict[str, float] = {
+    "latestVideo": 3600,
+    "topClip": 3600,
+    "nextSchedule": 21600,
+}
+
+# Fields that describe the match rather than the channel; they don't count as a change.
+_VOLATILE_FIELDS = ("keyword", "keywords", "change")
+
+def _digest(value: Any) -> str:
+    raw = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def record_hash(record: Dict[str, Any]) -> str:
+    """Content hash of a channel record, ignoring which keyword matched it."""
+    return _digest({k: v for k, v in record.items() if k not in _VOLATILE_FIELDS})
+
+class DeltaStateStore:
+    """
+    Persistent (SQLite) per-channel state for "changed since last run" output.
+
+    For every channel seen, the store keeps a content hash of its last record, a
+    hash of its profile fields, whether it was live, and the last values of the
+    slow per-channel fields (see ``DEFAULT_FIELD_TTLS``) with the time they were
+    fetched. ``diff`` passes through only new and changed records, tagged with a
+    ``change`` field; ``tombstones`` reports channels that were not seen in this
+    run. ``reusable_fields`` lets enrichment skip refetching the slow fields of
+    offline channels whose profile did not change until their TTL runs out.
+    Enrichment reports the slow fields it actually fetched with
+    ``record_fetched``; only those get a new value and timestamp in ``diff``,
+    so fields left out by a field selection keep their previous state.
+    Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        field_ttls: Optional[Dict[str, float]] = None,
+        resume: bool = False,
+    ) -> None:
+        self.path = Path(path)
+        self.field_ttls = {k: float(v) for k, v in (field_ttls or DEFAULT_FIELD_TTLS).items()}
+        self.new = 0
+        self.changed = 0
+        self.unchanged = 0
+        self.deleted = 0
+        self.skipped_fetches = 0
+        self._fetched: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS channels (
+                channel_id TEXT PRIMARY KEY,
+                record_hash TEXT NOT NULL,
+                profile_hash TEXT,
+                is_live INTEGER NOT NULL,
+                fields TEXT NOT NULL,
+                fetched_at TEXT NOT NULL,
+                run_id INTEGER NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'run_id'").fetchone()
+        self.run_id = int(row[0]) if row else 0
+        # A resumed run continues the interrupted one so the channels it already
+        # saw are not reported as deleted.
+        if not resume or row is None:
+            self.run_id += 1
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('run_id', ?)", (str(self.run_id),)
+            )
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM channels").fetchone()[0])
+
+    def reusable_fields(
+        self,
+        channel_id: str,
+        profile: Dict[str, Any],
+        is_live: bool,
+    ) -> Dict[str, Any]:
+        """
+        Previous values of the slow fields that don't need refetching for this
+        channel: it must be offline now and when last seen, with an unchanged
+        profile, and the field must still be within its TTL.
+        """
+        if is_live:
+            return {}
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT profile_hash, is_live, fields, fetched_at FROM channels WHERE channel_id = ?",
+                (channel_id,),
+            ).fetchone()
+        if row is None:
+            return {}
+        profile_hash, was_live, fields_json, fetched_json = row
+        if was_live or profile_hash != _digest(profile):
+            return {}
+
+        now = time.time()
+        fields = json.loads(fields_json)
+        fetched_at = json.loads(fetched_json)
+        reusable = {
+            field: fields.get(field)
+            for field, ttl in self.field_ttls.items()
+            if field in fetched_at and now - fetched_at[field] < ttl
+        }
+        if reusable:
+            with self._lock:
+                self.skipped_fetches += len(reusable)
+        return reusable
+
+    def record_fetched(self, channel_id: str, fields: Iterable[str]) -> None:
+        """Note which slow fields were fetched for ``channel_id`` in this run (see ``diff``)."""
+        fetched = {field for field in fields if field in self.field_ttls}
+        if fetched:
+            with self._lock:
+                self._fetched.setdefault(channel_id, set()).update(fetched)
+
+    def diff(
+        self,
+        records: Iterable[Dict[str, Any]],
+        profiles: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Record this run's view of each channel and return only the new or changed
+        records, each with ``change`` set to ``"new"`` or ``"changed"``.
+        ``profiles`` maps channel ids to the profile fields used by ``reusable_fields``.
+        Slow fields not passed to ``record_fetched`` keep their stored value and
+        fetch time.
+        """
+        profiles = profiles or {}
+        out: List[Dict[str, Any]] = []
+        now = time.time()
+        with self._lock:
+            for record in records:
+                channel_id = record.get("channelId")
+                if not channel_id:
+                    continue
+                digest = record_hash(record)
+                row = self._conn.execute(
+                    "SELECT record_hash, fields, fetched_at FROM channels WHERE channel_id = ?", (channel_id,)
+                ).fetchone()
+
+                fetched = self._fetched.pop(channel_id, set())
+                previous: Dict[str, Any] = json.loads(row[1]) if row else {}
+                fetched_at: Dict[str, float] = json.loads(row[2]) if row else {}
+                fields: Dict[str, Any] = {}
+                for field in self.field_ttls:
+                    if field in fetched:
+                        fields[field] = record.get(field)
+                        fetched_at[field] = now
+                    elif field in previous:
+                        fields[field] = previous[field]
+                profile = profiles.get(channel_id)
+
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO channels "
+                    "(channel_id, record_hash, profile_hash, is_live, fields, fetched_at, run_id) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        channel_id,
+                        digest,
+                        _digest(profile) if profile is not None else None,
+                        1 if record.get("stream") else 0,
+                        json.dumps(fields, ensure_ascii=False),
+                        json.dumps(fetched_at),
+                        self.run_id,
+                    ),
+                )
+
+                if row is None:
+                    self.new += 1
+                    out.append({**record, "change": "new"})
+                elif row[0] != digest:
+                    self.changed += 1
+                    out.append({**record, "change": "changed"})
+                else:
+                    self.unchanged += 1
+            self._conn.commit()
+        return out
+
+    def tombstones(self) -> List[Dict[str, Any]]:
+        """
+        Remove channels that were not seen in this run and return a tombstone
+        record (``{"channelId": ..., "change": "deleted"}``) for each. Only call
+        this after a run that covered every keyword.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT channel_id FROM channels WHERE run_id < ? ORDER BY channel_id", (self.run_id,)
+            ).fetchall()
+            self._conn.execute("DELETE FROM channels WHERE run_id < ?", (self.run_id,))
+            self._conn.commit()
+        self.deleted += len(rows)
+        return [{"channelId": channel_id, "change": "deleted"} for channel_id, in rows]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "new": self.new,
+            "changed": self.changed,
+            "unchanged": self.unchanged,
+            "deleted": self.deleted,
+            "skippedFetches": self.skipped_fetches,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,79 @@
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+class EnrichmentIndex:
+    """
+    Run-level memo of enriched channel records keyed by channel id.
+
+    A channel that matches several keywords is enriched once; later keywords
+    reuse its record with their own keyword. Only the parsed (slotted) records
+    are kept, not the raw Helix payloads they were built from. Finished records
+    from a previous (resumed) session can be seeded too.
+
+    When several keywords are enriched concurrently, ``claim`` hands each
+    channel to exactly one caller; the others wait for it in ``wait_for``.
+    """
+
+    def __init__(self) -> None:
+        self._records: Dict[str, Any] = {}
+        self._inflight: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self.reused = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, channel_id: object) -> bool:
+        return channel_id in self._records
+
+    def claim(self, channel_ids: Iterable[str]) -> List[str]:
+        """
+        Return the ids the caller must fetch and mark them in flight. Ids that
+        are already known, or being fetched by another caller, count as reused.
+        """
+        ids = list(channel_ids)
+        with self._lock:
+            todo = [cid for cid in ids if cid not in self._records and cid not in self._inflight]
+            for cid in todo:
+                self._inflight[cid] = threading.Event()
+            self.reused += len(ids) - len(todo)
+        return todo
+
+    def wait_for(self, channel_ids: Iterable[str]) -> None:
+        """Block until none of ``channel_ids`` is still being fetched by another caller."""
+        for cid in channel_ids:
+            event = self._inflight.get(cid)
+            if event is not None:
+                event.wait()
+
+    def record_for(self, channel_id: str) -> Optional[Any]:
+        """Return the stored record for ``channel_id``, or None if it has none."""
+        return self._records.get(channel_id)
+
+    def update(self, records_by_id: Dict[str, Any], claimed: Iterable[str] = ()) -> None:
+        """Store built records and release the claims on ``claimed`` ids."""
+        with self._lock:
+            self._records.update(records_by_id)
+            for cid in claimed:
+                event = self._inflight.pop(cid, None)
+                if event is not None:
+                    event.set()
+
+    def seed_records(
+        self,
+        records: Iterable[Dict[str, Any]],
+        channel_ids: Set[str],
+        convert: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> int:
+        """
+        Seed previously written records whose channel id is in ``channel_ids``,
+        stored as ``convert(record)`` when ``convert`` is given.
+        """
+        seeded = 0
+        with self._lock:
+            for record in records:
+                channel_id = record.get("channelId")
+                if channel_id in channel_ids and channel_id not in self._records:
+                    self._records[channel_id] = convert(record) if convert is not None else record
+                    seeded += 1
+        return seeded
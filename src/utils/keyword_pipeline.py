@@ -0,0 +1,175 @@
+import logging
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+Page = List[Dict[str, Any]]
+Records = List[Dict[str, Any]]
+
+@dataclass
+class _PageItem:
+    keyword: str
+    seq: int
+    page: Optional[Page] = None
+    cursor: Optional[str] = None
+    size: int = 0
+    is_last: bool = False
+    error: Optional[BaseException] = None
+
+@dataclass
+class _KeywordState:
+    next_seq: int = 0
+    buffered: Dict[int, _PageItem] = field(default_factory=dict)
+    failed: bool = False
+
+_STOP = object()
+
+class KeywordPipeline:
+    """
+    Runs search pagination for several keywords at once and overlaps it with
+    enrichment.
+
+    ``search_workers`` threads each take a keyword and page through its search
+    results, pushing every page onto a bounded work queue; when enrichment falls
+    behind, the queue fills up and searching blocks (backpressure), so memory
+    stays flat. A keyword has at most ``pages_per_keyword`` pages (default:
+    ``queue_size``) queued, being enriched or waiting for an earlier page to be
+    delivered; its search pauses until one of them is handed back, so a page
+    stuck in retries cannot make the rest of the keyword pile up behind it.
+    ``enrich_workers`` threads drain the queue. Results are handed
+    back on the calling thread, in page order per keyword, through ``on_page``
+    (keyword, records, cursor and the number of search results the records were
+    built from) and ``on_keyword_done``. A failure in one keyword's search or
+    enrichment is logged and stops only that keyword.
+    """
+
+    def __init__(
+        self,
+        search_workers: int = 2,
+        enrich_workers: int = 2,
+        queue_size: int = 8,
+        pages_per_keyword: Optional[int] = None,
+    ) -> None:
+        self.search_workers = max(1, search_workers)
+        self.enrich_workers = max(1, enrich_workers)
+        self.queue_size = max(1, queue_size)
+        self.pages_per_keyword = max(1, pages_per_keyword or self.queue_size)
+
+    def run(
+        self,
+        keywords: Iterable[str],
+        search_pages: Callable[[str], Iterator[Tuple[Page, Optional[str]]]],
+        enrich: Callable[[str, Page], Records],
+        on_page: Callable[[str, Records, Optional[str], int], None],
+        on_keyword_done: Callable[[str], None],
+    ) -> None:
+        keyword_q: "queue.Queue[Any]" = queue.Queue()
+        work_q: "queue.Queue[Any]" = queue.Queue(maxsize=self.queue_size)
+        result_q: "queue.Queue[_PageItem]" = queue.Queue(maxsize=self.queue_size)
+        failed: Set[str] = set()
+        # Per keyword: one slot per page between the search and its delivery.
+        slots: Dict[str, threading.Semaphore] = {}
+        slots_lock = threading.Lock()
+
+        pending_keywords = 0
+        for kw in dict.fromkeys(keywords):
+            keyword_q.put(kw)
+            pending_keywords += 1
+        for _ in range(self.search_workers):
+            keyword_q.put(_STOP)
+
+        def search_loop() -> None:
+            while True:
+                kw = keyword_q.get()
+                if kw is _STOP:
+                    return
+                in_flight = threading.Semaphore(self.pages_per_keyword)
+                with slots_lock:
+                    slots[kw] = in_flight
+                seq = 0
+                # Hold one page back so the last one can be flagged as such.
+                previous: Optional[_PageItem] = None
+                try:
+                    for page, cursor in search_pages(kw):
+                        if kw in failed:
+                            break
+                        if previous is not None:
+                            work_q.put(previous)
+                        in_flight.acquire()
+                        previous = _PageItem(kw, seq, page, cursor, len(page))
+                        seq += 1
+                except Exception as e:
+                    if previous is not None:
+                        work_q.put(previous)
+                    in_flight.acquire()
+                    work_q.put(_PageItem(kw, seq, error=e, is_last=True))
+                    continue
+                if previous is None:
+                    in_flight.acquire()
+                    previous = _PageItem(kw, seq, [], None)
+                previous.is_last = True
+                work_q.put(previous)
+
+        def enrich_loop() -> None:
+            while True:
+                item = work_q.get()
+                if item is _STOP:
+                    return
+                if item.error is None and item.keyword not in failed and item.page:
+                    try:
+                        item.page = enrich(item.keyword, item.page)
+                    except Exception as e:
+                        item.error = e
+                result_q.put(item)
+
+        searchers = [
+            threading.Thread(target=search_loop, name=f"search-{i}", daemon=True)
+            for i in range(self.search_workers)
+        ]
+        enrichers = [
+            threading.Thread(target=enrich_loop, name=f"enrich-{i}", daemon=True)
+            for i in range(self.enrich_workers)
+        ]
+        for t in searchers + enrichers:
+            t.start()
+
+        states: Dict[str, _KeywordState] = {}
+        while pending_keywords:
+            item = result_q.get()
+            state = states.setdefault(item.keyword, _KeywordState())
+            state.buffered[item.seq] = item
+            # Deliver this keyword's pages strictly in order.
+            while state.next_seq in state.buffered:
+                ready = state.buffered.pop(state.next_seq)
+                state.next_seq += 1
+                with slots_lock:
+                    slots[ready.keyword].release()
+                if ready.is_last:
+                    pending_keywords -= 1
+                if state.failed:
+                    continue
+                try:
+                    if ready.error is not None:
+                        raise ready.error
+                    on_page(ready.keyword, ready.page or [], ready.cursor, ready.size)
+                    if ready.is_last:
+                        on_keyword_done(ready.keyword)
+                except Exception as e:
+                    state.failed = True
+                    failed.add(ready.keyword)
+                    logger.error(
+                        "Failed to collect channels for keyword '%s': %s",
+                        ready.keyword,
+                        e,
+                        exc_info=e,
+                    )
+
+        for t in searchers:
+            t.join()
+        for _ in enrichers:
+            work_q.put(_STOP)
+        for t in enrichers:
+            t.join()
@@ -0,0 +1,251 @@
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is +Inf.
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    """Fixed-bucket latency histogram (Prometheus style) with sum, count and max."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def merge(self, other: "Histogram") -> None:
+        """Add ``other``'s observations (same buckets) to this histogram."""
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation inside its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for i, n in enumerate(self.counts):
+            upper = self.buckets[i] if i < len(self.buckets) else self.max
+            if n and seen + n >= rank:
+                return min(lower + (upper - lower) * (rank - seen) / n, self.max)
+            seen += n
+            lower = upper
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        cumulative = 0
+        buckets: Dict[str, int] = {}
+        for i, n in enumerate(self.counts):
+            cumulative += n
+            buckets[str(self.buckets[i]) if i < len(self.buckets) else "+Inf"] = cumulative
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "p50": round(self.quantile(0.5), 6),
+            "p90": round(self.quantile(0.9), 6),
+            "p99": round(self.quantile(0.99), 6),
+            "max": round(self.max, 6),
+            "buckets": buckets,
+        }
+
+class _EndpointStats:
+    def __init__(self) -> None:
+        self.latency = Histogram()
+        self.statuses: Dict[str, int] = {}
+        self.bytes = 0
+        self.errors = 0
+        self.retries = 0
+        self.throttled = 0
+        self.cache_hits = 0
+        self.not_modified = 0
+
+class RunMetrics:
+    """
+    Thread-safe collector for one run: per-endpoint HTTP latency histograms,
+    status codes, retries, 429s and bytes received (fed by the request
+    handlers), plus wall-clock timers for the phases of a run (``phase``).
+    ``snapshot`` returns everything as a dict; ``write`` stores it as JSON and
+    optionally in the Prometheus text exposition format.
+    """
+
+    def __init__(self) -> None:
+        self.started_at = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self._endpoints: Dict[str, _EndpointStats] = {}
+        self._phases: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def _endpoint(self, endpoint: str) -> _EndpointStats:
+        endpoint = "/" + endpoint.strip("/")
+        stats = self._endpoints.get(endpoint)
+        if stats is None:
+            stats = self._endpoints[endpoint] = _EndpointStats()
+        return stats
+
+    def observe_request(self, endpoint: str, seconds: float, status: Optional[int], nbytes: int = 0) -> None:
+        """Record one HTTP attempt; ``status`` is None when it failed without a response."""
+        with self._lock:
+            stats = self._endpoint(endpoint)
+            stats.latency.observe(seconds)
+            stats.bytes += nbytes
+            if status is None:
+                stats.errors += 1
+            else:
+                key = str(status)
+                stats.statuses[key] = stats.statuses.get(key, 0) + 1
+                if status == 429:
+                    stats.throttled += 1
+
+    def record_retry(self, endpoint: str) -> None:
+        with self._lock:
+            self._endpoint(endpoint).retries += 1
+
+    def record_cache_hit(self, endpoint: str, revalidated: bool = False) -> None:
+        with self._lock:
+            stats = self._endpoint(endpoint)
+            if revalidated:
+                stats.not_modified += 1
+            else:
+                stats.cache_hits += 1
+
+    def observe_phase(self, name: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._phases.get(name)
+            if histogram is None:
+                histogram = self._phases[name] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as one occurrence of phase ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_phase(name, time.perf_counter() - start)
+
+    def snapshot(self, extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        with self._lock:
+            requests = {
+                endpoint: {
+                    "requests": stats.latency.count,
+                    "statuses": dict(stats.statuses),
+                    "errors": stats.errors,
+                    "retries": stats.retries,
+                    "throttled": stats.throttled,
+                    "cacheHits": stats.cache_hits,
+                    "notModified": stats.not_modified,
+                    "bytes": stats.bytes,
+                    "latencySeconds": stats.latency.summary(),
+                }
+                for endpoint, stats in sorted(self._endpoints.items())
+            }
+            phases = {name: histogram.summary() for name, histogram in sorted(self._phases.items())}
+            overall = Histogram()
+            for stats in self._endpoints.values():
+                overall.merge(stats.latency)
+
+        snapshot: Dict[str, Any] = {
+            "startedAt": self.started_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "durationSeconds": round(time.perf_counter() - self._start, 3),
+            "totals": {
+                key: sum(r[key] for r in requests.values())
+                for key in ("requests", "errors", "retries", "throttled", "cacheHits", "notModified", "bytes")
+            },
+            "latencySeconds": overall.summary(),
+            "requests": requests,
+            "phases": phases,
+        }
+        if extra:
+            snapshot.update(extra)
+        return snapshot
+
+    def to_prometheus(self, prefix: str = "twitch_scraper") -> str:
+        """Render the collected metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+
+        def histogram_lines(name: str, label: str, histograms: Dict[str, Histogram]) -> None:
+            lines.append(f"# TYPE {name} histogram")
+            for key, histogram in histograms.items():
+                cumulative = 0
+                for i, n in enumerate(histogram.counts):
+                    cumulative += n
+                    le = str(histogram.buckets[i]) if i < len(histogram.buckets) else "+Inf"
+                    lines.append(f'{name}_bucket{{{label}="{key}",le="{le}"}} {cumulative}')
+                lines.append(f'{name}_sum{{{label}="{key}"}} {histogram.sum:.6f}')
+                lines.append(f'{name}_count{{{label}="{key}"}} {histogram.count}')
+
+        def counter_lines(name: str, values: Dict[str, int]) -> None:
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in values.items():
+                lines.append(f"{name}{{{labels}}} {value}")
+
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            histogram_lines(
+                f"{prefix}_request_duration_seconds",
+                "endpoint",
+                {endpoint: stats.latency for endpoint, stats in endpoints},
+            )
+            counter_lines(
+                f"{prefix}_responses_total",
+                {
+                    f'endpoint="{endpoint}",status="{status}"': n
+                    for endpoint, stats in endpoints
+                    for status, n in sorted(stats.statuses.items())
+                },
+            )
+            for metric, attr in (
+                ("request_errors_total", "errors"),
+                ("retries_total", "retries"),
+                ("throttled_total", "throttled"),
+                ("cache_hits_total", "cache_hits"),
+                ("not_modified_total", "not_modified"),
+                ("response_bytes_total", "bytes"),
+            ):
+                counter_lines(
+                    f"{prefix}_{metric}",
+                    {f'endpoint="{endpoint}"': getattr(stats, attr) for endpoint, stats in endpoints},
+                )
+            histogram_lines(f"{prefix}_phase_duration_seconds", "phase", dict(sorted(self._phases.items())))
+        return "\n".join(lines) + "\n"
+
+    def write(
+        self,
+        json_path: Optional[Path],
+        prometheus_path: Optional[Path] = None,
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        if json_path is not None:
+            json_path.parent.mkdir(parents=True, exist_ok=True)
+            with json_path.open("w", encoding="utf-8") as f:
+                json.dump(self.snapshot(extra), f, ensure_ascii=False, indent=4)
+        if prometheus_path is not None:
+            prometheus_path.parent.mkdir(parents=True, exist_ok=True)
+            prometheus_path.write_text(self.to_prometheus(), encoding="utf-8")
+
+def timed(metrics: Optional[RunMetrics], name: str) -> ContextManager[None]:
+    """``metrics.phase(name)``, or a no-op when metrics are disabled."""
+    return metrics.phase(name) if metrics is not None else nullcontext()
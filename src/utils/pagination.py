@@ -3,6 +3,7 @@ from typing import Any, Callable, Dict, Generator, List, Optional
 def paginate(
     fetch_page: Callable[[Optional[str]], Dict[str, Any]],
     max_items: Optional[int] = None,
+    start_cursor: Optional[str] = None,
 ) -> Generator[List[Dict[str, Any]], None, None]:
     """
     Generic cursor-based pagination helper.
@@ -10,9 +11,10 @@ def paginate(
     :param fetch_page: Function that accepts an optional cursor string and returns a
                        Twitch-style response with "data" and optional "pagination.cursor".
     :param max_items: Optional maximum number of items to return across all pages.
+    :param start_cursor: Optional cursor to resume pagination from.
     :yield: Lists of items from each page.
     """
-    cursor: Optional[str] = None
+    cursor: Optional[str] = start_cursor
     total_returned = 0
 
     while True:
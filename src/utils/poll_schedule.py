@@ -0,0 +1,103 @@
+import heapq
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+class AdaptivePollSchedule:
+    """
+    Per-channel poll timetable for watch mode.
+
+    Live channels are polled every ``live_interval`` seconds. Every poll that
+    finds a channel offline multiplies its interval by ``backoff``, starting
+    from ``offline_interval`` and capped at ``max_interval``, so channels that
+    stay dark are checked less and less; going live resets a channel to the
+    fast interval.
+
+    ``due`` fills each batch up to ``batch_size`` with channels that are due
+    soonest, because one batched /streams request costs the same for 1 or 100
+    ids. Only channels within ``pad_fraction`` of their interval from being due
+    are polled early, and an early poll that finds a channel offline does not
+    advance its backoff. Each returned channel goes back on the timetable
+    through ``record`` or, when the poll failed, ``postpone``.
+    """
+
+    def __init__(
+        self,
+        channel_ids: Iterable[str],
+        live_interval: float = 30.0,
+        offline_interval: float = 120.0,
+        max_interval: float = 1800.0,
+        backoff: float = 2.0,
+        pad_fraction: float = 0.5,
+    ) -> None:
+        self.live_interval = max(1.0, live_interval)
+        self.offline_interval = max(self.live_interval, offline_interval)
+        self.max_interval = max(self.offline_interval, max_interval)
+        self.backoff = max(1.0, backoff)
+        self.pad_fraction = min(max(0.0, pad_fraction), 1.0)
+        self._intervals: Dict[str, float] = {}
+        self._live: Dict[str, bool] = {}
+        self._heap: List[Tuple[float, str]] = []
+        # Channels handed out by due() before they were due.
+        self._early: Set[str] = set()
+        now = time.monotonic()
+        for channel_id in dict.fromkeys(channel_ids):
+            self._intervals[channel_id] = self.live_interval
+            self._live[channel_id] = False
+            heapq.heappush(self._heap, (now, channel_id))
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    def next_due_in(self, now: Optional[float] = None) -> float:
+        """Seconds until the next channel is due (0 if one is overdue)."""
+        if not self._heap:
+            return self.max_interval
+        now = time.monotonic() if now is None else now
+        return max(0.0, self._heap[0][0] - now)
+
+    def due(self, batch_size: int = 100, now: Optional[float] = None) -> List[str]:
+        """
+        Pop every channel that is due, rounded up towards a multiple of
+        ``batch_size`` with the channels due next that are within ``pad_fraction``
+        of their interval. Callers must ``record`` or ``postpone`` each returned id.
+        """
+        now = time.monotonic() if now is None else now
+        ids: List[str] = []
+        while self._heap:
+            due_at, channel_id = self._heap[0]
+            if due_at > now:
+                interval = self._intervals.get(channel_id, self.live_interval)
+                if not (ids and len(ids) % batch_size) or due_at - now > self.pad_fraction * interval:
+                    break
+                self._early.add(channel_id)
+            heapq.heappop(self._heap)
+            ids.append(channel_id)
+        return ids
+
+    def is_live(self, channel_id: str) -> bool:
+        return self._live.get(channel_id, False)
+
+    def postpone(self, channel_id: str, delay: float, now: Optional[float] = None) -> None:
+        """Put a due channel back without a poll result (e.g. the request failed)."""
+        now = time.monotonic() if now is None else now
+        self._early.discard(channel_id)
+        heapq.heappush(self._heap, (now + delay, channel_id))
+
+    def record(self, channel_id: str, live: bool, now: Optional[float] = None) -> None:
+        """Store a poll result and schedule the channel's next poll."""
+        now = time.monotonic() if now is None else now
+        early = channel_id in self._early
+        self._early.discard(channel_id)
+        previous = self._intervals.get(channel_id, self.live_interval)
+        if live:
+            interval = self.live_interval
+        elif self._live.get(channel_id, True) or previous < self.offline_interval:
+            interval = self.offline_interval
+        elif early:
+            # Polled only to fill a batch; it says nothing about how long the channel has been dark.
+            interval = previous
+        else:
+            interval = min(previous * self.backoff, self.max_interval)
+        self._intervals[channel_id] = interval
+        self._live[channel_id] = live
+        heapq.heappush(self._heap, (now + interval, channel_id))
@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import time
+from typing import Mapping, Optional
+
+def _header_float(headers: Mapping[str, str], name: str) -> Optional[float]:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def retry_delay_from_headers(
+    headers: Mapping[str, str],
+    backoff: float,
+    max_delay: float,
+) -> float:
+    """
+    Work out how long to wait after a 429.
+
+    Prefers ``Retry-After``, then Helix's ``Ratelimit-Reset`` (epoch seconds at
+    which the bucket is full again), and finally falls back to ``backoff``. The
+    result is always clamped to ``[0, max_delay]``.
+    """
+    delay = _header_float(headers, "Retry-After")
+    if delay is None:
+        reset_at = _header_float(headers, "Ratelimit-Reset")
+        if reset_at is not None:
+            delay = reset_at - time.time()
+    if delay is None:
+        delay = backoff
+    return min(max(delay, 0.0), max_delay)
+
+class TokenBucketRateLimiter:
+    """
+    Client-side token bucket shared by every thread or coroutine using a handler.
+
+    Each request reserves one token up front. When the bucket is empty the
+    reservation goes into debt and the caller sleeps until its token has been
+    refilled, which spaces concurrent callers evenly instead of letting them
+    stampede into a 429 together. The bucket is re-synchronised from Helix's
+    ``Ratelimit-Limit`` / ``Ratelimit-Remaining`` headers on every response.
+
+    ``share`` is the fraction of the client id's limit this bucket may use, for
+    processes that split one client id between them; it scales both
+    ``capacity`` and the limit reported by Helix.
+    """
+
+    def __init__(self, capacity: float = 800.0, window_seconds: float = 60.0, share: float = 1.0) -> None:
+        self.window_seconds = window_seconds
+        self.share = min(max(share, 0.0), 1.0) or 1.0
+        self.capacity = float(capacity) * self.share
+        self.rate = self.capacity / window_seconds
+        self.tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self._updated_at = now
+
+    def _reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1.0
+            wait = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+            return max(wait, self._blocked_until - now)
+
+    def acquire(self) -> None:
+        """Block the calling thread until a request may be sent."""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """Coroutine-friendly variant of acquire()."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def headroom(self) -> float:
+        """Tokens available right now; negative while in debt or blocked after a 429."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self._blocked_until > now:
+                return -(self._blocked_until - now) * self.rate
+            return self.tokens
+
+    def block_for(self, seconds: float) -> None:
+        """Hold back every caller for ``seconds`` (used after a 429)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        limit = _header_float(headers, "Ratelimit-Limit")
+        remaining = _header_float(headers, "Ratelimit-Remaining")
+        if limit is None and remaining is None:
+            return
+
+        if limit is not None:
+            limit *= self.share
+        with self._lock:
+            self._refill(time.monotonic())
+            if limit is not None and limit > 0 and limit != self.capacity:
+                self.capacity = limit
+                self.rate = limit / self.window_seconds
+                self.tokens = min(self.tokens, self.capacity)
+            if remaining is not None:
+                # The server count is authoritative, but never hand back tokens
+                # that in-flight reservations have already spent.
+                self.tokens = min(self.tokens, remaining)
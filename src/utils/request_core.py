@@ -0,0 +1,195 @@
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from . import serialization
+from .credentials import Credential, CredentialPool
+from .metrics import RunMetrics
+from .rate_limiter import TokenBucketRateLimiter, retry_delay_from_headers
+from .response_archive import ResponseArchive
+from .response_cache import CachedResponse, ResponseCache
+
+# What a handler does with a response (see RequestCore._classify).
+DONE = "done"
+RATE_LIMITED = "rate_limited"
+UNAUTHORIZED = "unauthorized"
+RETRY = "retry"
+
+@dataclass
+class RequestState:
+    """Progress of one logical GET across its attempts."""
+
+    path: str
+    params: Optional[Dict[str, Any]]
+    url: str
+    cached: Optional[CachedResponse] = None
+    attempt: int = 0
+    backoff: float = 1.0
+    token_refreshed: bool = False
+
+    def extra_headers(self) -> Optional[Dict[str, str]]:
+        if self.cached is not None and self.cached.etag:
+            return {"If-None-Match": self.cached.etag}
+        return None
+
+class RequestCore:
+    """
+    Transport-independent half of the Helix request handlers: configuration,
+    cache lookups, response classification (429 / 401 / 304 / 2xx) and the
+    retry, metrics and archive bookkeeping. RequestHandler and
+    AsyncRequestHandler only send the requests and sleep.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        client_id: str,
+        access_token: str,
+        max_retries: int = 3,
+        timeout: float = 15.0,
+        pool_size: int = 10,
+        rate_limiter: Optional[TokenBucketRateLimiter] = None,
+        max_backoff: float = 60.0,
+        cache: Optional[ResponseCache] = None,
+        metrics: Optional[RunMetrics] = None,
+        credentials: Optional[CredentialPool] = None,
+        archive: Optional[ResponseArchive] = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.client_id = client_id
+        self.access_token = access_token
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.rate_limiter = rate_limiter
+        self.max_backoff = max_backoff
+        self.cache = cache
+        self.metrics = metrics
+        self.archive = archive
+        # A single-credential pool when none is given, so every request goes through the pool.
+        self.credentials = credentials or CredentialPool(
+            [Credential(client_id, access_token, rate_limiter=rate_limiter)]
+        )
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def _headers(self, credential: Credential, extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        headers = credential.headers()
+        if extra:
+            headers.update(extra)
+        return headers
+
+    def _replayed(self, path: str, params: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """The archived answer when replaying (no network at all), else None."""
+        if self.archive is not None and self.archive.replaying:
+            return self.archive.replay(path, params)
+        return None
+
+    def _record(self, path: str, params: Optional[Dict[str, Any]], body: Dict[str, Any]) -> Dict[str, Any]:
+        if self.archive is not None and body:
+            self.archive.record(path, params, body)
+        return body
+
+    def _start(self, path: str, params: Optional[Dict[str, Any]]) -> Tuple[RequestState, Optional[Dict[str, Any]]]:
+        """
+        Begin a GET: returns its state and, for a fresh cache hit, the cached
+        body (no request needed).
+        """
+        state = RequestState(path, params, f"{self.base_url}/{path.lstrip('/')}")
+        state.cached = self.cache.lookup(path, params) if self.cache is not None else None
+        if state.cached is not None and state.cached.fresh:
+            if self.metrics is not None:
+                self.metrics.record_cache_hit(path)
+            return state, state.cached.body
+        return state, None
+
+    def _observe(self, state: RequestState, seconds: float, status: Optional[int], nbytes: int = 0) -> None:
+        if self.metrics is not None:
+            self.metrics.observe_request(state.path, seconds, status, nbytes)
+
+    def _classify(
+        self,
+        state: RequestState,
+        credential: Credential,
+        status: int,
+        headers: Mapping[str, str],
+        payload: bytes,
+    ) -> Tuple[str, Any]:
+        """
+        Decide what to do with a response. Returns ``(DONE, body)``,
+        ``(RATE_LIMITED, seconds to sleep)``, ``(UNAUTHORIZED, None)`` when the
+        token should be refreshed, or ``(RETRY, None)``.
+        """
+        credential.update_from_headers(headers)
+
+        if status == 429:
+            # Rate limited; hold back every caller of this credential until
+            # Retry-After / Ratelimit-Reset. With other credentials in the pool the
+            # retry is routed elsewhere instead of sleeping here.
+            delay = retry_delay_from_headers(headers, state.backoff, self.max_backoff)
+            credential.block_for(delay)
+            if self.metrics is not None:
+                self.metrics.record_retry(state.path)
+            state.backoff = min(state.backoff * 2, self.max_backoff)
+            if len(self.credentials) == 1:
+                self.logger.warning("Rate limited by Twitch, sleeping for %.2fs", delay)
+                return RATE_LIMITED, delay
+            self.logger.warning("Client %s rate limited for %.2fs", credential.client_id, delay)
+            return RATE_LIMITED, 0.0
+
+        # One token refresh per request, on top of the retry budget: a refreshed
+        # token is expected to work, so even maxRetries=1 gets that retry.
+        if status == 401 and not state.token_refreshed:
+            return UNAUTHORIZED, None
+
+        if status == 304 and state.cached is not None and self.cache is not None:
+            self.cache.refresh(state.path, state.params)
+            if self.metrics is not None:
+                self.metrics.record_cache_hit(state.path, revalidated=True)
+            return DONE, state.cached.body
+
+        if 200 <= status < 300:
+            try:
+                body = serialization.loads(payload)
+            except ValueError:
+                self.logger.error("Failed to decode JSON from %s", state.url)
+                return DONE, {}
+            if self.cache is not None and isinstance(body, dict):
+                self.cache.store(state.path, state.params, body, etag=headers.get("ETag"))
+            return DONE, body
+
+        self.logger.warning(
+            "Unexpected status from %s: %d %s",
+            state.url,
+            status,
+            payload[:200].decode("utf-8", "replace"),
+        )
+        return RETRY, None
+
+    def _after_refresh(self, state: RequestState, credential: Credential, refreshed: bool) -> bool:
+        """Log the outcome of a token refresh after a 401; True to retry straight away."""
+        state.token_refreshed = True
+        if not refreshed:
+            self.logger.warning("Unauthorized response from %s for client %s", state.url, credential.client_id)
+            return False
+        self.logger.info("Token for client %s rejected; retrying with a new one", credential.client_id)
+        if self.metrics is not None:
+            self.metrics.record_retry(state.path)
+        # The retry does not use up the retry budget.
+        state.attempt -= 1
+        return True
+
+    def _next_backoff(self, state: RequestState) -> Optional[float]:
+        """Seconds to wait before the next attempt, or None once retries are exhausted."""
+        if state.attempt >= self.max_retries:
+            self.logger.error(
+                "Exceeded max retries (%d) for %s. Returning empty result.",
+                self.max_retries,
+                state.url,
+            )
+            return None
+        sleep_for = state.backoff
+        self.logger.info("Retrying %s in %.2fs...", state.url, sleep_for)
+        if self.metrics is not None:
+            self.metrics.record_retry(state.path)
+        state.backoff = min(state.backoff * 2, self.max_backoff)
+        return sleep_for
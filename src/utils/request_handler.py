@@ -1,12 +1,22 @@
-import logging
 import time
 from typing import Any, Dict, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
-class RequestHandler:
+from .credentials import CredentialPool
+from .metrics import RunMetrics
+from .rate_limiter import TokenBucketRateLimiter
+from .request_core import DONE, RATE_LIMITED, UNAUTHORIZED, RequestCore
+from .response_archive import ResponseArchive
+from .response_cache import ResponseCache
+
+class RequestHandler(RequestCore):
     """
     Thin wrapper around requests to call the Twitch Helix API with retries and logging.
+
+    A single pooled ``requests.Session`` is kept for the lifetime of the handler so
+    connections (and their TLS sessions) are reused across calls and threads.
     """
 
     def __init__(
@@ -16,72 +26,92 @@ class RequestHandler:
         access_token: str,
         max_retries: int = 3,
         timeout: float = 15.0,
+        pool_size: int = 10,
+        rate_limiter: Optional[TokenBucketRateLimiter] = None,
+        max_backoff: float = 60.0,
+        cache: Optional[ResponseCache] = None,
+        metrics: Optional[RunMetrics] = None,
+        credentials: Optional[CredentialPool] = None,
+        archive: Optional[ResponseArchive] = None,
     ) -> None:
-        self.base_url = base_url.rstrip("/")
-        self.client_id = client_id
-        self.access_token = access_token
-        self.max_retries = max_retries
-        self.timeout = timeout
-        self.logger = logging.getLogger(self.__class__.__name__)
+        super().__init__(
+            base_url,
+            client_id,
+            access_token,
+            max_retries=max_retries,
+            timeout=timeout,
+            pool_size=pool_size,
+            rate_limiter=rate_limiter,
+            max_backoff=max_backoff,
+            cache=cache,
+            metrics=metrics,
+            credentials=credentials,
+            archive=archive,
+        )
+        self.session = self._build_session()
+
+    def _build_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
 
-    def _headers(self, extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
-        headers: Dict[str, str] = {
-            "Client-Id": self.client_id,
-            "Authorization": f"Bearer {self.access_token}",
-        }
-        if extra:
-            headers.update(extra)
-        return headers
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "RequestHandler":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
     def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        url = f"{self.base_url}/{path.lstrip('/')}"
-        attempt = 0
-        backoff = 1.0
+        replayed = self._replayed(path, params)
+        if replayed is not None:
+            return replayed
+        return self._record(path, params, self._get(path, params))
+
+    def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        state, cached_body = self._start(path, params)
+        if cached_body is not None:
+            return cached_body
 
         while True:
-            attempt += 1
+            state.attempt += 1
             try:
-                self.logger.debug("GET %s params=%s attempt=%d", url, params, attempt)
-                resp = requests.get(
-                    url,
-                    headers=self._headers(),
-                    params=params,
-                    timeout=self.timeout,
-                )
-                if resp.status_code == 429:
-                    # Rate limited; respect Retry-After if provided
-                    retry_after = resp.headers.get("Retry-After")
-                    delay = float(retry_after) if retry_after else backoff
-                    self.logger.warning("Rate limited by Twitch, sleeping for %.2fs", delay)
-                    time.sleep(delay)
-                    backoff *= 2
-                    continue
-
-                if 200 <= resp.status_code < 300:
-                    try:
-                        return resp.json()
-                    except ValueError:
-                        self.logger.error("Failed to decode JSON from %s", url)
-                        return {}
+                self.logger.debug("GET %s params=%s attempt=%d", state.url, params, state.attempt)
+                credential = self.credentials.acquire()
+                token = credential.access_token
+                started = time.perf_counter()
+                try:
+                    resp = self.session.get(
+                        state.url,
+                        headers=self._headers(credential, state.extra_headers()),
+                        params=params,
+                        timeout=self.timeout,
+                    )
+                except requests.RequestException:
+                    self._observe(state, time.perf_counter() - started, None)
+                    raise
+                self._observe(state, time.perf_counter() - started, resp.status_code, len(resp.content))
 
-                self.logger.warning(
-                    "Unexpected status from %s: %d %s",
-                    url,
-                    resp.status_code,
-                    resp.text[:200],
-                )
+                action, value = self._classify(state, credential, resp.status_code, resp.headers, resp.content)
+                if action == DONE:
+                    return value
+                if action == RATE_LIMITED:
+                    if value:
+                        time.sleep(value)
+                    continue
+                # Expired or revoked app token: issue a new one and retry straight away.
+                if action == UNAUTHORIZED and self._after_refresh(
+                    state, credential, self.credentials.refresh(credential, token)
+                ):
+                    continue
             except requests.RequestException as exc:
-                self.logger.warning("Request error calling %s: %s", url, exc)
+                self.logger.warning("Request error calling %s: %s", state.url, exc)
 
-            if attempt >= self.max_retries:
-                self.logger.error(
-                    "Exceeded max retries (%d) for %s. Returning empty result.",
-                    self.max_retries,
-                    url,
-                )
+            sleep_for = self._next_backoff(state)
+            if sleep_for is None:
                 return {}
-
-            sleep_for = backoff
-            self.logger.info("Retrying %s in %.2fs...", url, sleep_for)
             time.sleep(sleep_for)
-            backoff *= 2
\ No newline at end of file
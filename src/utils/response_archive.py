@@ -0,0 +1,135 @@
+import gzip
+import io
+import logging
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None  # type: ignore
+
+from . import serialization
+from .response_cache import cache_key
+
+logger = logging.getLogger(__name__)
+
+def _compression_for(path: Path) -> Optional[str]:
+    if path.suffix == ".gz":
+        return "gzip"
+    if path.suffix == ".zst":
+        if zstandard is None:
+            raise ImportError("zstd archives require zstandard. Install it with 'pip install zstandard'.")
+        return "zstd"
+    return None
+
+def _open_archive(path: Path, mode: str) -> IO[str]:
+    """Open the archive for reading ("r") or appending ("a"), compressed according to its suffix."""
+    compression = _compression_for(path)
+    if compression == "gzip":
+        return gzip.open(path, mode + "t", encoding="utf-8")  # type: ignore[return-value]
+    if compression == "zstd":
+        raw = path.open(mode + "b")
+        if mode == "r":
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+        else:
+            stream = zstandard.ZstdCompressor().stream_writer(raw)
+        return io.TextIOWrapper(stream, encoding="utf-8")  # type: ignore[arg-type]
+    return path.open(mode, encoding="utf-8")
+
+class ResponseArchive:
+    """
+    Append-only archive of raw Helix responses, one NDJSON line per response
+    (``ts``, ``path``, ``params``, ``body``), gzip or zstd compressed by suffix.
+
+    In record mode the handlers append every response they hand back, including
+    cache hits. In replay mode the archive answers the handlers instead of the
+    network: responses are looked up by path + params and returned in recorded
+    order (the last one repeats), and requests that were never recorded get an
+    empty result. Each run appends a new compressed stream, which both gzip and
+    zstd readers concatenate. Safe to share between threads.
+    """
+
+    def __init__(self, path: Path, replay: bool = False) -> None:
+        self.path = Path(path)
+        self.replaying = replay
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._fh: Optional[IO[str]] = None
+        # Replay: request key -> archived lines (decoded on use) and the next one to hand out.
+        self._responses: Dict[str, List[str]] = {}
+        self._positions: Dict[str, int] = {}
+
+        if replay:
+            self._load()
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = _open_archive(self.path, "a")
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            raise FileNotFoundError(f"Response archive {self.path} does not exist")
+        entries = 0
+        try:
+            with _open_archive(self.path, "r") as f:
+                for line_no, line in enumerate(f, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = serialization.loads(line)
+                    except ValueError:
+                        logger.warning("Skipping malformed line %d in %s", line_no, self.path)
+                        continue
+                    key = cache_key(entry.get("path", ""), entry.get("params"))
+                    self._responses.setdefault(key, []).append(line)
+                    entries += 1
+        except (EOFError, zlib.error, gzip.BadGzipFile) as exc:
+            # The recording process was killed mid-write; keep what was readable.
+            logger.warning("Response archive %s ends early (%s); replaying %d responses", self.path, exc, entries)
+        logger.info("Loaded %d responses for %d requests from %s", entries, len(self._responses), self.path)
+
+    def record(self, path: str, params: Optional[Dict[str, Any]], body: Dict[str, Any]) -> None:
+        line = serialization.dumps(
+            {"ts": round(time.time(), 3), "path": path, "params": params or {}, "body": body}
+        )
+        with self._lock:
+            if self._fh is None:
+                return
+            self._fh.write(line)
+            self._fh.write("\n")
+            self.recorded += 1
+
+    def replay(self, path: str, params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        key = cache_key(path, params)
+        with self._lock:
+            bodies = self._responses.get(key)
+            if not bodies:
+                self.misses += 1
+                logger.debug("No archived response for %s params=%s", path, params)
+                return {}
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            self.replayed += 1
+            line = bodies[min(position, len(bodies) - 1)]
+        return serialization.loads(line).get("body") or {}
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+    def stats(self) -> Dict[str, int]:
+        if self.replaying:
+            return {"replayed": self.replayed, "misses": self.misses}
+        return {"recorded": self.recorded}
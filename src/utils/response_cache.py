@@ -0,0 +1,210 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from . import serialization
+
+# Sensible defaults for how long each Helix endpoint's answer stays useful.
+# Endpoints not listed here (and a TTL of 0) are never cached.
+DEFAULT_TTLS: Dict[str, float] = {
+    "/streams": 60,
+    "/users": 86400,
+    "/videos": 3600,
+    "/clips": 3600,
+    "/schedule": 21600,
+}
+
+# Fresh hits only bump last_access (for LRU eviction); those updates are kept in
+# memory and written in one transaction once this many have piled up.
+_TOUCH_BATCH = 256
+
+@dataclass
+class CachedResponse:
+    body: Dict[str, Any]
+    etag: Optional[str]
+    fresh: bool
+
+def _normalize_path(path: str) -> str:
+    return "/" + path.strip("/")
+
+def cache_key(path: str, params: Optional[Dict[str, Any]]) -> str:
+    """
+    Stable key for a GET request: the path plus its params with keys sorted and
+    list values kept in order (they are order-sensitive for batched lookups).
+    """
+    items = sorted((params or {}).items())
+    raw = json.dumps([_normalize_path(path), items], default=str, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """
+    On-disk (SQLite) cache of decoded Helix responses keyed by path + params.
+
+    Entries expire after a per-endpoint TTL. Expired entries that carry an ETag
+    are kept so the handler can revalidate them with If-None-Match. The store is
+    bounded by ``max_bytes`` and evicts least recently used entries first; the
+    access times of cache hits are written back in batches, so a hit is a read
+    only. Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        ttls: Optional[Dict[str, float]] = None,
+        max_bytes: int = 256 * 1024 * 1024,
+    ) -> None:
+        self.path = Path(path)
+        self.ttls = {_normalize_path(k): float(v) for k, v in (ttls or DEFAULT_TTLS).items()}
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.evictions = 0
+        self._touched: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                body TEXT NOT NULL,
+                etag TEXT,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses(last_access)")
+        self._conn.commit()
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        self._total_bytes = int(row[0])
+
+    def ttl_for(self, path: str) -> float:
+        return self.ttls.get(_normalize_path(path), 0.0)
+
+    def lookup(self, path: str, params: Optional[Dict[str, Any]]) -> Optional[CachedResponse]:
+        """
+        Return the cached response (fresh or stale-with-ETag) or None. Fresh
+        entries count as hits; everything else counts as a miss.
+        """
+        if self.ttl_for(path) <= 0:
+            return None
+
+        key = cache_key(path, params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            body, etag, expires_at = row
+            fresh = expires_at > now
+            if fresh:
+                self.hits += 1
+                self._touched[key] = now
+                if len(self._touched) >= _TOUCH_BATCH:
+                    self._flush_touched_locked()
+                    self._conn.commit()
+            else:
+                self.misses += 1
+                if not etag:
+                    return None
+
+        try:
+            return CachedResponse(body=serialization.loads(body), etag=etag, fresh=fresh)
+        except ValueError:
+            return None
+
+    def store(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]],
+        body: Dict[str, Any],
+        etag: Optional[str] = None,
+    ) -> None:
+        ttl = self.ttl_for(path)
+        if ttl <= 0:
+            return
+
+        key = cache_key(path, params)
+        payload = serialization.dumps(body)
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            if old is not None:
+                self._total_bytes -= int(old[0])
+            self._touched.pop(key, None)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, path, body, etag, expires_at, last_access, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, _normalize_path(path), payload, etag, now + ttl, now, size),
+            )
+            self._total_bytes += size
+            self._evict_locked()
+            self._conn.commit()
+
+    def refresh(self, path: str, params: Optional[Dict[str, Any]]) -> None:
+        """Extend a stale entry's lifetime after a 304 Not Modified."""
+        key = cache_key(path, params)
+        now = time.time()
+        with self._lock:
+            self.revalidated += 1
+            self._touched.pop(key, None)
+            self._conn.execute(
+                "UPDATE responses SET expires_at = ?, last_access = ? WHERE key = ?",
+                (now + self.ttl_for(path), now, key),
+            )
+            self._conn.commit()
+
+    def _flush_touched_locked(self) -> None:
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE responses SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _evict_locked(self) -> None:
+        if self._total_bytes <= self.max_bytes:
+            return
+        self._flush_touched_locked()
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        ).fetchall()
+        for key, size in rows:
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._total_bytes -= int(size)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "evictions": self.evictions,
+            "bytes": self._total_bytes,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_touched_locked()
+            self._conn.commit()
+            self._conn.close()
@@ -0,0 +1,118 @@
+import json
+import logging
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("orjson", "msgspec", "json")
+
+def _reindent(data: bytes) -> bytes:
+    """
+    Turn orjson's two-space indentation into the four spaces json.dump(indent=4)
+    uses. JSON strings never contain raw newlines or NUL bytes, so every
+    newline-plus-spaces run is indentation; deepest levels are rewritten first
+    (to NUL placeholders) so shallower passes cannot match them again.
+    """
+    depth = 0
+    while b"\n" + b"  " * (depth + 1) in data:
+        depth += 1
+    for level in range(depth, 0, -1):
+        data = data.replace(b"\n" + b"  " * level, b"\n" + b"\0" * level)
+    return data.replace(b"\0", b"    ")
+
+def _json_loads(data: Union[str, bytes]) -> Any:
+    return json.loads(data)
+
+def _json_dumps(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+def _json_dumps_pretty(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, indent=4)
+
+def _orjson_loads(data: Union[str, bytes]) -> Any:
+    return orjson.loads(data)
+
+def _orjson_dumps(obj: Any) -> str:
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+def _orjson_dumps_pretty(obj: Any) -> str:
+    data = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2)
+    return _reindent(data).decode("utf-8")
+
+def _msgspec_loads(data: Union[str, bytes]) -> Any:
+    try:
+        return _msgspec_decoder.decode(data)
+    except msgspec.DecodeError as exc:
+        raise ValueError(str(exc)) from exc
+
+def _msgspec_dumps(obj: Any) -> str:
+    return _msgspec_encoder.encode(obj).decode("utf-8")
+
+def _msgspec_dumps_pretty(obj: Any) -> str:
+    return msgspec.json.format(_msgspec_encoder.encode(obj), indent=4).decode("utf-8")
+
+_msgspec_encoder = msgspec.json.Encoder() if msgspec is not None else None
+_msgspec_decoder = msgspec.json.Decoder() if msgspec is not None else None
+
+_IMPLEMENTATIONS = {
+    "orjson": (_orjson_loads, _orjson_dumps, _orjson_dumps_pretty),
+    "msgspec": (_msgspec_loads, _msgspec_dumps, _msgspec_dumps_pretty),
+    "json": (_json_loads, _json_dumps, _json_dumps_pretty),
+}
+
+def _available(backend: str) -> bool:
+    return {"orjson": orjson, "msgspec": msgspec, "json": json}[backend] is not None
+
+_backend = "json"
+_active = _IMPLEMENTATIONS["json"]
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Decode a JSON document (str or UTF-8 bytes). Raises ValueError on bad input."""
+    return _active[0](data)
+
+def dumps(obj: Any) -> str:
+    """Compact single-line JSON (no ASCII escaping), as written to NDJSON files."""
+    return _active[1](obj)
+
+def dumps_pretty(obj: Any) -> str:
+    """JSON indented by four spaces, laid out like json.dump(indent=4)."""
+    return _active[2](obj)
+
+def configure(backend: str = "auto") -> str:
+    """
+    Select the JSON backend used by loads/dumps: "orjson", "msgspec", "json"
+    (stdlib) or "auto" for the fastest one installed. An explicitly requested
+    backend that is not installed falls back to auto with a warning. Returns the
+    backend in use.
+
+    The backends write equivalent JSON (same values, same layout), not always
+    the same bytes: float exponents differ, e.g. orjson writes ``1e20`` where
+    json writes ``1e+20``.
+    """
+    global _active, _backend
+    backend = (backend or "auto").lower()
+    if backend != "auto" and backend not in BACKENDS:
+        raise ValueError(f"Unknown JSON backend '{backend}' (expected auto, {', '.join(BACKENDS)})")
+    if backend != "auto" and not _available(backend):
+        logger.warning("JSON backend %s is not installed (pip install %s); choosing automatically", backend, backend)
+        backend = "auto"
+    if backend == "auto":
+        backend = next(name for name in BACKENDS if _available(name))
+    _backend = backend
+    _active = _IMPLEMENTATIONS[backend]
+    return backend
+
+def backend_name() -> str:
+    return _backend
+
+configure()
@@ -0,0 +1,39 @@
+import hashlib
+from pathlib import Path
+from typing import List, Tuple
+
+def shard_of(key: str, shard_count: int) -> int:
+    """
+    Stable shard number for ``key``. Uses a content hash rather than ``hash()``
+    so every process and machine agrees on the assignment.
+    """
+    digest = hashlib.md5(key.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % shard_count
+
+def select_shard(keys: List[str], shard_index: int, shard_count: int) -> List[str]:
+    """Return the subset of ``keys`` owned by ``shard_index``, keeping their order."""
+    return [key for key in keys if shard_of(key, shard_count) == shard_index]
+
+def parse_shard_spec(spec: str) -> Tuple[int, int]:
+    """
+    Parse an ``"index/count"`` shard spec such as ``"0/4"`` (indexes are 0-based).
+    """
+    try:
+        index_text, count_text = spec.split("/", 1)
+        index, count = int(index_text), int(count_text)
+    except ValueError:
+        raise ValueError(f"Invalid shard spec '{spec}', expected INDEX/COUNT such as 0/4")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard spec '{spec}', index must be in [0, {max(count, 1) - 1}]")
+    return index, count
+
+def shard_path(path: Path, shard_index: int, shard_count: int) -> Path:
+    """
+    Per-shard variant of an output path:
+    ``data/output.jsonl`` -> ``data/output.shard-0-of-4.jsonl``.
+    Compound suffixes such as ``.jsonl.gz`` are preserved.
+    """
+    path = Path(path)
+    suffixes = "".join(path.suffixes)
+    stem = path.name[: len(path.name) - len(suffixes)] if suffixes else path.name
+    return path.with_name(f"{stem}.shard-{shard_index}-of-{shard_count}{suffixes}")
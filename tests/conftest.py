@@ -0,0 +1,55 @@
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+for directory in (REPO_ROOT / "src", REPO_ROOT / "benchmarks"):
+    if str(directory) not in sys.path:
+        sys.path.insert(0, str(directory))
+
+from mock_helix import MockHelixConfig, MockHelixServer  # noqa: E402
+
+@pytest.fixture(scope="session")
+def mock_helix() -> Iterator[MockHelixServer]:
+    """A fast, deterministic local Helix server shared by the whole test session."""
+    config = MockHelixConfig(channels=200, results_per_keyword=40, latency_ms=0.0, jitter_ms=0.0)
+    with MockHelixServer(config) as server:
+        yield server
+
+@pytest.fixture
+def helix(mock_helix: MockHelixServer) -> MockHelixServer:
+    """The shared mock server with its request counters reset for this test."""
+    mock_helix.reset_stats()
+    return mock_helix
+
+@pytest.fixture
+def scrape_settings(helix: MockHelixServer, tmp_path: Path) -> Dict[str, Any]:
+    """
+    run_scrape settings pointed at the mock server, with every run file under
+    ``tmp_path`` and the optional stores turned off.
+    """
+    with (REPO_ROOT / "src" / "config" / "settings.example.json").open("r", encoding="utf-8") as f:
+        settings: Dict[str, Any] = json.load(f)
+    keywords_file = tmp_path / "keywords.txt"
+    keywords_file.write_text("alpha\nbeta\ngamma\n", encoding="utf-8")
+    settings.update(
+        {
+            "clientId": "test",
+            "accessToken": "test",
+            "baseUrl": helix.base_url,
+            "keywordsFile": str(keywords_file),
+            "outputFile": str(tmp_path / "output.json"),
+            "streamOutputFile": str(tmp_path / "output.jsonl"),
+            "checkpointFile": str(tmp_path / "checkpoint.jsonl"),
+            "metricsFile": None,
+            "prometheusMetricsFile": None,
+            "responseCacheFile": None,
+            "maxChannelsPerKeyword": 30,
+            "rateLimitPerMinute": 0,
+            "logLevel": "WARNING",
+        }
+    )
+    return settings
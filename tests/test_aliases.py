@@ -0,0 +1,159 @@
+import itertools
+import random
+from typing import Any, Dict, List, Optional
+
+from extractors.aliases import AliasResolver
+from extractors.channel_parser import build_channel_record
+from extractors.stream_parser import parse_stream, parse_streams
+
+# Reference copies of the per-field parsers the alias tables replaced; the
+# resolved records must stay identical to what these produced.
+
+def _extract_channel_id(raw: Dict[str, Any]) -> str:
+    return str(raw.get("id") or raw.get("channelId") or raw.get("broadcaster_id") or raw.get("_id", ""))
+
+def _extract_display_name(raw: Dict[str, Any]) -> str:
+    return (
+        raw.get("display_name")
+        or raw.get("displayName")
+        or raw.get("broadcaster_name")
+        or raw.get("user_name")
+        or raw.get("login")
+        or ""
+    )
+
+def _extract_login(raw: Dict[str, Any]) -> str:
+    return raw.get("broadcaster_login") or raw.get("login") or raw.get("name") or _extract_display_name(raw).lower()
+
+def _extract_description(raw: Dict[str, Any]) -> str:
+    return raw.get("description") or raw.get("bio") or ""
+
+def _extract_profile_image_url(raw: Dict[str, Any]) -> str:
+    return raw.get("profile_image_url") or raw.get("profileImageURL") or raw.get("thumbnail_url") or ""
+
+def _extract_followers_count(raw: Dict[str, Any]) -> int:
+    count = raw.get("followersCount") or raw.get("followers") or raw.get("follower_count")
+    try:
+        return int(count) if count is not None else 0
+    except (TypeError, ValueError):
+        return 0
+
+def _extract_is_partner(raw: Dict[str, Any]) -> bool:
+    if "isPartner" in raw:
+        return bool(raw["isPartner"])
+    if "broadcaster_type" in raw:
+        return raw["broadcaster_type"] == "partner"
+    return bool(raw.get("partner") or raw.get("is_partner"))
+
+def _reference_stream(raw: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if not raw:
+        return None
+    try:
+        tags = raw.get("tag_ids") or raw.get("tags") or []
+        return {
+            "id": str(raw.get("id") or ""),
+            "title": raw.get("title") or "",
+            "gameName": raw.get("game_name") or raw.get("game") or "",
+            "viewerCount": int(raw.get("viewer_count") or 0),
+            "startedAt": raw.get("started_at") or "",
+            "language": raw.get("language") or "",
+            "tags": [str(t) for t in tags] if isinstance(tags, list) else [],
+            "thumbnailURL": raw.get("thumbnail_url") or "",
+        }
+    except Exception:
+        return None
+
+CHANNEL_VALUES = {
+    "id": ["123", 123, "", None, 0],
+    "channelId": ["456", ""],
+    "broadcaster_id": ["789", None],
+    "_id": ["legacy", None, 0],
+    "display_name": ["Name", ""],
+    "displayName": ["Other", None],
+    "broadcaster_name": ["Broad"],
+    "user_name": ["User", ""],
+    "login": ["login", ""],
+    "broadcaster_login": ["blogin", None],
+    "name": ["nm"],
+    "description": ["desc", ""],
+    "bio": ["bio", None],
+    "profile_image_url": ["https://p", ""],
+    "profileImageURL": ["https://q"],
+    "thumbnail_url": ["https://t", None],
+    "followersCount": [10, "12", "x", 0, None],
+    "followers": [5, ""],
+    "follower_count": ["7", None],
+    "isPartner": [True, False, None],
+    "broadcaster_type": ["partner", "affiliate", ""],
+    "partner": [1, 0],
+    "is_partner": [True, None],
+}
+
+STREAM_VALUES = {
+    "id": ["s1", 42, None],
+    "title": ["Title", ""],
+    "game_name": ["Game", ""],
+    "game": ["Old game", None],
+    "viewer_count": [5, "17", "many", None],
+    "started_at": ["2024-05-12T18:30:00Z"],
+    "language": ["en", ""],
+    "tag_ids": [["a", 1], None, "notalist"],
+    "tags": [["English"], []],
+    "thumbnail_url": ["https://t", ""],
+}
+
+def _payloads(values: Dict[str, List[Any]], count: int, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    keys = list(values)
+    payloads = [{}]
+    for _ in range(count):
+        chosen = rng.sample(keys, rng.randint(1, len(keys)))
+        rng.shuffle(chosen)
+        payloads.append({key: rng.choice(values[key]) for key in chosen})
+    return payloads
+
+def test_channel_record_matches_old_extractors():
+    for raw in _payloads(CHANNEL_VALUES, 400, seed=16):
+        record = build_channel_record(raw, None, None, None, None, "kw").to_dict()
+        expected = {
+            "channelId": _extract_channel_id(raw),
+            "displayName": _extract_display_name(raw),
+            "login": _extract_login(raw),
+            "description": _extract_description(raw),
+            "profileImageURL": _extract_profile_image_url(raw),
+            "followersCount": _extract_followers_count(raw),
+            "isPartner": _extract_is_partner(raw),
+        }
+        assert {key: record[key] for key in expected} == expected, raw
+
+def test_stream_parsing_matches_old_parser():
+    payloads = _payloads(STREAM_VALUES, 400, seed=17) + [None]
+    expected = [_reference_stream(raw) for raw in payloads]
+    single = [parse_stream(raw) for raw in payloads]
+    batch = parse_streams(payloads)
+    assert [s.to_dict() if s is not None else None for s in single] == expected
+    assert [s.to_dict() if s is not None else None for s in batch] == expected
+
+def test_resolver_defaults_converters_and_build():
+    resolver = AliasResolver(
+        [("a", ("x", "y"), "none"), ("b", ("z",), 0, int)],
+        build=lambda a, b: {"a": a, "b": b},
+    )
+    assert resolver.resolve({"y": "second", "z": "5"}) == {"a": "second", "b": 5}
+    assert resolver.resolve({"x": "", "y": None}) == {"a": "none", "b": 0}
+    assert AliasResolver([("a", ("x",), None)]).resolve({"x": 1}) == (1,)
+
+def test_resolver_compiles_one_accessor_per_shape():
+    resolver = AliasResolver([("a", ("x", "y"), None)], max_shapes=2)
+    for raw in ({"x": 1}, {"x": 2}, {"y": 3}):
+        resolver.resolve(raw)
+    assert len(resolver._accessors) == 2
+    # Same keys in another order is another shape; the table is reset when full.
+    assert resolver.resolve({"y": 4, "x": 5}) == (5,)
+    assert len(resolver._accessors) == 1
+
+def test_resolver_is_independent_of_key_order():
+    resolver = AliasResolver([("a", ("x", "y", "z"), "-")])
+    raw = {"x": "", "y": "y", "z": "z"}
+    for keys in itertools.permutations(raw):
+        assert resolver.resolve({key: raw[key] for key in keys}) == ("y",)
@@ -0,0 +1,129 @@
+import time
+from dataclasses import dataclass
+from typing import Any, Collection, Dict, List, Optional
+
+from utils.budget_scheduler import PriorityScheduler, RunBudget
+
+FULL = frozenset({"stream", "latestVideo"})
+STREAM = frozenset({"stream"})
+NONE: frozenset = frozenset()
+
+@dataclass
+class _Record:
+    channelId: str
+    keyword: str
+    fields: Optional[Collection[str]]
+
+def _estimate(fields: Optional[Collection[str]], count: int) -> int:
+    # One batched stream request per page plus one per-channel request per video.
+    fields = FULL if fields is None else fields
+    return (1 if "stream" in fields else 0) + (count if "latestVideo" in fields else 0)
+
+def _pages(keywords=("a", "b"), per_keyword=10, shared=0):
+    pages = []
+    for k, keyword in enumerate(keywords):
+        channels = [{"id": f"{keyword}{i}", "viewers": (k * per_keyword + i) * 7 % 23} for i in range(per_keyword)]
+        channels += [{"id": f"shared{i}", "viewers": 100 + i} for i in range(shared)]
+        pages.append((keyword, channels[: len(channels) // 2], "cursor"))
+        pages.append((keyword, channels[len(channels) // 2:], None))
+    return pages
+
+def _run(scheduler, pages):
+    def enrich(keyword: str, channels: List[Dict[str, Any]], fields: Optional[Collection[str]]) -> List[_Record]:
+        return [_Record(c["id"], keyword, fields) for c in channels]
+
+    return scheduler.run(pages, priority=lambda raw: raw["viewers"], channel_id=lambda raw: raw["id"], enrich=enrich)
+
+def test_unlimited_budget_enriches_everything_fully_in_page_order():
+    pages = _pages()
+    scheduler = PriorityScheduler(RunBudget(max_requests=10_000), [FULL, STREAM, NONE], _estimate, chunk_size=4)
+    result = _run(scheduler, pages)
+    assert [[r.channelId for r in records] for records in result] == [[c["id"] for c in page] for _, page, _ in pages]
+    assert all(r.fields == FULL for records in result for r in records)
+    assert scheduler.stats()["channelsPerLevel"] == [20, 0, 0]
+
+def test_tight_budget_degrades_the_lowest_priority_channels():
+    pages = _pages()
+    used = [0]
+    budget = RunBudget(max_requests=12, requests_used=lambda: used[0])
+    scheduler = PriorityScheduler(budget, [FULL, STREAM, NONE], _estimate, chunk_size=4)
+
+    def enrich_and_spend(keyword, channels, fields):
+        used[0] += _estimate(fields, len(channels))
+        return [_Record(c["id"], keyword, fields) for c in channels]
+
+    result = scheduler.run(pages, lambda raw: raw["viewers"], lambda raw: raw["id"], enrich_and_spend)
+    records = [r for page in result for r in page]
+    assert len(records) == 20
+    assert used[0] <= 12
+
+    viewers = {c["id"]: c["viewers"] for _, page, _ in pages for c in page}
+    rank = {FULL: 0, STREAM: 1, NONE: 2}
+    by_priority = sorted(records, key=lambda r: viewers[r.channelId], reverse=True)
+    levels = [rank[frozenset(r.fields)] for r in by_priority]
+    assert levels == sorted(levels)
+    assert levels[0] == 0 and levels[-1] > 0
+    assert sum(scheduler.stats()["channelsPerLevel"]) == 20
+
+def test_exhausted_budget_falls_back_to_search_results_only():
+    pages = _pages()
+    scheduler = PriorityScheduler(RunBudget(max_requests=0), [FULL, STREAM, NONE], _estimate)
+    result = _run(scheduler, pages)
+    assert all(r.fields == NONE for records in result for r in records)
+    assert scheduler.stats() == {"channelsPerLevel": [0, 0, 20], "requestsRemaining": 0}
+
+def test_reused_channels_cost_nothing_again():
+    pages = _pages(per_keyword=2, shared=3)
+    scheduler = PriorityScheduler(RunBudget(max_requests=1000), [FULL, NONE], _estimate, reuse=True)
+    result = _run(scheduler, pages)
+    assert sum(len(records) for records in result) == 10
+    # Each shared channel is counted once even though both keywords matched it.
+    assert scheduler.stats()["channelsPerLevel"] == [7, 0]
+
+def test_deadline_limits_the_richer_levels():
+    pages = _pages(per_keyword=30)
+
+    def slow_enrich(keyword, channels, fields):
+        if fields:
+            time.sleep(0.002 * len(channels))
+        return [_Record(c["id"], keyword, fields) for c in channels]
+
+    budget = RunBudget(deadline_seconds=0.05)
+    scheduler = PriorityScheduler(budget, [FULL, NONE], _estimate, chunk_size=10, probe_size=5)
+    started = time.monotonic()
+    result = scheduler.run(pages, lambda raw: raw["viewers"], lambda raw: raw["id"], slow_enrich)
+    assert time.monotonic() - started < 0.5
+    full, bare = scheduler.stats()["channelsPerLevel"]
+    assert full + bare == 60 and full < 60 and bare > 0
+    assert sum(len(records) for records in result) == 60
+
+def test_pages_are_handed_over_in_keyword_order_as_they_complete():
+    pages = _pages(keywords=("a", "b", "c"), per_keyword=4)
+    events = []
+
+    def enrich(keyword, channels, fields):
+        events.append(("enrich", keyword))
+        return [_Record(c["id"], keyword, fields) for c in channels]
+
+    def on_page(i, records):
+        events.append(("page", i))
+        assert [r.channelId for r in records] == [c["id"] for c in pages[i][1]]
+
+    scheduler = PriorityScheduler(RunBudget(max_requests=10_000), [FULL, NONE], _estimate, chunk_size=3)
+    scheduler.run(pages, lambda raw: raw["viewers"], lambda raw: raw["id"], enrich, on_page=on_page)
+    handed = [i for kind, i in events if kind == "page"]
+    assert sorted(handed) == list(range(len(pages)))
+    for keyword_pages in ([0, 1], [2, 3], [4, 5]):
+        assert [i for i in handed if i in keyword_pages] == keyword_pages
+    # The first pages go out while other channels are still waiting to be enriched.
+    assert events.index(("page", handed[0])) < max(i for i, event in enumerate(events) if event[0] == "enrich")
+
+def test_budget_without_limits_is_inactive():
+    budget = RunBudget()
+    assert not budget.active
+    assert budget.remaining_requests() == float("inf")
+    assert budget.remaining_seconds() == float("inf")
+    assert RunBudget(max_requests=5, requests_used=lambda: 2).remaining_requests() == 3
+    assert not budget.exhausted()
+    assert RunBudget(max_requests=5, requests_used=lambda: 5).exhausted()
+    assert RunBudget(deadline_seconds=0).exhausted()
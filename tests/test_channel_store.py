@@ -0,0 +1,70 @@
+import json
+
+from scraper.query import run_query
+from utils.channel_store import ChannelStore, match_expression
+
+def _record(channel_id, name, description="", stream=None, **extra):
+    record = {
+        "channelId": channel_id,
+        "displayName": name,
+        "login": name.lower(),
+        "description": description,
+        "stream": stream,
+        "keyword": "scrape keyword",
+    }
+    record.update(extra)
+    return record
+
+def test_match_expression_prefix_matches_every_word():
+    assert match_expression("Just Chat") == '"just"* "chat"*'
+    assert match_expression("  !! ") is None
+
+def test_search_ranks_name_matches_first(tmp_path):
+    store = ChannelStore(tmp_path / "index.sqlite")
+    store.upsert(
+        [
+            _record("1", "SpeedRunner", description="cooking"),
+            _record("2", "CookingDaily"),
+            _record("3", "Other", stream={"title": "cooking live", "gameName": "Food"}),
+        ]
+    )
+    found = store.search("cook")
+    assert [r["channelId"] for r in found][0] == "2"
+    assert {r["channelId"] for r in found} == {"1", "2", "3"}
+    assert all(r["keyword"] == "cook" for r in found)
+    assert store.search("nothing here") == []
+    store.close()
+
+def test_upsert_replaces_and_keeps_unfetched_fields(tmp_path):
+    store = ChannelStore(tmp_path / "index.sqlite")
+    store.upsert([_record("1", "Chan", description="full profile", latestVideo={"id": "v"})])
+    # A stream-only run: description and latestVideo were not fetched this time.
+    store.upsert(
+        [_record("1", "Chan", description="", latestVideo=None, stream={"title": "live now"})],
+        keep={"1": ["description", "latestVideo"]},
+    )
+    (record,) = store.search("live now")
+    assert record["description"] == "full profile"
+    assert record["latestVideo"] == {"id": "v"}
+    assert record["stream"] == {"title": "live now"}
+    assert store.search("full profile")[0]["channelId"] == "1"
+    assert store.stats() == {"channels": 1, "upserts": 2}
+    store.close()
+
+def test_match_fields_are_not_stored(tmp_path):
+    store = ChannelStore(tmp_path / "index.sqlite")
+    store.upsert([_record("1", "Chan", keywords=["a", "b"], change="new"), {"displayName": "no id"}])
+    (record,) = store.search("chan")
+    assert "keywords" not in record and "change" not in record
+    assert len(store) == 1
+    store.close()
+
+def test_query_answers_keywords_from_the_index(tmp_path):
+    store = ChannelStore(tmp_path / "index.sqlite")
+    store.upsert([_record("1", "RocketLeaguePro"), _record("2", "Speedrunner", "rocket league runs")])
+    store.close()
+    settings = {"channelIndexFile": str(tmp_path / "index.sqlite"), "mergeKeywordMatches": True}
+    output = tmp_path / "answers.jsonl"
+    records = run_query(settings, ["rocket", "speedrun"], limit=5, output=output)
+    assert [(r["channelId"], r["keywords"]) for r in records] == [("1", ["rocket"]), ("2", ["rocket", "speedrun"])]
+    assert [json.loads(line)["channelId"] for line in output.read_text(encoding="utf-8").splitlines()] == ["1", "2"]
@@ -0,0 +1,81 @@
+import json
+
+from scraper.discovery import iter_search_pages
+from utils.checkpoint import CheckpointJournal
+from utils.request_handler import RequestHandler
+
+def test_journal_round_trip(tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    journal = CheckpointJournal(path)
+    journal.record_page("a", "cursor-1", 3, ["1", "2", "3"], searched=5)
+    journal.record_page("b", None, 2, ["4", "5"])
+    journal.record_done("b")
+    journal.close()
+
+    state = CheckpointJournal.load(path)
+    assert state.progress("a").cursor == "cursor-1"
+    assert (state.progress("a").collected, state.progress("a").searched) == (3, 5)
+    assert (state.progress("b").collected, state.progress("b").searched) == (2, 2)
+    assert not state.is_done("a")
+    assert state.is_done("b")
+    assert state.enriched_ids == {"1", "2", "3", "4", "5"}
+
+def test_last_page_counts_as_done_without_done_entry(tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    journal = CheckpointJournal(path)
+    journal.record_page("a", None, 0, [], searched=7)
+    journal.close()
+    assert CheckpointJournal.load(path).is_done("a")
+    assert not CheckpointJournal.load(path).is_done("unknown")
+
+def test_torn_last_line_is_ignored(tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    journal = CheckpointJournal(path)
+    journal.record_page("a", "c1", 1, ["1"], searched=1)
+    journal.close()
+    with path.open("a", encoding="utf-8") as f:
+        f.write('{"type":"page","keyword":"a","cursor":"c2","coll')
+    assert CheckpointJournal.load(path).progress("a").cursor == "c1"
+
+def test_journal_without_searched_falls_back_to_collected(tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    entry = {"type": "page", "keyword": "a", "cursor": "c", "collected": 4, "channelIds": []}
+    path.write_text(json.dumps(entry) + "\n", encoding="utf-8")
+    assert CheckpointJournal.load(path).progress("a").searched == 4
+
+def test_resume_appends_and_fresh_run_truncates(tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    journal = CheckpointJournal(path)
+    journal.record_page("a", "c1", 1, ["1"])
+    journal.close()
+
+    resumed = CheckpointJournal(path, resume=True)
+    assert resumed.state.progress("a").cursor == "c1"
+    resumed.record_done("a")
+    resumed.close()
+    assert CheckpointJournal.load(path).is_done("a")
+
+    CheckpointJournal(path).close()
+    assert path.read_text(encoding="utf-8") == ""
+
+def test_search_resumes_from_journaled_cursor(helix, tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    with RequestHandler(helix.base_url, "client", "token") as handler:
+        clean = [ch["id"] for page, _ in iter_search_pages(handler, "kw", 30) for ch in page]
+
+        journal = CheckpointJournal(path)
+        first_page, cursor = next(iter_search_pages(handler, "kw", 30))
+        # Only some channels survived filtering; the raw count drives resumption.
+        journal.record_page("kw", cursor, 2, [ch["id"] for ch in first_page[:2]], searched=len(first_page))
+        journal.close()
+
+        progress = CheckpointJournal(path, resume=True).state.progress("kw")
+        rest = [
+            ch["id"]
+            for page, _ in iter_search_pages(
+                handler, "kw", 30, start_cursor=progress.cursor, already_collected=progress.searched
+            )
+            for ch in page
+        ]
+    assert len(clean) == 30
+    assert [ch["id"] for ch in first_page] + rest == clean
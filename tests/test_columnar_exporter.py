@@ -0,0 +1,56 @@
+from datetime import datetime, timezone
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from outputs.columnar_exporter import ColumnarRecordWriter, export_to_parquet, flatten_record  # noqa: E402
+
+def _record(i, live=True):
+    return {
+        "channelId": str(i),
+        "displayName": f"Channel {i}",
+        "followersCount": i * 10,
+        "isPartner": i % 2 == 0,
+        "keywords": ["alpha", "beta"],
+        "stream": {"id": f"s{i}", "viewerCount": i, "startedAt": "2024-05-12T18:30:00Z", "tags": ["English"]}
+        if live
+        else None,
+    }
+
+def test_flatten_record_nulls_missing_nested_objects():
+    row = flatten_record(_record(1, live=False))
+    assert row["channelId"] == "1" and row["keywords"] == ["alpha", "beta"]
+    assert row["stream_id"] is None and row["latestVideo_url"] is None
+
+def test_flatten_record_parses_timestamps():
+    row = flatten_record(_record(1))
+    assert row["stream_startedAt"] == datetime(2024, 5, 12, 18, 30, tzinfo=timezone.utc)
+    assert flatten_record({"stream": {"startedAt": "not a date"}})["stream_startedAt"] is None
+
+@pytest.mark.parametrize("name", ["records.parquet", "records.arrow"])
+def test_writer_round_trips_across_row_groups(tmp_path, name):
+    records = [_record(i, live=i % 3 != 0) for i in range(25)]
+    path = tmp_path / name
+    with ColumnarRecordWriter(path, row_group_size=10) as writer:
+        writer.write_many(records)
+    assert writer.count == 25
+
+    if name.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        assert pq.ParquetFile(str(path)).num_row_groups == 3
+        table = pq.read_table(str(path))
+    else:
+        import pyarrow.ipc as ipc
+
+        table = ipc.open_file(str(path)).read_all()
+    assert table.column("channelId").to_pylist() == [str(i) for i in range(25)]
+    assert table.column("stream_viewerCount").to_pylist() == [None if i % 3 == 0 else i for i in range(25)]
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        ColumnarRecordWriter(tmp_path / "records.csv", fmt="csv")
+
+def test_export_to_parquet_returns_the_count(tmp_path):
+    assert export_to_parquet([_record(i) for i in range(3)], tmp_path / "out.parquet") == 3
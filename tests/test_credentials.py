@@ -0,0 +1,153 @@
+import asyncio
+import threading
+import time
+
+import pytest
+import requests
+
+from mock_helix import MockHelixConfig, MockHelixServer
+from utils import credentials as credentials_module
+from utils.async_request_handler import AsyncRequestHandler
+from utils.credentials import Credential, CredentialPool
+from utils.rate_limiter import TokenBucketRateLimiter
+from utils.request_handler import RequestHandler
+
+class _TokenResponse:
+    def __init__(self, body, status=200):
+        self.body = body
+        self.status = status
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise requests.HTTPError(f"status {self.status}")
+
+    def json(self):
+        return self.body
+
+@pytest.fixture
+def token_endpoint(monkeypatch):
+    """Fake client-credentials endpoint; records the client ids it was called for."""
+    calls = []
+    responses = []
+
+    def post(url, data, timeout):
+        calls.append(data["client_id"])
+        if responses:
+            return responses.pop(0)
+        return _TokenResponse({"access_token": f"new-{len(calls)}", "expires_in": 3600})
+
+    monkeypatch.setattr(credentials_module.requests, "post", post)
+    return calls, responses
+
+def _credential(client_id, capacity=100.0, **kwargs):
+    return Credential(client_id, "token", rate_limiter=TokenBucketRateLimiter(capacity=capacity), **kwargs)
+
+def test_pool_needs_a_credential():
+    with pytest.raises(ValueError):
+        CredentialPool([])
+
+def test_acquire_prefers_the_credential_with_most_headroom():
+    small, large = _credential("small", capacity=10), _credential("large", capacity=100)
+    pool = CredentialPool([small, large])
+    picked = [pool.acquire().client_id for _ in range(50)]
+    assert picked.count("large") == 50
+    assert pool.requests() == 50
+
+def test_equal_credentials_take_turns():
+    pool = CredentialPool([Credential("a", "t"), Credential("b", "t"), Credential("c", "t")])
+    assert [pool.acquire().client_id for _ in range(6)] == ["a", "b", "c", "a", "b", "c"]
+    assert [s["requests"] for s in pool.stats()] == [2, 2, 2]
+
+def test_request_counting_is_thread_safe():
+    pool = CredentialPool([Credential("a", "t"), Credential("b", "t")])
+
+    def work():
+        for _ in range(5000):
+            pool.acquire()
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert pool.requests() == 40000
+
+def test_acquire_async_counts_requests():
+    pool = CredentialPool([_credential("a")])
+
+    async def acquire_all():
+        return await asyncio.gather(*(pool.acquire_async() for _ in range(20)))
+
+    assert {c.client_id for c in asyncio.run(acquire_all())} == {"a"}
+    assert pool.requests() == 20
+
+def test_refresh_issues_a_new_token(token_endpoint):
+    calls, _ = token_endpoint
+    credential = Credential("a", "old", client_secret="secret")
+    pool = CredentialPool([credential])
+    assert pool.refresh(credential, "old")
+    assert credential.access_token == "new-1"
+    assert credential.expires_at == pytest.approx(time.time() + 3600, abs=5)
+    # Another caller that saw the old token rejected just retries with the new one.
+    assert pool.refresh(credential, "old")
+    assert calls == ["a"]
+    assert pool.stats() == [{"clientId": "a", "requests": 0, "tokenRefreshes": 1}]
+
+def test_refresh_fails_without_secret_or_token(token_endpoint):
+    calls, responses = token_endpoint
+    pool = CredentialPool([Credential("a", "old")])
+    assert not pool.refresh(pool.credentials[0], "old")
+    assert calls == []
+
+    credential = Credential("b", "old", client_secret="secret")
+    responses.extend([_TokenResponse({}, status=400), _TokenResponse({"expires_in": 10})])
+    assert not pool.refresh(credential, "old")
+    assert not pool.refresh(credential, "old")
+    assert credential.access_token == "old"
+
+def test_missing_or_expiring_tokens_are_issued_before_use(token_endpoint):
+    calls, _ = token_endpoint
+    fresh = Credential("fresh", "", client_secret="secret")
+    expiring = Credential("expiring", "tok", client_secret="secret")
+    expiring.expires_at = time.time() + 10
+    pool = CredentialPool([fresh])
+    assert pool.acquire().access_token == "new-1"
+    pool = CredentialPool([expiring], refresh_margin=300)
+    assert pool.acquire().access_token == "new-2"
+    assert calls == ["fresh", "expiring"]
+
+def _token_server():
+    """A mock Helix server that only accepts the first token the endpoint issues."""
+    return MockHelixServer(MockHelixConfig(latency_ms=0.0, jitter_ms=0.0, access_token="new-1"))
+
+def test_handler_refreshes_a_rejected_token_even_without_retries_left(token_endpoint):
+    calls, _ = token_endpoint
+    with _token_server() as server:
+        pool = CredentialPool([Credential("client", "expired", client_secret="secret")])
+        handler = RequestHandler(server.base_url, "client", "expired", max_retries=1, credentials=pool)
+        with handler:
+            body = handler.get("/users", params={"id": ["100001"]})
+        stats = server.stats()
+    assert calls == ["client"]
+    assert pool.credentials[0].access_token == "new-1"
+    assert len(body["data"]) == 1
+    assert stats["requests"] == 2
+
+def test_async_handler_refreshes_a_rejected_token_even_without_retries_left(token_endpoint):
+    calls, _ = token_endpoint
+
+    async def fetch(handler):
+        try:
+            return await handler.get("/users", params={"id": ["100001"]})
+        finally:
+            await handler.close()
+
+    with _token_server() as server:
+        pool = CredentialPool([Credential("client", "expired", client_secret="secret")])
+        handler = AsyncRequestHandler(server.base_url, "client", "expired", max_retries=1, credentials=pool)
+        body = asyncio.run(fetch(handler))
+        stats = server.stats()
+    assert calls == ["client"]
+    assert pool.credentials[0].access_token == "new-1"
+    assert len(body["data"]) == 1
+    assert stats["requests"] == 2
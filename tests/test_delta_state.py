@@ -0,0 +1,86 @@
+import json
+import time
+
+from utils.delta_state import DeltaStateStore, record_hash
+
+def _record(channel_id, **fields):
+    record = {"channelId": channel_id, "displayName": f"C{channel_id}", "stream": None, "keyword": "kw"}
+    record.update(fields)
+    return record
+
+def _stored(store, channel_id):
+    row = store._conn.execute(
+        "SELECT fields, fetched_at FROM channels WHERE channel_id = ?", (channel_id,)
+    ).fetchone()
+    return json.loads(row[0]), json.loads(row[1])
+
+def test_record_hash_ignores_match_fields():
+    assert record_hash(_record("1", keyword="a")) == record_hash(_record("1", keyword="b", keywords=["b"]))
+    assert record_hash(_record("1")) != record_hash(_record("1", displayName="other"))
+
+def test_diff_reports_new_then_changed_only(tmp_path):
+    store = DeltaStateStore(tmp_path / "delta.sqlite")
+    out = store.diff([_record("1"), _record("2")])
+    assert [(r["channelId"], r["change"]) for r in out] == [("1", "new"), ("2", "new")]
+
+    out = store.diff([_record("1"), _record("2", displayName="renamed")])
+    assert [(r["channelId"], r["change"]) for r in out] == [("2", "changed")]
+    assert store.stats()["unchanged"] == 1
+    store.close()
+
+def test_tombstones_cover_channels_missing_from_the_next_run(tmp_path):
+    path = tmp_path / "delta.sqlite"
+    store = DeltaStateStore(path)
+    store.diff([_record("1"), _record("2")])
+    store.close()
+
+    store = DeltaStateStore(path)
+    store.diff([_record("2")])
+    assert store.tombstones() == [{"channelId": "1", "change": "deleted"}]
+    assert len(store) == 1
+    store.close()
+
+def test_resumed_run_does_not_tombstone_channels_already_seen(tmp_path):
+    path = tmp_path / "delta.sqlite"
+    store = DeltaStateStore(path)
+    store.diff([_record("1")])
+    store.close()
+
+    store = DeltaStateStore(path, resume=True)
+    store.diff([_record("2")])
+    assert store.tombstones() == []
+    store.close()
+
+def test_only_fetched_fields_are_stamped(tmp_path):
+    store = DeltaStateStore(tmp_path / "delta.sqlite")
+    store.record_fetched("1", ["latestVideo", "topClip", "stream"])
+    store.diff([_record("1", latestVideo={"id": "v1"}, topClip={"id": "c1"})])
+    fields, fetched_at = _stored(store, "1")
+    assert fields == {"latestVideo": {"id": "v1"}, "topClip": {"id": "c1"}}
+    assert set(fetched_at) == {"latestVideo", "topClip"}
+
+    # A run that left topClip out (field projection) must not wipe its state.
+    time.sleep(0.01)
+    store.record_fetched("1", ["latestVideo"])
+    store.diff([_record("1", latestVideo={"id": "v2"}, topClip=None)])
+    new_fields, new_fetched_at = _stored(store, "1")
+    assert new_fields == {"latestVideo": {"id": "v2"}, "topClip": {"id": "c1"}}
+    assert new_fetched_at["topClip"] == fetched_at["topClip"]
+    assert new_fetched_at["latestVideo"] > fetched_at["latestVideo"]
+    store.close()
+
+def test_reusable_fields_need_offline_unchanged_profile_within_ttl(tmp_path):
+    store = DeltaStateStore(tmp_path / "delta.sqlite", field_ttls={"latestVideo": 60, "topClip": 0})
+    profile = {"login": "c1"}
+    store.record_fetched("1", ["latestVideo", "topClip"])
+    store.diff([_record("1", latestVideo={"id": "v1"}, topClip={"id": "c1"})], profiles={"1": profile})
+
+    assert store.reusable_fields("1", profile, is_live=False) == {"latestVideo": {"id": "v1"}}
+    assert store.reusable_fields("1", profile, is_live=True) == {}
+    assert store.reusable_fields("1", {"login": "renamed"}, is_live=False) == {}
+    assert store.reusable_fields("unknown", profile, is_live=False) == {}
+    assert store.stats()["skippedFetches"] == 1
+
+    store.diff([_record("1", stream={"id": "s"})], profiles={"1": profile})
+    assert store.reusable_fields("1", profile, is_live=False) == {}
+    store.close()
@@ -0,0 +1,120 @@
+import json
+
+import pytest
+
+from extractors.filters import ChannelFilter
+from extractors.records import ChannelRecord
+from scraper import scrape
+from scraper.discovery import discover_category_channels, search_channels_for_keyword
+from scraper.scrape import run_scrape
+from utils.async_request_handler import AsyncRequestHandler
+from utils.enrichment_index import EnrichmentIndex
+from utils.request_handler import RequestHandler
+
+def _dicts(records):
+    return [record.to_dict() for record in records]
+
+def _without_profile(records):
+    return [{k: v for k, v in r.items() if k not in ("description", "isPartner", "profileImageURL")} for r in records]
+
+@pytest.fixture
+def handler(helix):
+    with RequestHandler(helix.base_url, "client", "token", pool_size=16) as handler:
+        yield handler
+
+def test_concurrent_and_batched_enrichment_match_sequential(handler, helix):
+    sequential = _dicts(search_channels_for_keyword(handler, "kw", 30))
+    sequential_requests = helix.stats()["requests"]
+    helix.reset_stats()
+    threaded = _dicts(search_channels_for_keyword(handler, "kw", 30, workers=8))
+    helix.reset_stats()
+    batched = _dicts(search_channels_for_keyword(handler, "kw", 30, workers=8, batch=True))
+    batched_requests = helix.stats()["byEndpoint"]
+
+    assert len(sequential) == 30
+    assert threaded == sequential
+    # Batched records also carry the /users profile; the rest is unchanged.
+    assert _without_profile(batched) == _without_profile(sequential)
+    # One /streams and one /users request per search page.
+    pages = batched_requests["/search/channels"]
+    assert batched_requests["/streams"] == pages and batched_requests["/users"] == pages
+    assert sum(batched_requests.values()) < sequential_requests
+
+def test_async_enrichment_matches_threaded(handler, helix):
+    async_handler = AsyncRequestHandler(helix.base_url, "client", "token")
+    try:
+        threaded = _dicts(search_channels_for_keyword(handler, "kw", 30, workers=8, batch=True))
+        concurrent = _dicts(
+            search_channels_for_keyword(handler, "kw", 30, workers=8, batch=True, async_handler=async_handler)
+        )
+    finally:
+        async_handler.shutdown()
+    assert concurrent == threaded
+
+def test_shared_index_enriches_each_channel_once(handler, helix):
+    index = EnrichmentIndex()
+    first = search_channels_for_keyword(handler, "kw", 30, batch=True, index=index)
+    helix.reset_stats()
+    again = search_channels_for_keyword(handler, "kw", 30, batch=True, index=index)
+    assert [r.channelId for r in again] == [r.channelId for r in first]
+    assert helix.stats()["byEndpoint"] == {"/search/channels": 2}
+    assert index.reused == 30
+    assert [r.keyword for r in again] == ["kw"] * 30
+    assert all(isinstance(index.record_for(r.channelId), ChannelRecord) for r in first)
+
+def test_field_projection_and_filters_skip_requests(handler, helix):
+    records = search_channels_for_keyword(
+        handler, "kw", 30, batch=True, fields={"stream"}, channel_filter=ChannelFilter(live_only=True)
+    )
+    assert records and all(r.stream is not None for r in records)
+    assert all(r.latestVideo is None and r.topClip is None for r in records)
+    assert set(helix.stats()["byEndpoint"]) == {"/search/channels", "/streams"}
+
+def test_category_discovery_lists_streams_in_bulk(handler, helix):
+    records = discover_category_channels(handler, "Just Chatting", max_channels=30)
+    assert len(records) == 30 and len({r.channelId for r in records}) == 30
+    assert all(r.stream is not None and r.keyword == "Just Chatting" for r in records)
+    assert all(r.stream.gameName == "Just Chatting" for r in records)
+    assert helix.stats()["byEndpoint"] == {"/games": 1, "/streams": 1, "/users": 1}
+
+def test_budget_tail_must_be_a_subset_of_the_fields(scrape_settings):
+    scrape_settings.update(fields=["stream", "profile"], budgetTailFields=["latestVideo"], requestBudget=50)
+    with pytest.raises(SystemExit):
+        run_scrape(scrape_settings)
+
+def test_budget_tail_defaults_to_stream_only(scrape_settings, tmp_path):
+    scrape_settings.update(budgetTailFields=None, requestBudget=20, finalizeJson=True)
+    run_scrape(scrape_settings)
+    records = json.loads((tmp_path / "output.json").read_text(encoding="utf-8"))
+    assert len(records) == 90
+    tail = [r for r in records if r["latestVideo"] is None and r["stream"] is not None]
+    assert tail, "the tail should have been enriched with the stream only"
+
+def test_budget_stops_searching_once_spent(scrape_settings, tmp_path):
+    # Two search pages per keyword: the budget runs out halfway through "beta".
+    scrape_settings.update(requestBudget=3, finalizeJson=True)
+    run_scrape(scrape_settings)
+    records = json.loads((tmp_path / "output.json").read_text(encoding="utf-8"))
+    assert {r["keyword"] for r in records} == {"alpha", "beta"}
+    assert all(r["stream"] is None for r in records)
+    journal = [json.loads(line) for line in (tmp_path / "checkpoint.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [e["keyword"] for e in journal if e["type"] == "done"] == ["alpha"]
+    assert [e["cursor"] is not None for e in journal if e["type"] == "page" and e["keyword"] == "beta"] == [True]
+
+def test_budget_run_journals_pages_before_it_finishes(scrape_settings, tmp_path, monkeypatch):
+    enrich_channels = scrape.enrich_channels
+    calls = []
+
+    def failing_enrich(handler, channels, keyword, **kwargs):
+        calls.append(keyword)
+        if len(calls) == 2:
+            raise RuntimeError("crash")
+        return enrich_channels(handler, channels, keyword, **kwargs)
+
+    monkeypatch.setattr(scrape, "enrich_channels", failing_enrich)
+    scrape_settings.update(requestBudget=1000)
+    with pytest.raises(RuntimeError):
+        run_scrape(scrape_settings)
+    journal = [json.loads(line) for line in (tmp_path / "checkpoint.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert {e["keyword"] for e in journal if e["type"] == "page"} == {calls[0]}
+    assert len((tmp_path / "output.jsonl").read_text(encoding="utf-8").splitlines()) == 30
@@ -0,0 +1,40 @@
+import threading
+
+from utils.enrichment_index import EnrichmentIndex
+
+def test_claim_hands_each_channel_to_one_caller():
+    index = EnrichmentIndex()
+    assert index.claim(["1", "2"]) == ["1", "2"]
+    assert index.claim(["2", "3"]) == ["3"]
+    assert index.reused == 1
+
+    index.update({"1": {"channelId": "1"}, "2": {"channelId": "2"}}, claimed=["1", "2"])
+    assert index.record_for("2") == {"channelId": "2"}
+    assert index.record_for("missing") is None
+    assert "1" in index and len(index) == 2
+    assert index.claim(["1", "2"]) == []
+
+def test_wait_for_blocks_until_the_claim_is_released():
+    index = EnrichmentIndex()
+    index.claim(["1"])
+    seen = []
+
+    def waiter():
+        index.wait_for(["1"])
+        seen.append(index.record_for("1"))
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    thread.join(0.05)
+    assert thread.is_alive()
+    index.update({"1": {"channelId": "1"}}, claimed=["1"])
+    thread.join(1)
+    assert seen == [{"channelId": "1"}]
+
+def test_seeded_records_are_reused():
+    index = EnrichmentIndex()
+    records = [{"channelId": "1", "keyword": "a"}, {"channelId": "2"}, {"channelId": "1", "keyword": "b"}]
+    assert index.seed_records(records, {"1"}, convert=lambda r: dict(r, seeded=True)) == 1
+    assert index.record_for("1") == {"channelId": "1", "keyword": "a", "seeded": True}
+    assert index.claim(["1"]) == []
+    assert index.record_for("2") is None
@@ -0,0 +1,54 @@
+import gzip
+import json
+
+import pytest
+
+from extractors.records import ChannelRecord
+from outputs.exporter import JsonLinesWriter, export_to_json, iter_jsonl, iter_records, jsonl_to_json
+
+RECORDS = [
+    {"channelId": "1", "displayName": "Ünï", "stream": {"id": "s", "tags": ["a"]}, "keyword": "kw"},
+    {"channelId": "2", "displayName": "Two", "stream": None, "keyword": "kw"},
+]
+
+@pytest.mark.parametrize("name", ["out.jsonl", "out.jsonl.gz"])
+def test_jsonl_round_trip(tmp_path, name):
+    path = tmp_path / name
+    with JsonLinesWriter(path) as writer:
+        writer.write_many(RECORDS[:1])
+    with JsonLinesWriter(path, append=True) as writer:
+        writer.write(RECORDS[1])
+    assert list(iter_jsonl(path)) == RECORDS
+    assert list(iter_records(path)) == RECORDS
+
+def test_truncated_last_line_is_skipped(tmp_path):
+    path = tmp_path / "out.jsonl"
+    path.write_text(json.dumps(RECORDS[0]) + "\n" + '{"channelId": "2", "disp', encoding="utf-8")
+    assert list(iter_jsonl(path)) == RECORDS[:1]
+
+def test_finalized_json_matches_direct_export(tmp_path):
+    jsonl = tmp_path / "out.jsonl.gz"
+    with JsonLinesWriter(jsonl) as writer:
+        writer.write_many(RECORDS)
+    with gzip.open(jsonl, "rt", encoding="utf-8") as f:
+        assert len(f.readlines()) == 2
+
+    finalized, direct = tmp_path / "finalized.json", tmp_path / "direct.json"
+    assert jsonl_to_json(jsonl, finalized) == 2
+    export_to_json(RECORDS, direct)
+    assert finalized.read_text(encoding="utf-8") == direct.read_text(encoding="utf-8")
+    assert list(iter_records(finalized)) == RECORDS
+
+def test_empty_finalize_writes_an_empty_array(tmp_path):
+    jsonl = tmp_path / "out.jsonl"
+    jsonl.write_text("", encoding="utf-8")
+    assert jsonl_to_json(jsonl, tmp_path / "out.json") == 0
+    assert json.loads((tmp_path / "out.json").read_text(encoding="utf-8")) == []
+
+def test_typed_records_are_written_as_dicts(tmp_path):
+    record = ChannelRecord.from_dict({**RECORDS[0], "login": "x"})
+    path = tmp_path / "out.jsonl"
+    with JsonLinesWriter(path) as writer:
+        writer.write(record)
+    (written,) = iter_jsonl(path)
+    assert written == record.to_dict()
@@ -0,0 +1,102 @@
+import random
+import threading
+import time
+
+from utils.keyword_pipeline import KeywordPipeline
+
+def _pages(keyword, count=5, size=3):
+    for page in range(count):
+        items = [{"keyword": keyword, "n": page * size + i} for i in range(size)]
+        yield items, None if page == count - 1 else f"{keyword}-{page + 1}"
+
+def test_pages_are_delivered_in_order_per_keyword():
+    rng = random.Random(7)
+    rng_lock = threading.Lock()
+    delivered = {}
+    done = []
+    caller = threading.get_ident()
+
+    def enrich(keyword, page):
+        with rng_lock:
+            delay = rng.uniform(0, 0.005)
+        time.sleep(delay)
+        # Keep only even items, like a pre-enrichment filter.
+        return [item for item in page if item["n"] % 2 == 0]
+
+    def on_page(keyword, records, cursor, size):
+        assert threading.get_ident() == caller
+        delivered.setdefault(keyword, []).append(([r["n"] for r in records], cursor, size))
+
+    keywords = [f"k{i}" for i in range(6)]
+    KeywordPipeline(search_workers=3, enrich_workers=4, queue_size=2).run(
+        keywords, _pages, enrich, on_page, done.append
+    )
+
+    assert sorted(done) == keywords
+    for keyword in keywords:
+        pages = delivered[keyword]
+        assert [cursor for _, cursor, _ in pages] == [f"{keyword}-{i}" for i in range(1, 5)] + [None]
+        assert [n for numbers, _, _ in pages for n in numbers] == list(range(0, 15, 2))
+        assert [size for _, _, size in pages] == [3] * 5
+
+def test_a_failing_keyword_does_not_stop_the_others():
+    delivered = {}
+    done = []
+
+    def search_pages(keyword):
+        if keyword == "broken-search":
+            yield from _pages(keyword, count=1)
+            raise RuntimeError("search failed")
+        yield from _pages(keyword)
+
+    def enrich(keyword, page):
+        if keyword == "broken-enrich" and page[0]["n"] >= 6:
+            raise RuntimeError("enrichment failed")
+        return page
+
+    def on_page(keyword, records, cursor, size):
+        delivered[keyword] = delivered.get(keyword, 0) + 1
+
+    KeywordPipeline(search_workers=2, enrich_workers=2).run(
+        ["ok", "broken-search", "broken-enrich"], search_pages, enrich, on_page, done.append
+    )
+    assert done == ["ok"]
+    assert delivered == {"ok": 5, "broken-search": 1, "broken-enrich": 2}
+
+def test_keyword_without_results_is_still_finished():
+    done = []
+    pages = []
+    KeywordPipeline().run(
+        ["empty", "empty"], lambda kw: iter(()), lambda kw, page: page, lambda *args: pages.append(args), done.append
+    )
+    assert done == ["empty"]
+    assert pages == [("empty", [], None, 0)]
+
+def test_a_stuck_page_caps_the_pages_in_flight_for_its_keyword():
+    lock = threading.Lock()
+    produced = {"n": 0}
+    delivered = {"n": 0}
+    peak = {"n": 0}
+
+    def search_pages(keyword):
+        for page in _pages(keyword, count=20):
+            with lock:
+                produced["n"] += 1
+                peak["n"] = max(peak["n"], produced["n"] - delivered["n"])
+            yield page
+
+    def enrich(keyword, page):
+        if page[0]["n"] == 0:
+            time.sleep(0.2)  # the first page is stuck in retries
+        return page
+
+    def on_page(keyword, records, cursor, size):
+        with lock:
+            delivered["n"] += 1
+
+    KeywordPipeline(search_workers=1, enrich_workers=4, queue_size=8, pages_per_keyword=2).run(
+        ["k"], search_pages, enrich, on_page, lambda kw: None
+    )
+    assert delivered["n"] == 20
+    # Two pages in flight plus the one the search generator has just fetched.
+    assert peak["n"] <= 3
@@ -0,0 +1,58 @@
+import pytest
+
+from utils.metrics import Histogram, RunMetrics, timed
+
+def test_histogram_buckets_and_quantiles():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.05, 0.5, 2.0):
+        histogram.observe(value)
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.quantile(0.5) == pytest.approx(0.1)
+    assert histogram.quantile(1.0) == 2.0
+    assert Histogram().quantile(0.5) == 0.0
+    summary = histogram.summary()
+    assert summary["count"] == 4 and summary["max"] == 2.0
+    assert summary["buckets"] == {"0.1": 2, "1.0": 3, "+Inf": 4}
+
+def test_histogram_merge():
+    a, b = Histogram(), Histogram()
+    a.observe(0.01)
+    b.observe(3.0)
+    a.merge(b)
+    assert a.count == 2 and a.max == 3.0 and a.sum == pytest.approx(3.01)
+
+def test_snapshot_totals_and_phases():
+    metrics = RunMetrics()
+    metrics.observe_request("/streams", 0.02, 200, nbytes=100)
+    metrics.observe_request("/streams", 0.03, 429)
+    metrics.observe_request("/users", 0.01, None)
+    metrics.record_retry("/streams")
+    metrics.record_cache_hit("/users")
+    metrics.record_cache_hit("/users", revalidated=True)
+    with timed(metrics, "search"):
+        pass
+
+    snapshot = metrics.snapshot(extra={"records": 5})
+    assert snapshot["totals"] == {
+        "requests": 3, "errors": 1, "retries": 1, "throttled": 1, "cacheHits": 1, "notModified": 1, "bytes": 100
+    }
+    assert snapshot["requests"]["/streams"]["statuses"] == {"200": 1, "429": 1}
+    assert snapshot["requests"]["/users"]["notModified"] == 1
+    assert snapshot["phases"]["search"]["count"] == 1
+    assert snapshot["latencySeconds"]["count"] == 3
+    assert snapshot["records"] == 5
+
+def test_prometheus_exposition():
+    metrics = RunMetrics()
+    metrics.observe_request("/users", 0.2, 200)
+    metrics.record_cache_hit("/users", revalidated=True)
+    text = metrics.to_prometheus(prefix="t")
+    assert '# TYPE t_request_duration_seconds histogram' in text
+    assert 't_request_duration_seconds_bucket{endpoint="/users",le="+Inf"} 1' in text
+    assert 't_responses_total{endpoint="/users",status="200"} 1' in text
+    assert 't_not_modified_total{endpoint="/users"} 1' in text
+    assert text.endswith("\n")
+
+def test_timed_without_metrics_is_a_no_op():
+    with timed(None, "search"):
+        pass
@@ -0,0 +1,91 @@
+import json
+
+from scraper.watch import run_watch
+from utils.poll_schedule import AdaptivePollSchedule
+
+def _schedule(ids, **kwargs):
+    kwargs.setdefault("live_interval", 30)
+    kwargs.setdefault("offline_interval", 120)
+    kwargs.setdefault("max_interval", 600)
+    return AdaptivePollSchedule(ids, **kwargs)
+
+def test_every_channel_is_due_at_start_once():
+    schedule = _schedule(["a", "b", "a"])
+    assert len(schedule) == 2
+    assert sorted(schedule.due(now=1e12)) == ["a", "b"]
+    assert schedule.due(now=1e12) == []
+
+def test_offline_channels_back_off_and_live_resets():
+    schedule = _schedule(["a"])
+    now = 0.0
+    intervals = []
+    for live in (False, False, False, False, True, False):
+        schedule.due(now=now + 1e6)
+        schedule.record("a", live, now=now)
+        intervals.append(schedule.next_due_in(now=now))
+    assert intervals == [120, 240, 480, 600, 30, 120]
+    assert not schedule.is_live("a")
+
+def test_due_fills_the_batch_with_channels_due_next():
+    schedule = _schedule([])
+    for i, delay in enumerate((0, 5, 10, 1000)):
+        schedule.postpone(str(i), delay, now=0.0)
+    assert schedule.due(batch_size=3, now=1.0) == ["0", "1", "2"]
+    assert schedule.next_due_in(now=1.0) == 999
+
+def test_due_only_pads_with_channels_close_to_due():
+    schedule = _schedule([])
+    for i, delay in enumerate((0, 10, 20)):
+        schedule.postpone(str(i), delay, now=0.0)
+    # live_interval 30 with the default pad_fraction 0.5: up to 15s early.
+    assert schedule.due(batch_size=100, now=0.0) == ["0", "1"]
+    assert schedule.next_due_in(now=0.0) == 20
+
+def test_early_polls_do_not_advance_the_backoff():
+    schedule = _schedule(["a", "b"])
+    schedule.due(now=0.0)
+    schedule.record("a", False, now=0.0)
+    schedule.record("b", False, now=100.0)
+    # "a" is due at 120; "b" (due at 220) is padded in once it is within 60s.
+    assert schedule.due(batch_size=2, now=170.0) == ["a", "b"]
+    schedule.record("a", False, now=170.0)
+    schedule.record("b", False, now=170.0)
+    # "b" keeps its 120s interval; "a" was due, so it backs off to 240s.
+    assert schedule.due(batch_size=1, now=290.0) == ["b"]
+    assert schedule.next_due_in(now=290.0) == 120
+
+def test_postpone_puts_a_failed_poll_back_without_changing_state():
+    schedule = _schedule(["a"])
+    schedule.due(now=1e12)
+    schedule.record("a", True, now=0.0)
+    assert schedule.due(now=30.0) == ["a"]
+    schedule.postpone("a", schedule.live_interval, now=30.0)
+    assert schedule.is_live("a")
+    assert schedule.due(now=59.0) == []
+    assert schedule.due(now=60.0) == ["a"]
+
+def test_intervals_are_clamped():
+    schedule = AdaptivePollSchedule([], live_interval=0, offline_interval=0, max_interval=0, backoff=0.5)
+    assert schedule.live_interval == 1.0
+    assert schedule.offline_interval == 1.0
+    assert schedule.max_interval == 1.0
+    assert schedule.backoff == 1.0
+    assert schedule.next_due_in() == schedule.max_interval
+
+def test_watch_writes_a_point_per_live_channel(helix, tmp_path):
+    channels = tmp_path / "channels.txt"
+    channels.write_text("\n".join(str(100000 + i) for i in range(150)), encoding="utf-8")
+    output = tmp_path / "viewers.jsonl"
+    settings = {
+        "clientId": "client",
+        "accessToken": "token",
+        "baseUrl": helix.base_url,
+        "rateLimitPerMinute": 0,
+        "watchOutputFile": str(output),
+    }
+    run_watch(settings, channels_file=channels, duration=0.2)
+    points = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert points and all(p["live"] and p["viewerCount"] is not None for p in points)
+    assert len({p["channelId"] for p in points}) == len(points)
+    # 150 channels are polled with two /streams requests of up to 100 ids.
+    assert helix.stats()["byEndpoint"] == {"/streams": 2}
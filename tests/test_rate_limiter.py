@@ -0,0 +1,79 @@
+import time
+
+import pytest
+
+from mock_helix import MockHelixConfig, MockHelixServer
+from utils.rate_limiter import TokenBucketRateLimiter, retry_delay_from_headers
+from utils.request_handler import RequestHandler
+
+def test_full_bucket_does_not_wait():
+    limiter = TokenBucketRateLimiter(capacity=10, window_seconds=60)
+    started = time.monotonic()
+    for _ in range(10):
+        limiter.acquire()
+    assert time.monotonic() - started < 0.1
+    assert limiter.headroom() < 1
+
+def test_empty_bucket_spaces_callers_by_refill_rate():
+    # 2 tokens, 20 per second: the 3rd and 4th callers wait 50ms each.
+    limiter = TokenBucketRateLimiter(capacity=2, window_seconds=0.1)
+    started = time.monotonic()
+    for _ in range(4):
+        limiter.acquire()
+    elapsed = time.monotonic() - started
+    assert 0.08 <= elapsed < 0.5
+
+def test_headers_resync_capacity_and_tokens():
+    limiter = TokenBucketRateLimiter(capacity=800, window_seconds=60)
+    limiter.update_from_headers({"Ratelimit-Limit": "400", "Ratelimit-Remaining": "12"})
+    assert limiter.capacity == 400
+    assert limiter.rate == pytest.approx(400 / 60)
+    assert limiter.headroom() == pytest.approx(12, abs=0.5)
+
+def test_remaining_header_never_hands_back_spent_tokens():
+    limiter = TokenBucketRateLimiter(capacity=5, window_seconds=600)
+    for _ in range(5):
+        limiter.acquire()
+    limiter.update_from_headers({"Ratelimit-Remaining": "5"})
+    assert limiter.headroom() < 1
+
+def test_share_scales_capacity_and_reported_limit():
+    limiter = TokenBucketRateLimiter(capacity=800, window_seconds=60, share=0.5)
+    assert limiter.capacity == 400
+    limiter.update_from_headers({"Ratelimit-Limit": "800"})
+    assert limiter.capacity == 400
+
+@pytest.mark.parametrize("share", [0.0, -1.0])
+def test_invalid_share_means_whole_limit(share):
+    assert TokenBucketRateLimiter(capacity=800, share=share).capacity == 800
+
+def test_block_for_holds_back_every_caller():
+    limiter = TokenBucketRateLimiter(capacity=100, window_seconds=60)
+    limiter.block_for(0.05)
+    assert limiter.headroom() < 0
+    started = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - started >= 0.04
+
+def test_retry_delay_prefers_retry_after():
+    headers = {"Retry-After": "3", "Ratelimit-Reset": str(time.time() + 30)}
+    assert retry_delay_from_headers(headers, backoff=1.0, max_delay=60.0) == 3.0
+
+def test_retry_delay_uses_reset_then_backoff_and_clamps():
+    reset = {"Ratelimit-Reset": str(time.time() + 10)}
+    assert 9 < retry_delay_from_headers(reset, backoff=1.0, max_delay=60.0) <= 10
+    assert retry_delay_from_headers(reset, backoff=1.0, max_delay=5.0) == 5.0
+    assert retry_delay_from_headers({}, backoff=2.0, max_delay=60.0) == 2.0
+    assert retry_delay_from_headers({"Retry-After": "-4"}, backoff=2.0, max_delay=60.0) == 0.0
+
+def test_handler_resumes_after_429s():
+    config = MockHelixConfig(latency_ms=0.0, jitter_ms=0.0, throttle_rate=0.5, retry_after=0.01)
+    with MockHelixServer(config) as server:
+        limiter = TokenBucketRateLimiter(capacity=800)
+        handler = RequestHandler(server.base_url, "client", "token", max_retries=50, rate_limiter=limiter)
+        with handler:
+            bodies = [handler.get("/users", params={"id": [str(100000 + i)]}) for i in range(10)]
+        stats = server.stats()
+    assert all(len(body["data"]) == 1 for body in bodies)
+    assert stats["throttled"] > 0
+    assert stats["requests"] == 10 + stats["throttled"]
@@ -0,0 +1,107 @@
+import gzip
+import json
+
+import pytest
+
+from scraper.scrape import run_scrape
+from utils.request_handler import RequestHandler
+from utils.response_archive import ResponseArchive
+
+@pytest.mark.parametrize("name", ["archive.jsonl", "archive.jsonl.gz"])
+def test_record_then_replay_in_order(tmp_path, name):
+    path = tmp_path / name
+    archive = ResponseArchive(path)
+    archive.record("/streams", {"user_id": ["1"]}, {"data": ["first"]})
+    archive.record("/streams", {"user_id": ["1"]}, {"data": ["second"]})
+    archive.record("/users", {"id": ["1"]}, {"data": ["user"]})
+    assert archive.stats() == {"recorded": 3}
+    archive.close()
+
+    replay = ResponseArchive(path, replay=True)
+    assert replay.replay("streams/", {"user_id": ["1"]}) == {"data": ["first"]}
+    assert replay.replay("/streams", {"user_id": ["1"]}) == {"data": ["second"]}
+    # The last recorded response repeats once the recording runs out.
+    assert replay.replay("/streams", {"user_id": ["1"]}) == {"data": ["second"]}
+    assert replay.replay("/users", {"id": ["1"]}) == {"data": ["user"]}
+    assert replay.replay("/users", {"id": ["2"]}) == {}
+    assert replay.stats() == {"replayed": 4, "misses": 1}
+
+def test_runs_append_to_the_same_gzip_archive(tmp_path):
+    path = tmp_path / "archive.jsonl.gz"
+    for body in ({"data": [1]}, {"data": [2]}):
+        archive = ResponseArchive(path)
+        archive.record("/users", None, body)
+        archive.close()
+    replay = ResponseArchive(path, replay=True)
+    assert [replay.replay("/users", None) for _ in range(2)] == [{"data": [1]}, {"data": [2]}]
+
+def test_truncated_gzip_archive_keeps_what_was_readable(tmp_path):
+    path = tmp_path / "archive.jsonl.gz"
+    archive = ResponseArchive(path)
+    for i in range(50):
+        archive.record("/users", {"id": [str(i)]}, {"data": [i] * 50})
+    archive.close()
+    data = path.read_bytes()
+    path.write_bytes(data[: len(data) - 20])
+
+    replay = ResponseArchive(path, replay=True)
+    assert replay.replay("/users", {"id": ["0"]}) == {"data": [0] * 50}
+
+def test_replaying_a_missing_archive_fails(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        ResponseArchive(tmp_path / "missing.jsonl", replay=True)
+
+def test_malformed_lines_are_skipped(tmp_path):
+    path = tmp_path / "archive.jsonl.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write("not json\n")
+        f.write(json.dumps({"path": "/users", "params": {}, "body": {"data": ["ok"]}}) + "\n")
+    assert ResponseArchive(path, replay=True).replay("/users", {}) == {"data": ["ok"]}
+
+def test_handler_replays_without_the_network(helix, tmp_path):
+    path = tmp_path / "archive.jsonl"
+    params = {"id": ["100001", "100002"]}
+    archive = ResponseArchive(path)
+    with RequestHandler(helix.base_url, "client", "token", archive=archive) as handler:
+        recorded = handler.get("/users", params=params)
+    archive.close()
+    helix.reset_stats()
+
+    replay = ResponseArchive(path, replay=True)
+    with RequestHandler("http://127.0.0.1:9/helix", "client", "token", archive=replay) as handler:
+        assert handler.get("/users", params=params) == recorded
+    assert helix.stats()["requests"] == 0
+
+@pytest.mark.parametrize("overrides", [{}, {"asyncEnrichment": True, "enrichmentWorkers": 8}])
+def test_replayed_scrape_reproduces_the_recorded_run(scrape_settings, helix, tmp_path, overrides):
+    scrape_settings.update(overrides)
+    scrape_settings["responseArchiveFile"] = str(tmp_path / "archive.jsonl.gz")
+    run_scrape(dict(scrape_settings))
+    recorded = json.loads((tmp_path / "output.json").read_text(encoding="utf-8"))
+    requests_made = helix.stats()["requests"]
+
+    helix.reset_stats()
+    replay_settings = dict(scrape_settings, responseArchiveReplay=True, outputFile=str(tmp_path / "replayed.json"))
+    replay_settings["streamOutputFile"] = str(tmp_path / "replayed.jsonl")
+    run_scrape(replay_settings)
+    replayed = json.loads((tmp_path / "replayed.json").read_text(encoding="utf-8"))
+
+    assert requests_made > 0 and len(recorded) == 90
+    assert replayed == recorded
+    assert helix.stats()["requests"] == 0
+
+def test_replay_leaves_the_live_run_state_alone(scrape_settings, tmp_path):
+    scrape_settings.update(
+        responseArchiveFile=str(tmp_path / "archive.jsonl.gz"),
+        deltaStateFile=str(tmp_path / "delta.json"),
+        channelIndexFile=str(tmp_path / "channels.db"),
+    )
+    run_scrape(dict(scrape_settings))
+    state = {name: (tmp_path / name).read_bytes() for name in ("checkpoint.jsonl", "delta.json", "channels.db")}
+
+    replay_settings = dict(scrape_settings, responseArchiveReplay=True, outputFile=str(tmp_path / "replayed.json"))
+    replay_settings["streamOutputFile"] = str(tmp_path / "replayed.jsonl")
+    run_scrape(replay_settings)
+
+    assert len(json.loads((tmp_path / "replayed.json").read_text(encoding="utf-8"))) == 90
+    assert {name: (tmp_path / name).read_bytes() for name in state} == state
@@ -0,0 +1,80 @@
+import time
+
+from utils.response_cache import ResponseCache, cache_key
+from utils.request_handler import RequestHandler
+
+def test_cache_key_ignores_param_order_but_not_list_order():
+    assert cache_key("/users", {"id": ["1"], "first": 1}) == cache_key("users/", {"first": 1, "id": ["1"]})
+    assert cache_key("/users", {"id": ["1", "2"]}) != cache_key("/users", {"id": ["2", "1"]})
+
+def test_fresh_entry_is_a_hit(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite")
+    cache.store("/users", {"id": ["1"]}, {"data": [{"id": "1"}]}, etag='"a"')
+    cached = cache.lookup("/users", {"id": ["1"]})
+    assert cached is not None and cached.fresh
+    assert cached.body == {"data": [{"id": "1"}]}
+    assert cache.lookup("/users", {"id": ["2"]}) is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    cache.close()
+
+def test_endpoints_without_ttl_are_not_cached(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite", ttls={"/users": 60})
+    cache.store("/search/channels", {"query": "x"}, {"data": []})
+    assert cache.lookup("/search/channels", {"query": "x"}) is None
+    cache.close()
+
+def test_expired_entry_is_kept_only_with_an_etag(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite", ttls={"/users": 0.01, "/videos": 0.01})
+    cache.store("/users", None, {"data": ["u"]}, etag='"u"')
+    cache.store("/videos", None, {"data": ["v"]})
+    time.sleep(0.05)
+    stale = cache.lookup("/users", None)
+    assert stale is not None and not stale.fresh and stale.etag == '"u"'
+    assert cache.lookup("/videos", None) is None
+    cache.ttls["/users"] = 60
+    cache.refresh("/users", None)
+    assert cache.lookup("/users", None).fresh
+    cache.close()
+
+def test_lru_eviction_keeps_recently_hit_entries(tmp_path):
+    body = {"data": ["x" * 100]}
+    size = len('{"data":["' + "x" * 100 + '"]}')
+    cache = ResponseCache(tmp_path / "cache.sqlite", max_bytes=size * 2)
+    cache.store("/users", {"id": "old"}, body)
+    time.sleep(0.01)
+    cache.store("/users", {"id": "newer"}, body)
+    time.sleep(0.01)
+    # The hit is only batched in memory; eviction must still see it.
+    assert cache.lookup("/users", {"id": "old"}) is not None
+    time.sleep(0.01)
+    cache.store("/users", {"id": "third"}, body)
+    assert cache.lookup("/users", {"id": "old"}) is not None
+    assert cache.lookup("/users", {"id": "newer"}) is None
+    assert cache.stats()["evictions"] == 1
+    cache.close()
+
+def test_entries_survive_reopening(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    cache = ResponseCache(path)
+    cache.store("/users", {"id": ["1"]}, {"data": [1]})
+    cache.lookup("/users", {"id": ["1"]})
+    cache.close()
+    reopened = ResponseCache(path)
+    assert reopened.lookup("/users", {"id": ["1"]}).body == {"data": [1]}
+    assert reopened.stats()["bytes"] > 0
+    reopened.close()
+
+def test_handler_revalidates_stale_entries_with_etag(helix, tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite", ttls={"/users": 0.01})
+    params = {"id": ["100001"]}
+    with RequestHandler(helix.base_url, "client", "token", cache=cache) as handler:
+        first = handler.get("/users", params=params)
+        time.sleep(0.05)
+        second = handler.get("/users", params=params)
+        cache.ttls["/users"] = 60
+        third = handler.get("/users", params=params)
+    assert first == second == third
+    assert cache.stats()["revalidated"] == 1
+    # The fresh third lookup never reached the server.
+    assert helix.stats()["byEndpoint"] == {"/users": 2}
+    cache.close()
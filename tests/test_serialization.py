@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from utils import serialization
+
+INSTALLED = [name for name in serialization.BACKENDS if serialization._available(name)]
+
+DOCUMENTS = [
+    {},
+    [],
+    {"channelId": "123", "displayName": "Ünïcödé ✓", "followersCount": 0, "isPartner": False, "stream": None},
+    {"nested": {"list": [1, 2.5, -3, {"deep": [True, None, "x"]}], "empty": {}, "none": []}},
+    {"escapes": "quote \" backslash \\ newline \n tab \t", "emoji": "🎮"},
+    [{"tags": ["English", "Gaming"], "viewerCount": 12345}, "text", 0.1],
+]
+
+@pytest.fixture(autouse=True)
+def restore_backend():
+    previous = serialization.backend_name()
+    yield
+    serialization.configure(previous)
+
+@pytest.mark.parametrize("backend", INSTALLED)
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_backends_match_stdlib_json(backend, document):
+    assert serialization.configure(backend) == backend
+    compact = serialization.dumps(document)
+    pretty = serialization.dumps_pretty(document)
+    assert compact == json.dumps(document, ensure_ascii=False, separators=(",", ":"))
+    assert pretty == json.dumps(document, ensure_ascii=False, indent=4)
+    assert serialization.loads(compact) == document
+    assert serialization.loads(compact.encode("utf-8")) == document
+
+@pytest.mark.parametrize("backend", INSTALLED)
+def test_float_exponents_are_equivalent_not_identical(backend):
+    serialization.configure(backend)
+    assert json.loads(serialization.dumps({"big": 1e20})) == {"big": 1e20}
+
+@pytest.mark.parametrize("backend", INSTALLED)
+def test_invalid_input_raises_value_error(backend):
+    serialization.configure(backend)
+    with pytest.raises(ValueError):
+        serialization.loads('{"unterminated": ')
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        serialization.configure("simdjson")
+
+def test_missing_backend_falls_back_to_auto(monkeypatch):
+    monkeypatch.setattr(serialization, "_available", lambda name: name == "json")
+    assert serialization.configure("orjson") == "json"
+    assert serialization.configure("auto") == "json"
@@ -0,0 +1,82 @@
+import json
+from pathlib import Path
+
+import pytest
+
+import main
+from scraper.exports import merge_exports
+from scraper.settings import build_credential_pool
+from scraper.shards import local_shard_rate_share, shard_settings
+from utils.sharding import parse_shard_spec, select_shard, shard_of, shard_path
+
+KEYWORDS = [f"keyword {i}" for i in range(200)]
+
+def test_shard_of_is_a_stable_md5_assignment():
+    # Fixed values: every process and machine must agree on them.
+    assert [shard_of(k, 4) for k in ("warframe", "just chatting", "minecraft")] == [3, 3, 2]
+    assert shard_of("warframe", 1) == 0
+
+def test_shards_partition_the_keywords_in_order():
+    shards = [select_shard(KEYWORDS, i, 4) for i in range(4)]
+    assert sorted(k for shard in shards for k in shard) == sorted(KEYWORDS)
+    assert all(shard == [k for k in KEYWORDS if k in shard] for shard in shards)
+    assert all(shards)
+
+@pytest.mark.parametrize("spec", ["4/4", "-1/4", "0/0", "a/b", "3"])
+def test_invalid_shard_specs(spec):
+    with pytest.raises(ValueError):
+        parse_shard_spec(spec)
+
+def test_shard_path_keeps_compound_suffixes():
+    assert parse_shard_spec("1/4") == (1, 4)
+    assert shard_path(Path("data/output.jsonl.gz"), 1, 4) == Path("data/output.shard-1-of-4.jsonl.gz")
+    assert shard_path(Path("data/output"), 0, 2) == Path("data/output.shard-0-of-2")
+
+def test_merge_dedupes_channels_and_collects_keywords(tmp_path):
+    first, second = tmp_path / "a.jsonl", tmp_path / "b.jsonl"
+    first.write_text(
+        "\n".join(json.dumps(r) for r in ({"channelId": "1", "keyword": "a"}, {"channelId": "2", "keyword": "a"}))
+        + "\n",
+        encoding="utf-8",
+    )
+    second.write_text(
+        json.dumps({"channelId": "1", "keyword": "b", "keywords": ["b", "c"]}) + "\n", encoding="utf-8"
+    )
+    output = tmp_path / "merged.json"
+    assert merge_exports([first, second], output) == 2
+    merged = json.loads(output.read_text(encoding="utf-8"))
+    assert [(r["channelId"], r["keyword"], r["keywords"]) for r in merged] == [
+        ("1", "a", ["a", "b", "c"]),
+        ("2", "a", ["a"]),
+    ]
+
+def test_shards_split_credentials_and_the_primary_rate():
+    settings = {
+        "clientId": "primary",
+        "accessToken": "token",
+        "outputFile": "data/out.json",
+        "rateLimitPerMinute": 800,
+        "credentials": [{"clientId": f"extra{i}", "accessToken": "t"} for i in range(3)],
+    }
+    sharded = [shard_settings(settings, i, 2) for i in range(2)]
+    assert sharded[0]["outputFile"] == str(Path("data/out.shard-0-of-2.json"))
+    assert [[c["clientId"] for c in s["credentials"]] for s in sharded] == [["extra0", "extra2"], ["extra1"]]
+    assert all("rateLimitShare" not in s for s in sharded)
+
+    pool = build_credential_pool(dict(sharded[0], rateLimitShare=0.5))
+    capacities = {c.client_id: c.rate_limiter.capacity for c in pool.credentials}
+    assert capacities == {"primary": 400, "extra0": 800, "extra2": 800}
+
+def test_local_shards_split_only_the_primary_they_share():
+    settings = {"clientId": "p", "accessToken": "t"}
+    assert [local_shard_rate_share(settings, i, 4) for i in range(4)] == [0.25] * 4
+    settings["shardCredentials"] = [{"clientId": "a"}, {"clientId": "b"}]
+    assert [local_shard_rate_share(settings, i, 4) for i in range(4)] == [0.5] * 4
+    assert [local_shard_rate_share(settings, i, 2) for i in range(2)] == [1.0, 1.0]
+
+def test_manual_shards_keep_the_full_rate_unless_told_otherwise(monkeypatch):
+    seen = []
+    monkeypatch.setattr(main, "run_scrape", lambda settings, resume, shard: seen.append((settings, shard)))
+    main.main(["--shard", "1/4"])
+    main.main(["--shard", "1/4", "--rate-limit-share", "0.25"])
+    assert [(settings.get("rateLimitShare"), shard) for settings, shard in seen] == [(None, (1, 4)), (0.25, (1, 4))]